@@ -0,0 +1,60 @@
+import hashlib
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from rest_framework import status
+from rest_framework.response import Response
+
+from task_tracker.cache_stats import CacheStats
+from task_tracker.routers import reads_replica
+from tasks.cache import aget_task_generation
+
+response_cache_stats = CacheStats("response")
+
+
+class CachedResponseMixin:
+    """
+    Cache list and retrieve responses of user-owned objects.
+
+    Entries are keyed by the user, their task generation, the absolute URL
+    and ``cache_vary_headers``, so any write to the user's tasks makes every
+    previously cached response unreachable at once. Responses read from a
+    replica aren't cached, see ``task_tracker.routers``. Only response data is
+    cached, content negotiation and rendering still run on every request.
+    The ``X-Cache`` header tells whether a response came from the cache.
+
+    Meant for async viewsets, the cached actions wrap ``alist`` and
+    ``aretrieve``.
+    """
+
+    cache_vary_headers: tuple[str, ...] = ()
+    cache_timeout = DEFAULT_TIMEOUT
+
+    async def get_response_cache_key(self, request) -> str:
+        parts = [request.build_absolute_uri()]
+        parts += [request.headers.get(header, "") for header in self.cache_vary_headers]
+        digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()
+        user_id = request.user.pk
+        generation = await aget_task_generation(user_id)
+        return f"tasks:response:{user_id}:{generation}:{digest}"
+
+    async def get_cached_response(self, handler, request, *args, **kwargs) -> Response:
+        key = await self.get_response_cache_key(request)
+        data = await cache.aget(key)
+        response_cache_stats.record(hit=data is not None)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and not reads_replica():
+            await cache.aset(key, response.data, self.cache_timeout)
+        response["X-Cache"] = "MISS"
+        return response
+
+    async def list(self, request, *args, **kwargs):
+        return await self.get_cached_response(self.alist, request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.get_cached_response(self.aretrieve, request, *args, **kwargs)
@@ -0,0 +1,215 @@
+import datetime as dt
+import hashlib
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Subquery
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+from task_tracker.routers import reads_replica
+from tasks.cache import aget_task_generation
+from tasks.models import TaskCounter
+
+from .serializers import UserBaseSerializer
+
+WRITE_PRECONDITION_HEADERS = ("If-Match", "If-Unmodified-Since", "If-None-Match")
+
+
+class ConditionalResponseMixin:
+    """
+    ETag and Last-Modified validators for list and detail responses.
+
+    Validators come from the owner's ``max(updated_at)`` and task counter for
+    lists, and the task's ``updated_at`` for details. Unless read from a
+    replica, they are memoized per task generation, so an unchanged resource
+    is answered with 304 before the page is fetched or serialized. Writes
+    honor ``If-Match`` and ``If-Unmodified-Since`` and fail with 412 if the
+    task changed since.
+
+    Reads are async, writes are sync because they lock the task inside a
+    transaction, which the async ORM doesn't support.
+    """
+
+    cache_vary_headers: tuple[str, ...] = ()
+
+    def get_etag(self, request, *parts) -> str:
+        # Tasks embed their owner, so the owner is part of every ETag. It is
+        # already loaded by authentication.
+        user = request.user
+        parts += tuple(getattr(user, field) for field in UserBaseSerializer.Meta.fields)
+        parts += (
+            request.accepted_media_type,
+            *(request.headers.get(header, "") for header in self.cache_vary_headers),
+        )
+        digest = hashlib.sha256(repr(parts).encode()).hexdigest()
+        return quote_etag(digest[:32])
+
+    async def get_memoized_validator(self, name: str, compute):
+        user_id = self.request.user.pk
+        generation = await aget_task_generation(user_id)
+        key = f"tasks:validator:{user_id}:{generation}:{name}"
+        value = await cache.aget(key)
+        if value is None:
+            value = await compute()
+            if not reads_replica():
+                await cache.aset(key, value)
+        return value
+
+    def get_object(self):
+        # Validators and the action handler share the fetched task.
+        if not hasattr(self, "_object"):
+            self._object = super().get_object()
+        return self._object
+
+    async def aget_object(self):
+        if not hasattr(self, "_object"):
+            self._object = await super().aget_object()
+        return self._object
+
+    def get_locked_object(self):
+        """Fetch the task and lock it until the end of the transaction."""
+        queryset = self.filter_queryset(self.get_queryset()).select_for_update()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_object_or_404(
+            queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(self.request, obj)
+        self._object = obj
+        return obj
+
+    async def get_list_validators(self, request) -> tuple[str, dt.datetime | None]:
+        # The validators cover all of the user's tasks regardless of filters,
+        # which are part of the ETag through the query string. The counts
+        # catch deletes that leave max(updated_at) unchanged, and archived
+        # tasks, which never change. They come from the user's counter, so
+        # the query doesn't scan the user's tasks, and are kept for the
+        # pagination to count the page with.
+        async def get_stats():
+            last_modified = Subquery(
+                request.user.tasks.order_by("-updated_at").values("updated_at")[:1]
+            )
+            stats = (
+                await TaskCounter.objects.filter(owner_id=request.user.pk)
+                .values("total", "completed", "archived", last_modified=last_modified)
+                .afirst()
+            )
+            return stats or {
+                "total": 0,
+                "completed": 0,
+                "archived": 0,
+                "last_modified": None,
+            }
+
+        stats = await self.get_memoized_validator("list:counts", get_stats)
+        self.task_counts = stats
+        etag = self.get_etag(
+            request,
+            "list",
+            request.get_full_path(),
+            stats["last_modified"],
+            stats["total"],
+            stats["archived"],
+        )
+        return etag, stats["last_modified"]
+
+    def get_object_validators(
+        self, request, updated_at: dt.datetime
+    ) -> tuple[str, dt.datetime]:
+        return self.get_etag(request, "detail", request.path, updated_at), updated_at
+
+    async def aget_object_validators(self, request) -> tuple[str, dt.datetime]:
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+
+        async def get_updated_at():
+            return (await self.aget_object()).updated_at
+
+        updated_at = await self.get_memoized_validator(
+            f"detail:{lookup}", get_updated_at
+        )
+        return self.get_object_validators(request, updated_at)
+
+    def set_validators(self, response, etag: str, last_modified: dt.datetime | None):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        # Responses are per user, make clients revalidate instead of reusing
+        # them blindly and keep them out of shared caches.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    async def conditional_read(
+        self, handler, validators, request, *args, use_last_modified=True, **kwargs
+    ):
+        etag, last_modified = validators
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=(
+                int(last_modified.timestamp())
+                if last_modified and use_last_modified
+                else None
+            ),
+        )
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        return self.set_validators(response, etag, last_modified)
+
+    def conditional_write(self, handler, request, *args, **kwargs):
+        # Whatever fetching the task writes, such as restoring it from the
+        # archive, is rolled back with a write that fails.
+        with transaction.atomic():
+            if not any(
+                header in request.headers for header in WRITE_PRECONDITION_HEADERS
+            ):
+                response = handler(request, *args, **kwargs)
+            else:
+                # The task is locked so it can't change between the check and
+                # the write, and the handler writes the locked copy.
+                task = self.get_locked_object()
+                etag, last_modified = self.get_object_validators(
+                    request, task.updated_at
+                )
+                response = get_conditional_response(
+                    request, etag=etag, last_modified=int(last_modified.timestamp())
+                )
+                if response is not None:
+                    return response
+                response = handler(request, *args, **kwargs)
+
+        # Hand out the new validators so the next write needs no extra read.
+        if response.status_code == status.HTTP_200_OK:
+            validators = self.get_object_validators(
+                request, self.get_object().updated_at
+            )
+            self.set_validators(response, *validators)
+        return response
+
+    async def list(self, request, *args, **kwargs):
+        validators = await self.get_list_validators(request)
+        # Deleting a task doesn't move max(updated_at), so If-Modified-Since
+        # alone can't tell whether a list changed. Only the ETag is trusted.
+        return await self.conditional_read(
+            super().list,
+            validators,
+            request,
+            *args,
+            use_last_modified=False,
+            **kwargs,
+        )
+
+    async def retrieve(self, request, *args, **kwargs):
+        validators = await self.aget_object_validators(request)
+        return await self.conditional_read(
+            super().retrieve, validators, request, *args, **kwargs
+        )
+
+    def update(self, request, *args, **kwargs):
+        return self.conditional_write(super().update, request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        return self.conditional_write(super().destroy, request, *args, **kwargs)
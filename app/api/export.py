@@ -0,0 +1,131 @@
+"""
+Streaming exports of tasks.
+
+Rows are read through a server-side cursor, ``EXPORT_CHUNK_SIZE`` at a time,
+inside a read-only repeatable-read transaction, so memory stays flat and
+the export is a single snapshot however long it takes to send. The
+transaction holds its database connection until the last chunk is sent or
+the client goes away.
+
+Under ASGI the stream is an async iterator, every chunk is fetched in the
+request's sync thread, where its connection lives. Under WSGI it's a plain
+iterator.
+"""
+
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import closing, contextmanager
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections, transaction
+from django.http import StreamingHttpResponse
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from task_tracker.constants import EXPORT_CHUNK_SIZE
+
+
+@contextmanager
+def snapshot(using: str) -> Iterator[None]:
+    """Read from a single read-only repeatable-read snapshot of ``using``."""
+    connection = connections[using]
+    # An enclosing transaction, as in tests, already fixed the isolation level.
+    outermost = not connection.in_atomic_block
+    with transaction.atomic(using=using, savepoint=False):
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"
+                )
+        yield
+
+
+def snapshot_iterator(queryset) -> Iterator:
+    """Iterate over the queryset in a repeatable-read snapshot."""
+    with snapshot(queryset.db):
+        yield from queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def chunked(lines: Iterator[str]) -> Iterator[bytes]:
+    """Join lines into chunks, one send per chunk."""
+    while chunk := "".join(islice(lines, EXPORT_CHUNK_SIZE)):
+        yield chunk.encode()
+
+
+async def aiterate(iterator: Iterator) -> AsyncIterator:
+    """Iterate over a sync iterator, a step at a time in the sync thread."""
+    done = object()
+    try:
+        while (item := await sync_to_async(next)(iterator, done)) is not done:
+            yield item
+    finally:
+        # Exits the transaction when the client disconnects midway.
+        await sync_to_async(iterator.close)()
+
+
+def get_converter(field) -> Callable | None:
+    """
+    Return a function representing database values the way the serializer
+    field does, or None when the values already are their representation.
+
+    Datetime fields look up the current time zone for every value, which
+    dominates large exports, so the time zone is looked up once here.
+    """
+    if isinstance(field, serializers.DateTimeField) and (
+        str(getattr(field, "format", api_settings.DATETIME_FORMAT)).lower() == ISO_8601
+    ):
+        timezone = field.default_timezone()
+
+        def convert(value):
+            if timezone is not None:
+                value = value.astimezone(timezone)
+            value = value.isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return convert
+    if isinstance(
+        field,
+        serializers.CharField | serializers.IntegerField | serializers.BooleanField,
+    ):
+        return None
+    return field.to_representation
+
+
+def export_response(request, queryset, fields: dict, filename: str):
+    """
+    Stream the queryset in the accepted ``RowStreamRenderer`` format.
+
+    ``fields`` maps field names to the serializer fields representing them.
+    """
+    renderer = request.accepted_renderer
+    converters = [
+        (name, converter)
+        for name, field in fields.items()
+        if (converter := get_converter(field)) is not None
+    ]
+
+    def represent(row: dict) -> dict:
+        for name, convert in converters:
+            if row[name] is not None:
+                row[name] = convert(row[name])
+        return row
+
+    # The stream is read after the view returned, so the database the
+    # request reads from is picked now.
+    queryset = queryset.using(queryset.db)
+
+    def stream() -> Iterator[bytes]:
+        with closing(snapshot_iterator(queryset.values(*fields))) as rows:
+            yield from chunked(renderer.render_rows(map(represent, rows), list(fields)))
+
+    content = stream()
+    if isinstance(request._request, ASGIRequest):
+        content = aiterate(content)
+    response = StreamingHttpResponse(
+        content, content_type=f"{renderer.media_type}; charset={renderer.charset}"
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{renderer.format}"'
+    )
+    return response
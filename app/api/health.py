@@ -0,0 +1,19 @@
+from django.db import DatabaseError, connection
+from django.http import HttpResponse
+
+
+async def healthz(request):
+    """Liveness: the process serves requests, nothing else is checked."""
+    return HttpResponse("ok", content_type="text/plain")
+
+
+def readyz(request):
+    """Readiness: the database answers a single ping."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return HttpResponse(
+            "database unavailable", content_type="text/plain", status=503
+        )
+    return HttpResponse("ok", content_type="text/plain")
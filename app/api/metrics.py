@@ -0,0 +1,124 @@
+"""
+Prometheus metrics of the API.
+
+Gunicorn workers are separate processes, so when ``PROMETHEUS_MULTIPROC_DIR``
+is set every worker writes its samples to files in that directory and the
+metrics view aggregates the files of all workers. The directory has to be
+set before the workers start and emptied between server runs, see
+``gunicorn.conf.py``. Without it, metrics are those of the current process.
+"""
+
+import os
+import time
+
+from django.db import connections
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by view and action.",
+    ["view", "action"],
+)
+requests_total = Counter(
+    "http_requests",
+    "Requests by view, action and response status.",
+    ["view", "action", "status"],
+)
+requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "Requests being handled.",
+    multiprocess_mode="livesum",
+)
+request_queries = Histogram(
+    "http_request_db_queries",
+    "Database queries per request by view and action.",
+    ["view", "action"],
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 34, 55, 100),
+)
+query_duration = Histogram(
+    "db_query_duration_seconds",
+    "Database query latency.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+auth_failures = Counter(
+    "auth_failures",
+    "Failed logins and rejected tokens by reason.",
+    ["reason"],
+)
+
+# psycopg pool stats (pool_size, pool_available, requests_waiting,
+# connections_num, ...), summed over live workers. Counters like
+# connections_num drop when a worker exits.
+db_pool = Gauge(
+    "db_pool",
+    "Database connection pool stats by name, summed over workers.",
+    ["stat"],
+    multiprocess_mode="livesum",
+)
+POOL_STATS_INTERVAL = 1.0
+_pool_stats_updated = 0.0
+
+
+def record_pool_stats(force: bool = False):
+    """Copy the pool stats of this process to ``db_pool``, once a second."""
+    global _pool_stats_updated
+    now = time.monotonic()
+    if not force and now - _pool_stats_updated < POOL_STATS_INTERVAL:
+        return
+    _pool_stats_updated = now
+    pool = getattr(connections["default"], "pool", None)
+    if pool is not None:
+        for name, value in pool.get_stats().items():
+            db_pool.labels(stat=name).set(value)
+
+
+def record_auth_failure(exc):
+    """Count an authentication failure under the code of the exception."""
+    detail = exc.detail
+    code = detail.get("code") if isinstance(detail, dict) else detail.code
+    auth_failures.labels(reason=str(code or exc.default_code)).inc()
+
+
+def get_view_labels(request) -> dict[str, str]:
+    """
+    Label a request with its URL name and the viewset action it runs.
+
+    Views other than viewsets are labeled with the lowercase method.
+    """
+    match = request.resolver_match
+    if match is None:
+        return {"view": "unmatched", "action": request.method.lower()}
+    actions = getattr(match.func, "actions", None) or {}
+    return {
+        "view": match.url_name or match.view_name,
+        "action": actions.get(request.method.lower(), request.method.lower()),
+    }
+
+
+def observe_request(request, response, seconds: float, queries: int):
+    labels = get_view_labels(request)
+    request_duration.labels(**labels).observe(seconds)
+    request_queries.labels(**labels).observe(queries)
+    requests_total.labels(**labels, status=str(response.status_code)).inc()
+    record_pool_stats()
+
+
+def metrics_view(request):
+    """Expose metrics in the Prometheus text format."""
+    record_pool_stats(force=True)
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,222 @@
+import datetime as dt
+import math
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from task_tracker.constants import MAX_PAGE_SIZE, PAGINATION_COUNT_CAP
+from tasks.querysets import KeysetCursor, estimate_count, get_keyset_filter
+
+
+class TaskPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination that avoids exact ``COUNT(*)`` queries.
+
+    Views can answer counts cheaply with ``get_counted_total()``, such as
+    from maintained counters, returning None when they can't. Other lists,
+    such as searches, are counted up to ``count_cap`` rows and larger ones
+    report ``"10000+"``, or the planner's estimate with ``?count=estimate``.
+    ``?count=false`` leaves the count out. Pages are fetched with one extra
+    row to tell whether there's a next page, so links never need the count.
+    """
+
+    count_query_param = "count"
+    count_cap = PAGINATION_COUNT_CAP
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.queryset = queryset
+        self.view = view
+        self.count_mode = request.query_params.get(self.count_query_param, "")
+        self.page_number = self.get_page_number(request)
+
+        offset = (self.page_number - 1) * self.page_size
+        results = list(queryset[offset : offset + self.page_size + 1])
+        if self.page_number > 1 and not results:
+            raise NotFound(self.invalid_page_message)
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_page_number(self, request) -> int:
+        page_number = request.query_params.get(self.page_query_param) or 1
+        if page_number in self.last_page_strings:
+            count = self.count
+            if not isinstance(count, int) or self.count_mode == "estimate":
+                raise NotFound(self.invalid_page_message)
+            return max(1, math.ceil(count / self.page_size))
+        try:
+            page_number = int(page_number)
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+        if page_number < 1:
+            raise NotFound(self.invalid_page_message)
+        return page_number
+
+    @property
+    def count(self) -> int | str:
+        if not hasattr(self, "_count"):
+            counted = getattr(self.view, "get_counted_total", lambda: None)()
+            if counted is not None:
+                self._count = counted
+            elif self.count_mode == "estimate":
+                self._count = self.estimate_count(self.queryset)
+            else:
+                self._count = self.capped_count(self.queryset)
+        return self._count
+
+    def capped_count(self, queryset) -> int | str:
+        count = queryset.order_by()[: self.count_cap + 1].count()
+        return f"{self.count_cap}+" if count > self.count_cap else count
+
+    def estimate_count(self, queryset) -> int:
+        return estimate_count(queryset)
+
+    def get_paginated_response(self, data):
+        response = {}
+        if self.count_mode != "false":
+            response["count"] = self.count
+        return Response(
+            {
+                **response,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"] = ["results"]
+        response_schema["properties"]["count"] = {
+            "oneOf": [{"type": "integer"}, {"type": "string"}],
+            "example": 123,
+        }
+        return response_schema
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class TaskKeysetPagination(CursorPagination):
+    """
+    Keyset pagination over tasks ordered by ``(created_at, id)``, newest first.
+
+    Unlike DRF's cursor pagination, the position is the full sort key of the
+    boundary row, so pages stay stable when timestamps tie and no OFFSET is
+    ever needed. No ``count`` is returned, so no ``COUNT(*)`` is issued.
+
+    Searches are ranked by relevance, which the creation-time key can't
+    follow, so they're rejected with 400 instead of silently paged newest
+    first. They're paged by page number.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = MAX_PAGE_SIZE
+    mode_query_param = "pagination"
+    mode_header = "X-Pagination"
+    mode_name = "cursor"
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        """Check whether the client opted in to keyset pagination."""
+        if request is None:
+            return False
+        return (
+            cls.cursor_query_param in request.query_params
+            or request.query_params.get(cls.mode_query_param) == cls.mode_name
+            or request.headers.get(cls.mode_header, "").lower() == cls.mode_name
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(api_settings.SEARCH_PARAM):
+            raise ValidationError(
+                {
+                    api_settings.SEARCH_PARAM: [
+                        "Searches are ranked by relevance and can't be paged "
+                        "by cursor, use page numbers."
+                    ]
+                }
+            )
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        if reverse:
+            queryset = queryset.order_by("created_at", "id")
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(get_keyset_filter(self.cursor))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        # Moving backwards, the page we came from is always "next".
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Walked back past the first row, restart from the top.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        last = self.page[-1]
+        return self.encode_cursor(KeysetCursor(last.created_at, last.id, False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        first = self.page[0]
+        return self.encode_cursor(KeysetCursor(first.created_at, first.id, True))
+
+    def decode_cursor(self, request) -> KeysetCursor | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, strict_parsing=True)
+            created_at = dt.datetime.fromisoformat(tokens["p"][0])
+            pk = int(tokens["i"][0])
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return KeysetCursor(created_at, pk, reverse)
+
+    def encode_cursor(self, cursor: KeysetCursor) -> str:
+        tokens = {"p": cursor.created_at.isoformat(), "i": str(cursor.id)}
+        if cursor.reverse:
+            tokens["r"] = "1"
+
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
@@ -0,0 +1,34 @@
+from django.conf import settings
+
+from task_tracker.routers import use_primary, use_replica
+from tasks.cache import is_pinned_to_primary
+
+
+class ReplicaReadMixin:
+    """
+    Serve ``replica_actions`` from a read replica, unless the user wrote
+    within ``REPLICA_PIN_SECONDS`` and the replica might not have their
+    write yet.
+
+    Replicas are picked after authentication and permission checks, which
+    read the primary. A write made while handling the request sends its
+    later reads back to the primary.
+    """
+
+    replica_actions: frozenset[str] = frozenset()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and self.action in self.replica_actions
+            and not is_pinned_to_primary(request.user.pk)
+        ):
+            use_replica()
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().async_dispatch(request, *args, **kwargs)
+        finally:
+            # Under WSGI the context is shared by the requests of a thread.
+            use_primary()
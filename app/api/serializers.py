@@ -1,14 +1,23 @@
+from collections import Counter
 from typing import Any
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.fields import empty
 from rest_framework_simplejwt.serializers import TokenObtainSerializer
 from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import AccessToken
 
-from tasks.models import Task
+from task_tracker.constants import MAX_BULK_SIZE
+from tasks.models import Task, TaskImport
+from users.hashing import make_password
+
+from .metrics import record_auth_failure
+from .timing import TimedSerializerMixin
 
 User = get_user_model()
 
@@ -19,7 +28,11 @@ class SimpleTokenObtainSerializer(TokenObtainSerializer):
     token_class = AccessToken
 
     def validate(self, attrs: dict[str, Any]) -> dict[str, str]:
-        data = super().validate(attrs)
+        try:
+            data = super().validate(attrs)
+        except AuthenticationFailed as exc:
+            record_auth_failure(exc)
+            raise
         token = self.get_token(self.user)
         data["access_token"] = str(token)
 
@@ -45,6 +58,21 @@ class UserBaseSerializer(serializers.ModelSerializer):
         )
 
 
+class TaskOwnerSerializer(UserBaseSerializer):
+    """
+    Read-only owner representation for tasks.
+
+    All tasks in a response share an owner, so each user is serialized once
+    per response and the result is reused for every row.
+    """
+
+    def to_representation(self, instance):
+        serialized_owners = self.context.setdefault("serialized_owners", {})
+        if instance.pk not in serialized_owners:
+            serialized_owners[instance.pk] = super().to_representation(instance)
+        return serialized_owners[instance.pk]
+
+
 class SignUpSerializer(UserBaseSerializer):
     """
     Serializer for user registration.
@@ -62,18 +90,96 @@ class SignUpSerializer(UserBaseSerializer):
 
     def create(self, validated_data):
         password = validated_data.pop("password")
-        user = User(**validated_data)
-        user.set_password(password)
+        user = User(**validated_data, password=make_password(password))
         user.save()
         return user
 
 
-class TasksSerializer(serializers.ModelSerializer):
+class TaskListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    Bulk create and update of tasks.
+
+    For updates, ``instance`` maps task ids to the tasks being updated and
+    every item of the data names its task by ``id``. All items are
+    validated before anything is written, each write is a single query.
+    """
+
+    id_field = serializers.IntegerField(min_value=1)
+
+    @classmethod
+    def get_instance_ids(cls, data) -> list[int]:
+        """Collect the valid task ids of the items, invalid ones are skipped."""
+        ids = []
+        if isinstance(data, list):
+            for item in data:
+                try:
+                    ids.append(cls.id_field.run_validation(item.get("id", empty)))
+                except (AttributeError, serializers.ValidationError):
+                    continue
+        return ids
+
+    def to_internal_value(self, data):
+        if self.instance is not None:
+            ids = self.get_instance_ids(data)
+            duplicates = sorted(pk for pk, count in Counter(ids).items() if count > 1)
+            if duplicates:
+                raise serializers.ValidationError(
+                    f"Duplicate task ids: {duplicates}.", code="duplicate"
+                )
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        # Non-objects are left to the child serializer to reject.
+        if self.instance is None or not isinstance(data, dict):
+            return super().run_child_validation(data)
+        try:
+            task_id = self.id_field.run_validation(data.get("id", empty))
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({"id": exc.detail})
+        if task_id not in self.instance:
+            raise serializers.ValidationError({"id": ["Not found."]}, code="not_found")
+        self.child.instance = self.instance[task_id]
+        self.child.initial_data = data
+        validated = super().run_child_validation(data)
+        return {**validated, "id": task_id}
+
+    def create(self, validated_data):
+        return Task.objects.bulk_create(Task(**attrs) for attrs in validated_data)
+
+    def update(self, instance, validated_data):
+        # bulk_update skips Model.save(), so auto_now is applied here.
+        now = timezone.now()
+        fields = {"updated_at"}
+        tasks = []
+        for attrs in validated_data:
+            task = instance[attrs.pop("id")]
+            for field, value in attrs.items():
+                setattr(task, field, value)
+            task.updated_at = now
+            fields.update(attrs)
+            tasks.append(task)
+        Task.objects.bulk_update(tasks, sorted(fields))
+        return tasks
+
+
+class TaskIdsSerializer(serializers.Serializer):
+    """
+    Ids of the tasks to delete in bulk.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BULK_SIZE,
+    )
+
+
+class TasksSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for task model.
     """
 
-    owner = UserBaseSerializer(read_only=True)
+    owner = TaskOwnerSerializer(read_only=True)
 
     class Meta:
         model = Task
@@ -87,3 +193,53 @@ class TasksSerializer(serializers.ModelSerializer):
             "owner",
         )
         read_only_fields = ("id", "created_at", "updated_at", "owner")
+        list_serializer_class = TaskListSerializer
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # Sparse fieldsets requested with ?fields=, see TasksViewSet.
+        requested = self.context.get("fields")
+        if requested is not None:
+            fields = {
+                name: field for name, field in fields.items() if name in requested
+            }
+        # The owner is moved to the page envelope by the view.
+        if self.context.get("hoist_owner"):
+            fields.pop("owner", None)
+        return fields
+
+
+class TaskImportSerializer(serializers.ModelSerializer):
+    """
+    Progress and result of a task import.
+    """
+
+    class Meta:
+        model = TaskImport
+        fields = (
+            "id",
+            "format",
+            "processed",
+            "imported",
+            "failed",
+            "errors",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        )
+        read_only_fields = fields
+
+
+class TaskStatsSerializer(serializers.Serializer):
+    """
+    Counts of the user's tasks, of their archived tasks, which the other
+    counts leave out, and of those created in the last day and week, to the
+    hour.
+    """
+
+    total = serializers.IntegerField()
+    completed = serializers.IntegerField()
+    open = serializers.IntegerField()
+    archived = serializers.IntegerField()
+    created_last_day = serializers.IntegerField()
+    created_last_week = serializers.IntegerField()
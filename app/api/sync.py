@@ -0,0 +1,150 @@
+"""
+Delta sync of a user's tasks.
+
+Every task write takes the next value of a database sequence as the task's
+``change_seq``, and deleting a task leaves a ``TaskTombstone`` with one.
+Writers hold a lock on the owner while doing so, so an owner's changes
+commit in sequence order and a change is never visible before an earlier
+one. Paging by ``(change_seq, id)`` therefore never skips a change, which
+``updated_at`` couldn't promise, as transactions don't commit in the order
+of their timestamps. Tasks and tombstones are read from the same snapshot,
+otherwise a tombstone committed between the two reads could move the
+cursor past a task change the first read missed.
+
+The cursor holds the position of the last change handed out and the time
+at which the client had caught up with every earlier change. Tombstones are
+pruned after ``SYNC_TOMBSTONE_RETENTION_DAYS``, cursors older than that may
+have missed deletions and are refused with 410 Gone.
+"""
+
+import datetime as dt
+from base64 import b64decode, b64encode
+from typing import NamedTuple
+from urllib import parse
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+from task_tracker.constants import MAX_PAGE_SIZE, SYNC_TOMBSTONE_RETENTION_DAYS
+from tasks.models import TaskTombstone
+
+from .export import snapshot
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "The cursor is too old, sync again from the start."
+    default_code = "cursor_expired"
+
+
+class ChangesCursor(NamedTuple):
+    change_seq: int
+    id: int
+    synced_at: dt.datetime
+
+
+def encode_cursor(cursor: ChangesCursor) -> str:
+    querystring = parse.urlencode(
+        {
+            "s": cursor.change_seq,
+            "i": cursor.id,
+            "t": int(cursor.synced_at.timestamp()),
+        }
+    )
+    return b64encode(querystring.encode("ascii")).decode("ascii")
+
+
+def decode_cursor(encoded: str) -> ChangesCursor:
+    try:
+        tokens = parse.parse_qs(b64decode(encoded.encode("ascii")).decode("ascii"))
+        cursor = ChangesCursor(
+            int(tokens["s"][0]),
+            int(tokens["i"][0]),
+            dt.datetime.fromtimestamp(int(tokens["t"][0]), tz=dt.UTC),
+        )
+    except (TypeError, ValueError, KeyError, OverflowError):
+        raise ValidationError({"since": ["Invalid cursor."]})
+    retention = dt.timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+    if cursor.synced_at < timezone.now() - retention:
+        raise CursorExpired()
+    return cursor
+
+
+def get_page_size(request) -> int:
+    try:
+        page_size = int(request.query_params.get("page_size", MAX_PAGE_SIZE))
+    except ValueError:
+        page_size = MAX_PAGE_SIZE
+    return min(max(page_size, 1), MAX_PAGE_SIZE)
+
+
+def read_changes(
+    queryset, owner_id: int, cursor: ChangesCursor, limit: int, deletions: bool
+) -> list[tuple]:
+    """
+    Return up to ``limit`` task changes, and as many deletions, after the
+    cursor as ``(change_seq, id, task)`` tuples ordered by position, with
+    None for the task of a deletion.
+    """
+    tasks = queryset.filter(
+        Q(change_seq__gt=cursor.change_seq)
+        | Q(change_seq=cursor.change_seq, id__gt=cursor.id)
+    ).order_by("change_seq", "id")
+    with snapshot(queryset.db):
+        changes = [(task.change_seq, task.id, task) for task in tasks[:limit]]
+        if deletions:
+            tombstones = (
+                TaskTombstone.objects.using(queryset.db)
+                .filter(owner_id=owner_id, change_seq__gt=cursor.change_seq)
+                .order_by("change_seq")
+                .values_list("change_seq", "task_id")
+            )
+            changes += [
+                (change_seq, task_id, None)
+                for change_seq, task_id in tombstones[:limit]
+            ]
+    changes.sort(key=lambda change: change[:2])
+    return changes
+
+
+async def aget_changes(request, queryset, get_serializer) -> dict:
+    """
+    Return the page of changes after ``?since=`` of the user's tasks in
+    ``queryset``. Without ``since`` every task is a change and no deletions
+    are returned, which is how clients start syncing.
+    """
+    started = timezone.now()
+    page_size = get_page_size(request)
+    since = request.query_params.get("since")
+    cursor = decode_cursor(since) if since else ChangesCursor(-1, 0, started)
+
+    changes = await sync_to_async(read_changes)(
+        queryset, request.user.pk, cursor, page_size + 1, bool(since)
+    )
+    page = changes[:page_size]
+    has_more = len(changes) > page_size
+    if page:
+        change_seq, last_id, _ = page[-1]
+        # Catching up moves the sync time, a partial walk keeps the time of
+        # the sync it continues.
+        cursor = ChangesCursor(change_seq, last_id, cursor.synced_at)
+    if not has_more:
+        cursor = cursor._replace(synced_at=started)
+
+    encoded = encode_cursor(cursor)
+    return {
+        "changed": get_serializer(
+            [task for *_, task in page if task is not None], many=True
+        ).data,
+        "deleted": [task_id for _, task_id, task in page if task is None],
+        "cursor": encoded,
+        "next": (
+            replace_query_param(request.build_absolute_uri(), "since", encoded)
+            if has_more
+            else None
+        ),
+    }
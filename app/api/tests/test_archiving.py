@@ -0,0 +1,254 @@
+import datetime as dt
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from tasks.archiving import archive_tasks, restore_tasks
+from tasks.models import Task, TaskArchive, TaskCounter, TaskTombstone
+from tasks.stats import reconcile_owner
+
+tasks_url = reverse("api:tasks-list")
+bulk_url = reverse("api:tasks-bulk")
+stats_url = reverse("api:tasks-stats")
+
+
+@pytest.fixture
+def tasks(test_user, another_user) -> list[Task]:
+    """
+    Ten tasks of the user, the first four completed a year ago, the next two
+    completed recently, and an old completed task of another user.
+    """
+    tasks = Task.objects.bulk_create(
+        Task(title=f"Task {i}", completed=i < 6, owner=test_user) for i in range(10)
+    )
+    other = Task.objects.create(title="Other", completed=True, owner=another_user)
+    year_ago = timezone.now() - dt.timedelta(days=365)
+    Task.objects.filter(pk__in=[task.pk for task in tasks[:4]] + [other.pk]).update(
+        created_at=year_ago, updated_at=year_ago
+    )
+    Task.objects.filter(pk=tasks[8].pk).update(updated_at=year_ago)
+    return tasks
+
+
+@pytest.fixture
+def archived(tasks) -> list[Task]:
+    archive_tasks()
+    return tasks[:4]
+
+
+@pytest.mark.django_db
+class TestArchiving:
+    """Test old completed tasks move to the archive and back."""
+
+    def test_archive(self, tasks, test_user, another_user, task_counts):
+        assert archive_tasks() == 5
+        assert set(
+            TaskArchive.objects.filter(owner=test_user).values_list("id", flat=True)
+        ) == {task.pk for task in tasks[:4]}
+        assert not Task.objects.filter(pk__in=[task.pk for task in tasks[:4]]).exists()
+        # The old open task stays.
+        assert Task.objects.filter(pk=tasks[8].pk).exists()
+        assert task_counts(test_user) == (6, 2, 4)
+        assert task_counts(another_user) == (0, 0, 1)
+        # Synced clients drop archived tasks.
+        assert TaskTombstone.objects.filter(owner=test_user).count() == 4
+
+        archive = TaskArchive.objects.get(pk=tasks[0].pk)
+        assert archive.title == tasks[0].title
+        assert archive.archived_at is not None
+
+        assert archive_tasks() == 0
+
+    @pytest.mark.usefixtures("tasks")
+    def test_age_and_batches(self, test_user, task_counts):
+        progress = []
+        archived = archive_tasks(
+            older_than=dt.timedelta(0),
+            batch_size=2,
+            progress=lambda count, rate: progress.append(count),
+        )
+        assert archived == 7
+        assert progress == [2, 4, 6, 7]
+        assert task_counts(test_user) == (4, 0, 6)
+
+    def test_restore(self, archived, test_user, task_counts):
+        assert restore_tasks(test_user.pk, [archived[0].pk, 0]) == {archived[0].pk}
+        task = Task.objects.get(pk=archived[0].pk)
+        assert (task.title, task.completed) == (archived[0].title, True)
+        assert task_counts(test_user) == (7, 3, 3)
+        assert restore_tasks(test_user.pk, [archived[0].pk]) == set()
+
+    def test_reconcile(self, archived, test_user, task_counts):
+        TaskCounter.objects.filter(owner=test_user).update(archived=0)
+        assert reconcile_owner(test_user.pk) == {"archived": (0, 4)}
+        assert task_counts(test_user) == (6, 2, 4)
+
+    @pytest.mark.usefixtures("tasks")
+    def test_command(self, test_user, task_counts):
+        out = StringIO()
+        call_command("archive_tasks", older_than=30, batch_size=3, stdout=out)
+        assert "Archived 5 tasks." in out.getvalue()
+        assert "3 tasks archived" in out.getvalue()
+        assert task_counts(test_user)[2] == 4
+
+    @pytest.mark.usefixtures("archived")
+    def test_partitioned_table(self, test_user):
+        call_command("partition_task_table", partitions=2, stdout=StringIO())
+        assert test_user.tasks_with_archive.count() == 10
+        assert archive_tasks(older_than=dt.timedelta(0)) == 2
+
+
+@pytest.mark.django_db
+class TestArchivedTasksEndpoint:
+    """Test the task endpoints read archived tasks only when asked."""
+
+    def test_list(self, authorized_client, archived, tasks):
+        response = authorized_client.get(tasks_url, {"page_size": 100})
+        assert response.data["count"] == 6
+        assert {task["id"] for task in response.data["results"]} == {
+            task.pk for task in tasks[4:]
+        }
+
+        response = authorized_client.get(
+            tasks_url, {"include_archived": "true", "page_size": 100}
+        )
+        assert response.data["count"] == 10
+        # Live and archived tasks merge in the list order.
+        assert [task["id"] for task in response.data["results"]] == [
+            task.pk for task in reversed(tasks[4:])
+        ] + [task.pk for task in reversed(archived)]
+
+    def test_completed(self, authorized_client, archived, tasks):
+        response = authorized_client.get(tasks_url, {"completed": "true"})
+        assert response.data["count"] == 6
+        assert {task["id"] for task in response.data["results"]} == {
+            task.pk for task in tasks[:6]
+        }
+        assert all(task["completed"] for task in response.data["results"])
+
+        response = authorized_client.get(
+            tasks_url, {"completed": "false", "include_archived": "true"}
+        )
+        assert response.data["count"] == 4
+
+    @pytest.mark.usefixtures("archived")
+    def test_search_and_cursor(self, authorized_client):
+        response = authorized_client.get(
+            tasks_url, {"search": "Task 1", "completed": "true"}
+        )
+        assert response.data["results"][0]["title"] == "Task 1"
+
+        response = authorized_client.get(
+            tasks_url, {"pagination": "cursor", "include_archived": "true"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 10
+
+    def test_retrieve(self, authorized_client, archived, task_url):
+        url = task_url(archived[0].pk)
+        response = authorized_client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = authorized_client.get(url, {"include_archived": "true"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["title"] == archived[0].title
+        etag = response["ETag"]
+
+        response = authorized_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        # Reads don't restore.
+        assert TaskArchive.objects.filter(pk=archived[0].pk).exists()
+
+    def test_export(self, authorized_client, archived):
+        response = authorized_client.get(
+            reverse("api:tasks-export"), {"completed": "true"}
+        )
+        lines = b"".join(response.streaming_content).splitlines()
+        assert len(lines) == 6
+
+    def test_update_restores(
+        self, authorized_client, archived, test_user, task_url, task_counts
+    ):
+        response = authorized_client.patch(
+            task_url(archived[0].pk),
+            {"completed": False},
+            content_type="application/json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["completed"] is False
+        assert not TaskArchive.objects.filter(pk=archived[0].pk).exists()
+        assert task_counts(test_user) == (7, 2, 3)
+
+        response = authorized_client.get(tasks_url)
+        assert response.data["count"] == 7
+
+    def test_invalid_update_stays_archived(
+        self, authorized_client, archived, test_user, task_url, task_counts
+    ):
+        response = authorized_client.patch(
+            task_url(archived[0].pk), {"title": ""}, content_type="application/json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert TaskArchive.objects.filter(pk=archived[0].pk).exists()
+        assert not Task.objects.filter(pk=archived[0].pk).exists()
+        assert task_counts(test_user) == (6, 2, 4)
+
+    def test_conditional_update_restores(self, authorized_client, archived, task_url):
+        response = authorized_client.put(
+            task_url(archived[1].pk),
+            {"title": "Restored"},
+            content_type="application/json",
+            headers={"If-Unmodified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert Task.objects.get(pk=archived[1].pk).title == "Restored"
+
+    def test_delete_restores(
+        self, authorized_client, archived, test_user, task_url, task_counts
+    ):
+        response = authorized_client.delete(task_url(archived[0].pk))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not TaskArchive.objects.filter(pk=archived[0].pk).exists()
+        assert not Task.objects.filter(pk=archived[0].pk).exists()
+        assert task_counts(test_user) == (6, 2, 3)
+
+    def test_bulk_update_restores(self, authorized_client, archived, tasks):
+        response = authorized_client.patch(
+            bulk_url,
+            [
+                {"id": archived[0].pk, "title": "Restored"},
+                {"id": tasks[9].pk, "completed": True},
+            ],
+            content_type="application/json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert Task.objects.get(pk=archived[0].pk).title == "Restored"
+
+        # A failed update leaves the tasks archived.
+        response = authorized_client.patch(
+            bulk_url,
+            [{"id": archived[1].pk, "title": ""}],
+            content_type="application/json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert TaskArchive.objects.filter(pk=archived[1].pk).exists()
+
+    def test_other_users_archive(
+        self, authorized_client, another_user, archived, task_url
+    ):
+        other = TaskArchive.objects.get(owner=another_user)
+        response = authorized_client.patch(
+            task_url(other.pk), {"title": "Mine"}, content_type="application/json"
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert TaskArchive.objects.filter(pk=other.pk).exists()
+
+    @pytest.mark.usefixtures("archived")
+    def test_stats(self, authorized_client):
+        response = authorized_client.get(stats_url)
+        assert response.data["total"] == 6
+        assert response.data["archived"] == 4
@@ -0,0 +1,73 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+
+from api.views import TasksViewSet
+from tasks.models import Task
+
+
+def test_task_views_are_async():
+    """Test the task viewset is served as a coroutine."""
+    assert TasksViewSet.view_is_async
+
+
+# ASGI requests run their sync parts in a thread with its own connection,
+# so test data has to be committed.
+@pytest.mark.django_db(transaction=True)
+class TestAsyncTaskViews:
+    """Test the task endpoints through the ASGI handler."""
+
+    @pytest.fixture
+    def async_client(self, authentication_token) -> AsyncClient:
+        client = AsyncClient()
+        client.token = authentication_token
+        return client
+
+    def request(self, client: AsyncClient, method: str, *args, **kwargs):
+        headers = {"Authorization": f"Bearer {client.token}"}
+        return async_to_sync(getattr(client, method))(*args, headers=headers, **kwargs)
+
+    def test_list_and_retrieve(self, async_client, test_user):
+        task = Task.objects.create(title="Async task", owner=test_user)
+
+        response = self.request(async_client, "get", reverse("api:tasks-list"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"][0]["id"] == task.id
+
+        url = reverse("api:tasks-detail", args=[task.id])
+        response = self.request(async_client, "get", url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == "Async task"
+
+    def test_create(self, async_client, test_user):
+        response = self.request(
+            async_client,
+            "post",
+            reverse("api:tasks-list"),
+            {"title": "Created async"},
+            content_type="application/json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Task.objects.get(owner=test_user).title == "Created async"
+
+    def test_sync_actions(self, async_client, test_user):
+        """Test sync actions of the viewset run under ASGI as well."""
+        task = Task.objects.create(title="Async task", owner=test_user)
+        response = self.request(
+            async_client,
+            "patch",
+            reverse("api:tasks-detail", args=[task.id]),
+            {"completed": True},
+            content_type="application/json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        task.refresh_from_db()
+        assert task.completed
+
+    def test_not_found(self, async_client, another_user):
+        task = Task.objects.create(title="Private", owner=another_user)
+        url = reverse("api:tasks-detail", args=[task.id])
+        response = self.request(async_client, "get", url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,142 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from tasks.models import Task
+
+
+@pytest.mark.django_db
+class TestBulkEndpoints:
+    """Test bulk creation, update and deletion of tasks."""
+
+    bulk_url = reverse("api:tasks-bulk")
+
+    @pytest.fixture
+    def user_tasks(self, test_user) -> list[Task]:
+        return Task.objects.bulk_create(
+            Task(title=f"Task {i}", owner=test_user) for i in range(5)
+        )
+
+    @pytest.fixture
+    def foreign_task(self, another_user) -> Task:
+        return Task.objects.create(title="Foreign", owner=another_user)
+
+    def send(self, client, method: str, data):
+        return getattr(client, method)(
+            self.bulk_url, data, content_type="application/json"
+        )
+
+    def test_bulk_create(
+        self, authorized_client, test_user, django_assert_max_num_queries
+    ):
+        """Test a batch is created with a constant number of queries."""
+        data = [{"title": f"Task {i}", "completed": i % 2 == 0} for i in range(100)]
+        with django_assert_max_num_queries(4):
+            response = self.send(authorized_client, "post", data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [task["title"] for task in response.data] == [
+            item["title"] for item in data
+        ]
+        assert all(task["id"] and task["created_at"] for task in response.data)
+        assert all(task["owner"]["id"] == test_user.id for task in response.data)
+        assert Task.objects.filter(owner=test_user).count() == len(data)
+
+    def test_bulk_create_is_atomic(self, authorized_client):
+        """Test an invalid item rejects the batch with per-item errors."""
+        response = self.send(
+            authorized_client, "post", [{"title": "Valid"}, {"completed": True}]
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert "title" in response.data[1]
+        assert not Task.objects.exists()
+
+    @pytest.mark.parametrize(
+        "data",
+        [[], {"title": "Not a list"}, [{"title": "Task"}] * 501],
+        ids=["empty", "not_a_list", "too_many"],
+    )
+    def test_bulk_create_invalid_batch(self, authorized_client, data):
+        response = self.send(authorized_client, "post", data)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Task.objects.exists()
+
+    def test_bulk_update(
+        self, authorized_client, user_tasks, django_assert_max_num_queries
+    ):
+        """Test a batch is partially updated with a constant number of queries."""
+        data = [
+            {"id": task.id, "completed": True, **({"title": "Renamed"} if i else {})}
+            for i, task in enumerate(user_tasks)
+        ]
+        with django_assert_max_num_queries(5):
+            response = self.send(authorized_client, "patch", data)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [task["id"] for task in response.data] == [t.id for t in user_tasks]
+        first, *rest = Task.objects.filter(pk__in=[t.id for t in user_tasks]).order_by(
+            "pk"
+        )
+        assert first.title == "Task 0" and first.completed
+        assert all(task.title == "Renamed" and task.completed for task in rest)
+        assert all(task.updated_at > user_tasks[0].updated_at for task in rest)
+
+    def test_bulk_update_foreign_task(
+        self, authorized_client, user_tasks, foreign_task
+    ):
+        """Test tasks of other users can't be updated and abort the batch."""
+        data = [
+            {"id": user_tasks[0].id, "title": "Mine"},
+            {"id": foreign_task.id, "title": "Stolen"},
+            {"title": "No id"},
+        ]
+        response = self.send(authorized_client, "patch", data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert response.data[1] == {"id": ["Not found."]}
+        assert "id" in response.data[2]
+        foreign_task.refresh_from_db()
+        assert foreign_task.title == "Foreign"
+        assert Task.objects.get(pk=user_tasks[0].id).title == "Task 0"
+
+    def test_bulk_update_duplicate_ids(self, authorized_client, user_tasks):
+        data = [{"id": user_tasks[0].id}, {"id": user_tasks[0].id}]
+        response = self.send(authorized_client, "patch", data)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_delete(
+        self, authorized_client, user_tasks, foreign_task, django_assert_num_queries
+    ):
+        """Test only the user's tasks are deleted, in a single statement."""
+        ids = [user_tasks[0].id, foreign_task.id, user_tasks[1].id, 10**9]
+        # One query authenticates the user, one deletes the tasks.
+        with django_assert_num_queries(2):
+            response = self.send(authorized_client, "delete", {"ids": ids})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "deleted": [user_tasks[0].id, user_tasks[1].id],
+            "not_found": [foreign_task.id, 10**9],
+        }
+        assert Task.objects.filter(pk=foreign_task.pk).exists()
+        assert Task.objects.filter(owner=user_tasks[0].owner).count() == 3
+
+    def test_bulk_delete_invalid(self, authorized_client):
+        response = self.send(authorized_client, "delete", {"ids": ["abc"]})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_writes_invalidate_cache(self, authorized_client, user_tasks):
+        """Test bulk writes invalidate cached lists despite skipping signals."""
+        list_url = reverse("api:tasks-list")
+        authorized_client.get(list_url)
+        self.send(authorized_client, "post", [{"title": "New"}])
+
+        response = authorized_client.get(list_url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == len(user_tasks) + 1
+
+    def test_bulk_unauthorized(self, client):
+        response = client.post(self.bulk_url, [], content_type="application/json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,153 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import CachedJWTAuthentication
+from users.cache import (
+    auth_cache_stats,
+    auth_version_key,
+    local_user_cache,
+)
+
+
+@pytest.mark.django_db
+class TestCachedAuthentication:
+    """Test JWT authentication served from the user cache."""
+
+    list_url = reverse("api:tasks-list")
+
+    @pytest.fixture(autouse=True)
+    def reset_stats(self):
+        auth_cache_stats.reset()
+
+    def authenticate(self, token):
+        return CachedJWTAuthentication().get_user(AccessToken(str(token)))
+
+    def user_queries(self, context) -> list[str]:
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if "users_customuser" in query["sql"]
+        ]
+
+    def test_warm_requests_skip_user_query(self, authorized_client):
+        """Test only the first request looks the user up."""
+        with CaptureQueriesContext(connection) as cold:
+            authorized_client.get(self.list_url)
+        with CaptureQueriesContext(connection) as warm:
+            response = authorized_client.get(self.list_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(self.user_queries(cold)) == 1
+        assert self.user_queries(warm) == []
+
+    def test_warm_authentication_is_query_free(
+        self, test_user, authentication_token, django_assert_num_queries
+    ):
+        self.authenticate(authentication_token)
+        local_user_cache.clear()
+        # Served from the shared cache, then from the local one.
+        with django_assert_num_queries(0):
+            first = self.authenticate(authentication_token)
+            second = self.authenticate(authentication_token)
+
+        assert first == second == test_user
+        assert first is not second
+        assert auth_cache_stats.snapshot() == {
+            "hits": 2,
+            "misses": 1,
+            "hit_ratio": 2 / 3,
+        }
+
+    def test_deactivation_is_prompt(self, authorized_client, test_user):
+        authorized_client.get(self.list_url)
+        test_user.is_active = False
+        test_user.save()
+
+        response = authorized_client.get(self.list_url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deleted_user(self, authorized_client, test_user):
+        authorized_client.get(self.list_url)
+        test_user.delete()
+
+        response = authorized_client.get(self.list_url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_password_change_reloads_user(self, test_user, authentication_token):
+        self.authenticate(authentication_token)
+        test_user.set_password("newpassword123")
+        test_user.save()
+
+        user = self.authenticate(authentication_token)
+        assert user.check_password("newpassword123")
+        assert auth_cache_stats.misses == 2
+
+    def test_login_keeps_cached_user(
+        self, client, test_user, test_login_credentials, authentication_token
+    ):
+        """Test updating last_login on login doesn't invalidate the user."""
+        self.authenticate(authentication_token)
+        client.post(reverse("api:login"), data=test_login_credentials)
+
+        self.authenticate(authentication_token)
+        assert auth_cache_stats.misses == 1
+
+    def test_other_processes_expire_local_entries(
+        self, test_user, authentication_token, monkeypatch
+    ):
+        """Test a version bumped elsewhere applies once the local entry expires."""
+        self.authenticate(authentication_token)
+        cache.incr(auth_version_key(test_user.pk))
+
+        self.authenticate(authentication_token)
+        assert auth_cache_stats.misses == 1
+
+        expired = time.monotonic() + local_user_cache.ttl + 1
+        monkeypatch.setattr(time, "monotonic", lambda: expired)
+        self.authenticate(authentication_token)
+        assert auth_cache_stats.misses == 2
+
+    def admin_edit(self, admin_client, user, **changes):
+        url = reverse("admin:users_customuser_change", args=[user.pk])
+        data = {
+            "username": user.username,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "is_active": "on",
+            "date_joined_0": "2025-01-01",
+            "date_joined_1": "00:00:00",
+            **changes,
+        }
+        # Unchecked checkboxes aren't posted.
+        data = {field: value for field, value in data.items() if value is not None}
+        response = admin_client.post(url, data)
+        assert response.status_code == status.HTTP_302_FOUND
+
+    def test_admin_edit_bumps_version(self, admin_client, test_user):
+        version = cache.get_or_set(auth_version_key(test_user.pk), 1)
+        self.admin_edit(admin_client, test_user, first_name="Changed")
+
+        assert cache.get(auth_version_key(test_user.pk)) > version
+        test_user.refresh_from_db()
+        assert test_user.first_name == "Changed"
+        assert test_user.is_active
+
+    def test_admin_deactivation_rejects_token(
+        self, admin_client, test_user, authentication_token
+    ):
+        self.authenticate(authentication_token)
+        self.admin_edit(admin_client, test_user, is_active=None)
+
+        test_user.refresh_from_db()
+        assert not test_user.is_active
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate(authentication_token)
@@ -0,0 +1,160 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+
+from tasks.models import Task
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+    """Test ETag and Last-Modified handling of the task endpoints."""
+
+    list_url = reverse("api:tasks-list")
+
+    @pytest.fixture
+    def test_task(self, test_user) -> Task:
+        return Task.objects.create(title="Conditional task", owner=test_user)
+
+    def detail_url(self, task: Task) -> str:
+        return reverse("api:tasks-detail", args=[task.id])
+
+    def test_validators_are_sent(self, authorized_client, test_task):
+        """Test list and detail responses carry validators."""
+        for url in (self.list_url, self.detail_url(test_task)):
+            response = authorized_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response["ETag"].startswith('"')
+            assert response["Last-Modified"] == http_date(
+                test_task.updated_at.timestamp()
+            )
+            assert "private" in response["Cache-Control"]
+
+    def test_list_not_modified(self, authorized_client, test_task):
+        """Test an unchanged list is answered without querying tasks."""
+        etag = authorized_client.get(self.list_url)["ETag"]
+        with CaptureQueriesContext(connection) as context:
+            response = authorized_client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+        assert not [
+            query
+            for query in context.captured_queries
+            if Task._meta.db_table in query["sql"]
+        ]
+
+    def test_list_etag_depends_on_query(self, authorized_client, test_task):
+        """Test filtered lists have their own ETags."""
+        etag = authorized_client.get(self.list_url)["ETag"]
+        response = authorized_client.get(
+            self.list_url, {"completed": "true"}, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    @pytest.mark.parametrize("change", ["create", "update", "delete"])
+    def test_list_etag_changes(self, authorized_client, test_user, test_task, change):
+        """Test any change to the user's tasks changes the list ETag."""
+        Task.objects.create(title="Another task", owner=test_user)
+        etag = authorized_client.get(self.list_url)["ETag"]
+        if change == "create":
+            Task.objects.create(title="New task", owner=test_user)
+        elif change == "update":
+            test_task.completed = True
+            test_task.save()
+        else:
+            test_task.delete()
+
+        response = authorized_client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_list_ignores_if_modified_since(self, authorized_client, test_task):
+        """Test If-Modified-Since alone doesn't hide deleted tasks."""
+        last_modified = authorized_client.get(self.list_url)["Last-Modified"]
+        response = authorized_client.get(
+            self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_detail_not_modified(self, authorized_client, test_task):
+        """Test an unchanged task is answered with 304."""
+        url = self.detail_url(test_task)
+        response = authorized_client.get(url)
+
+        not_modified = authorized_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        not_modified = authorized_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+        test_task.save()
+        response = authorized_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_detail_of_another_user(self, authorized_client, another_user):
+        """Test validators don't leak other users' tasks."""
+        task = Task.objects.create(title="Private", owner=another_user)
+        response = authorized_client.get(self.detail_url(task), HTTP_IF_NONE_MATCH="*")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize("method", ["put", "patch"])
+    def test_update_if_match(self, authorized_client, test_task, method):
+        """Test updates with a current ETag succeed and return the new one."""
+        url = self.detail_url(test_task)
+        etag = authorized_client.get(url)["ETag"]
+
+        response = getattr(authorized_client, method)(
+            url,
+            {"title": "Updated"},
+            content_type="application/json",
+            HTTP_IF_MATCH=etag,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response["ETag"] == authorized_client.get(url)["ETag"]
+
+    def test_update_stale_etag(self, authorized_client, test_task):
+        """Test updates based on an outdated ETag are rejected."""
+        url = self.detail_url(test_task)
+        etag = authorized_client.get(url)["ETag"]
+        test_task.title = "Changed elsewhere"
+        test_task.save()
+
+        response = authorized_client.patch(
+            url,
+            {"completed": True},
+            content_type="application/json",
+            HTTP_IF_MATCH=etag,
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        test_task.refresh_from_db()
+        assert test_task.completed is False
+
+    def test_delete_if_match(self, authorized_client, test_task):
+        """Test deletes honor If-Match."""
+        url = self.detail_url(test_task)
+        response = authorized_client.delete(url, HTTP_IF_MATCH='"stale"')
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert Task.objects.filter(pk=test_task.pk).exists()
+
+        etag = authorized_client.get(url)["ETag"]
+        response = authorized_client.delete(url, HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not Task.objects.filter(pk=test_task.pk).exists()
+
+    def test_update_if_unmodified_since(self, authorized_client, test_task):
+        """Test updates honor If-Unmodified-Since."""
+        url = self.detail_url(test_task)
+        response = authorized_client.patch(
+            url,
+            {"completed": True},
+            content_type="application/json",
+            HTTP_IF_UNMODIFIED_SINCE=http_date(test_task.updated_at.timestamp() - 60),
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
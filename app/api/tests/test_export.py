@@ -0,0 +1,152 @@
+import csv
+import io
+import json
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+
+from tasks.models import Task
+
+export_url = reverse("api:tasks-export")
+
+
+def read_ndjson(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+@pytest.mark.django_db
+class TestExport:
+    """Test streaming exports of the user's tasks."""
+
+    @pytest.fixture(autouse=True)
+    def tasks(self, test_user, another_user) -> list[Task]:
+        Task.objects.create(title="Foreign", owner=another_user)
+        return [
+            Task.objects.create(
+                title=f"Invoice {i}" if i % 2 else f"Task {i}",
+                description='Quoted "text", with commas',
+                completed=i % 3 == 0,
+                owner=test_user,
+            )
+            for i in range(6)
+        ]
+
+    def test_ndjson(self, authorized_client, tasks):
+        response = authorized_client.get(export_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"].startswith("application/x-ndjson")
+        assert 'filename="tasks.ndjson"' in response["Content-Disposition"]
+        rows = read_ndjson(b"".join(response.streaming_content))
+        assert [row["id"] for row in rows] == [task.id for task in reversed(tasks)]
+        detail = authorized_client.get(
+            reverse("api:tasks-detail", args=[tasks[0].id])
+        ).json()
+        del detail["owner"]
+        assert rows[-1] == detail
+
+    @pytest.mark.parametrize(
+        "params, headers",
+        [({"format": "csv"}, {}), ({}, {"Accept": "text/csv"})],
+        ids=["format", "accept"],
+    )
+    def test_csv(self, authorized_client, tasks, params, headers):
+        response = authorized_client.get(export_url, params, headers=headers)
+
+        assert response["Content-Type"].startswith("text/csv")
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert list(rows[0]) == [
+            "id",
+            "title",
+            "description",
+            "created_at",
+            "updated_at",
+            "completed",
+        ]
+        assert [int(row["id"]) for row in rows] == [task.id for task in reversed(tasks)]
+        assert rows[0]["description"] == 'Quoted "text", with commas'
+
+    def test_filters(self, authorized_client, tasks):
+        response = authorized_client.get(
+            export_url, {"completed": "true", "search": "invoice"}
+        )
+        rows = read_ndjson(b"".join(response.streaming_content))
+        assert {row["id"] for row in rows} == {
+            task.id for task in tasks if task.completed and "Invoice" in task.title
+        }
+
+    def test_chunks(self, authorized_client, monkeypatch):
+        monkeypatch.setattr("api.export.EXPORT_CHUNK_SIZE", 4)
+        response = authorized_client.get(export_url)
+        assert [len(chunk.splitlines()) for chunk in response.streaming_content] == [
+            4,
+            2,
+        ]
+
+    def test_unauthorized(self, client):
+        response = client.get(export_url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "detail" in read_ndjson(response.content)[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExportSnapshot:
+    """Test exports read a single snapshot, in their own transaction."""
+
+    @pytest.fixture(autouse=True)
+    def tasks(self, test_user) -> list[Task]:
+        return Task.objects.bulk_create(
+            Task(title=f"Task {i}", owner=test_user) for i in range(5)
+        )
+
+    def write_concurrently(self, test_user, tasks):
+        def write():
+            Task.objects.create(title="New", owner=test_user)
+            Task.objects.filter(pk=tasks[0].pk).delete()
+            connection.close()
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        thread.join()
+
+    def test_snapshot(self, authorized_client, test_user, tasks, monkeypatch):
+        monkeypatch.setattr("api.export.EXPORT_CHUNK_SIZE", 2)
+        response = authorized_client.get(export_url)
+        content = iter(response.streaming_content)
+        first = next(content)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW transaction_isolation")
+            assert cursor.fetchone() == ("repeatable read",)
+        self.write_concurrently(test_user, tasks)
+
+        rows = read_ndjson(first + b"".join(content))
+        assert sorted(row["id"] for row in rows) == [task.id for task in tasks]
+        assert not connection.in_atomic_block
+
+    def test_closed_midway(self, authorized_client, monkeypatch):
+        monkeypatch.setattr("api.export.EXPORT_CHUNK_SIZE", 2)
+        response = authorized_client.get(export_url)
+        next(iter(response.streaming_content))
+        assert connection.in_atomic_block
+
+        response.close()
+        assert not connection.in_atomic_block
+
+    def test_asgi(self, authentication_token, tasks):
+        async def export():
+            response = await AsyncClient().get(
+                export_url, headers={"Authorization": f"Bearer {authentication_token}"}
+            )
+            return [chunk async for chunk in response.streaming_content]
+
+        chunks = async_to_sync(export)()
+        rows = read_ndjson(b"".join(chunks))
+        assert [row["id"] for row in rows] == [task.id for task in reversed(tasks)]
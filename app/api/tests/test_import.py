@@ -0,0 +1,237 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+
+from task_tracker.constants import TITLE_FIELD_MAX_LENGTH
+from tasks import importing
+from tasks.models import Task, TaskImport
+
+import_url = reverse("api:tasks-import")
+
+
+def ndjson(rows) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+@pytest.mark.django_db
+class TestImport:
+    """Test bulk imports of tasks through the API."""
+
+    def post(self, client, content: bytes, content_type: str, **params):
+        query = "&".join(f"{key}={value}" for key, value in params.items())
+        return client.post(
+            f"{import_url}?{query}" if query else import_url,
+            content,
+            content_type=content_type,
+        )
+
+    def test_ndjson(self, authorized_client, test_user, django_assert_max_num_queries):
+        rows = [
+            {"title": f"Task {i}", "completed": i % 2 == 0, "description": "Text"}
+            for i in range(20)
+        ]
+        # Per batch: lock the import, create, fill, move and drop the staging
+        # table, save progress.
+        with django_assert_max_num_queries(11):
+            response = self.post(
+                authorized_client, ndjson(rows), "application/x-ndjson"
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["processed"] == response.data["imported"] == 20
+        assert response.data["finished_at"] is not None
+        tasks = Task.objects.filter(owner=test_user).order_by("id")
+        assert [(task.title, task.completed) for task in tasks] == [
+            (row["title"], row["completed"]) for row in rows
+        ]
+        assert all(task.updated_at == task.created_at for task in tasks)
+        assert tasks.filter(search_vector="text").count() == 20
+
+    def test_csv(self, authorized_client, test_user):
+        content = (
+            "title,description,completed,created_at\n"
+            'First,"Multi\nline, quoted",true,2024-01-02T03:04:05Z\n'
+            "Second,,False,\n"
+        ).encode()
+        response = self.post(authorized_client, content, "text/csv; charset=utf-8")
+
+        assert response.data["imported"] == 2
+        first, second = Task.objects.filter(owner=test_user).order_by("id")
+        assert first.description == "Multi\nline, quoted"
+        assert first.completed
+        assert first.created_at.isoformat() == "2024-01-02T03:04:05+00:00"
+        assert first.updated_at == first.created_at
+        assert (second.description, second.completed) == ("", False)
+
+    def test_export_round_trip(self, authorized_client, test_user, another_user):
+        Task.objects.bulk_create(
+            Task(title=f"Task {i}", completed=True, owner=another_user)
+            for i in range(3)
+        )
+        exported = [
+            {**row, "owner": another_user.pk}
+            for row in Task.objects.values(
+                "id", "title", "description", "completed", "created_at", "updated_at"
+            )
+        ]
+        content = json.dumps(exported, default=str).encode()[1:-1]
+        content = ndjson(json.loads(f"[{content.decode()}]"))
+
+        response = self.post(authorized_client, content, "application/x-ndjson")
+        assert response.data["imported"] == 3
+        imported = Task.objects.filter(owner=test_user)
+        assert sorted(imported.values_list("created_at", flat=True)) == sorted(
+            Task.objects.filter(owner=another_user).values_list("created_at", flat=True)
+        )
+
+    def test_invalid_rows(self, authorized_client, test_user):
+        content = (
+            ndjson(
+                [
+                    {"title": "Valid"},
+                    {"title": "x" * (TITLE_FIELD_MAX_LENGTH + 1)},
+                    {"title": ""},
+                    {"title": "Bad", "completed": "maybe"},
+                    {"title": "Null \x00 char"},
+                    ["not", "an", "object"],
+                ]
+            )
+            + b"{broken\n\xff\xfe\n"
+        )
+        response = self.post(authorized_client, content, "application/x-ndjson")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["processed"] == 8
+        assert response.data["imported"] == 1
+        assert response.data["failed"] == 7
+        errors = {error["row"]: error["errors"] for error in response.data["errors"]}
+        assert list(errors) == [2, 3, 4, 5, 6, 7, 8]
+        assert "title" in errors[2]
+        assert "completed" in errors[4]
+        assert "non_field_errors" in errors[7]
+        assert Task.objects.filter(owner=test_user).count() == 1
+
+    def test_error_limit(self, authorized_client, monkeypatch):
+        monkeypatch.setattr(importing, "IMPORT_MAX_ERRORS", 2)
+        response = self.post(
+            authorized_client, ndjson([{"title": ""}] * 5), "application/x-ndjson"
+        )
+        assert response.data["failed"] == 5
+        assert len(response.data["errors"]) == 2
+
+    def test_resume(self, authorized_client, test_user, monkeypatch):
+        monkeypatch.setattr(importing, "IMPORT_BATCH_SIZE", 3)
+        content = ndjson({"title": f"Task {i}"} for i in range(10))
+        copy_tasks = importing.copy_tasks
+        calls = 0
+
+        def fail_third_batch(*args):
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise ConnectionError("Interrupted")
+            copy_tasks(*args)
+
+        monkeypatch.setattr(importing, "copy_tasks", fail_third_batch)
+        with pytest.raises(ConnectionError):
+            self.post(authorized_client, content, "application/x-ndjson")
+        task_import = TaskImport.objects.get()
+        assert task_import.processed == 6
+        assert task_import.finished_at is None
+
+        response = self.post(
+            authorized_client, content, "application/x-ndjson", resume=task_import.pk
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["processed"] == response.data["imported"] == 10
+        titles = Task.objects.filter(owner=test_user).values_list("title", flat=True)
+        assert sorted(titles) == sorted(f"Task {i}" for i in range(10))
+
+    def test_resume_conflict(self, authorized_client, test_user, monkeypatch):
+        task_import = TaskImport.objects.create(owner=test_user, format="ndjson")
+        clean_row = importing.clean_row
+
+        def advanced_elsewhere(*args):
+            TaskImport.objects.filter(pk=task_import.pk).update(processed=1)
+            return clean_row(*args)
+
+        monkeypatch.setattr(importing, "clean_row", advanced_elsewhere)
+        response = self.post(
+            authorized_client,
+            ndjson([{"title": "Task"}]),
+            "application/x-ndjson",
+            resume=task_import.pk,
+        )
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert not Task.objects.exists()
+
+    def test_resume_other_users_import(self, authorized_client, another_user):
+        task_import = TaskImport.objects.create(owner=another_user, format="ndjson")
+        response = self.post(
+            authorized_client, b"{}\n", "application/x-ndjson", resume=task_import.pk
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unsupported_media_type(self, authorized_client):
+        response = self.post(authorized_client, b"{}", "application/json")
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        assert not TaskImport.objects.exists()
+
+    def test_list(self, authorized_client, test_user, another_user):
+        TaskImport.objects.create(owner=another_user, format="csv")
+        task_import = TaskImport.objects.create(owner=test_user, format="csv")
+        response = authorized_client.get(import_url)
+        assert [item["id"] for item in response.data] == [str(task_import.pk)]
+
+
+@pytest.mark.django_db
+class TestImportCommand:
+    """Test the import_tasks management command."""
+
+    def test_import(self, tmp_path, test_user):
+        path = tmp_path / "tasks.csv"
+        path.write_text("title,completed\nFirst,1\nSecond,0\n,1\n")
+        out, err = StringIO(), StringIO()
+
+        call_command(
+            "import_tasks",
+            str(path),
+            owner=test_user.email,
+            batch_size=2,
+            stdout=out,
+            stderr=err,
+        )
+
+        assert "2 rows processed" in out.getvalue()
+        assert "rows/s" in out.getvalue()
+        assert "Imported 2 tasks, 1 rows failed." in out.getvalue()
+        assert "row 3:" in err.getvalue()
+        task_import = TaskImport.objects.get()
+        assert task_import.format == "csv"
+        assert task_import.finished_at is not None
+        assert Task.objects.filter(owner=test_user, completed=True).count() == 1
+
+    def test_resume(self, tmp_path, test_user):
+        path = tmp_path / "tasks.ndjson"
+        path.write_bytes(ndjson({"title": f"Task {i}"} for i in range(5)))
+        task_import = TaskImport.objects.create(
+            owner=test_user, format="ndjson", processed=3
+        )
+
+        call_command(
+            "import_tasks",
+            str(path),
+            owner=str(test_user.pk),
+            resume=str(task_import.pk),
+            stdout=StringIO(),
+        )
+        titles = Task.objects.filter(owner=test_user).values_list("title", flat=True)
+        assert sorted(titles) == ["Task 3", "Task 4"]
+
+    def test_unknown_owner(self, tmp_path):
+        with pytest.raises(CommandError, match="not found"):
+            call_command("import_tasks", str(tmp_path / "x.csv"), owner="no@one.com")
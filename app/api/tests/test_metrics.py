@@ -0,0 +1,130 @@
+import subprocess
+import sys
+
+import pytest
+from django.db import DatabaseError, connection
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+
+from tasks.models import Task
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    """Test request, cache and authentication metrics."""
+
+    metrics_url = reverse("metrics")
+    list_url = reverse("api:tasks-list")
+
+    def test_request_metrics(self, authorized_client, test_user):
+        task = Task.objects.create(title="Task", owner=test_user)
+        labels = {"view": "tasks-detail", "action": "partial_update"}
+        count = sample("http_request_duration_seconds_count", **labels)
+        queries = sample("http_request_db_queries_sum", **labels)
+
+        authorized_client.patch(
+            reverse("api:tasks-detail", args=[task.id]),
+            {"completed": True},
+            content_type="application/json",
+        )
+
+        assert sample("http_request_duration_seconds_count", **labels) == count + 1
+        assert sample("http_request_db_queries_sum", **labels) > queries
+        assert sample("http_requests_total", **labels, status="200") >= 1
+        assert sample("http_requests_in_flight") == 0
+
+    def test_views_without_actions(self, client, test_login_credentials):
+        labels = {"view": "login", "action": "post"}
+        count = sample("http_request_duration_seconds_count", **labels)
+        client.post(reverse("api:login"), test_login_credentials)
+        assert sample("http_request_duration_seconds_count", **labels) == count + 1
+
+    def test_cache_metrics(self, authorized_client):
+        hits = sample("cache_requests_total", cache="response", result="hit")
+        authorized_client.get(self.list_url)
+        authorized_client.get(self.list_url)
+        assert sample("cache_requests_total", cache="response", result="hit") == (
+            hits + 1
+        )
+
+    def test_auth_failures(self, client, test_login_credentials):
+        invalid_token = sample("auth_failures_total", reason="token_not_valid")
+        invalid_login = sample("auth_failures_total", reason="no_active_account")
+
+        client.get(self.list_url, HTTP_AUTHORIZATION="Bearer invalid")
+        client.post(
+            reverse("api:login"), {**test_login_credentials, "password": "wrong"}
+        )
+
+        assert sample("auth_failures_total", reason="token_not_valid") == (
+            invalid_token + 1
+        )
+        assert sample("auth_failures_total", reason="no_active_account") == (
+            invalid_login + 1
+        )
+
+    def test_exposition(self, client):
+        client.get(self.list_url)
+        response = client.get(self.metrics_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain")
+        body = response.content.decode()
+        assert 'http_request_duration_seconds_bucket{action="list"' in body
+        assert "db_query_duration_seconds_bucket" in body
+
+    def test_pool_stats(self, client, settings):
+        if not settings.DB_POOL:
+            pytest.skip("Connection pooling is off.")
+        response = client.get(self.metrics_url)
+
+        body = response.content.decode()
+        assert 'db_pool{stat="pool_max"} ' in body
+        assert 'db_pool{stat="pool_available"} ' in body
+
+
+def test_multiprocess_aggregation(client, tmp_path, monkeypatch):
+    """Test samples of every worker process are added up."""
+    script = (
+        "from prometheus_client import Counter; "
+        "Counter('worker_events', 'Events.').inc(2)"
+    )
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env={"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)},
+            check=True,
+        )
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    response = client.get(reverse("metrics"))
+    assert "worker_events_total 4.0" in response.content.decode()
+
+
+class TestHealthChecks:
+    """Test the liveness and readiness endpoints."""
+
+    def test_healthz_skips_database(self, client, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            response = client.get(reverse("healthz"))
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.django_db
+    def test_readyz(self, client, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = client.get(reverse("readyz"))
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.django_db
+    def test_readyz_database_down(self, client, monkeypatch):
+        def fail(*args, **kwargs):
+            raise DatabaseError("connection refused")
+
+        monkeypatch.setattr(connection, "ensure_connection", fail)
+        response = client.get(reverse("readyz"))
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
@@ -0,0 +1,109 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from tasks.models import Task, TaskCounter, TaskTombstone
+from tasks.partitioning import is_partitioned
+
+tasks_url = reverse("api:tasks-list")
+
+
+def partitions_scanned(queryset) -> set[str]:
+    plan = queryset.explain()
+    return {word for word in plan.split() if word.startswith("tasks_task_p")}
+
+
+@pytest.fixture
+def tasks(test_user, another_user) -> list[Task]:
+    Task.objects.create(title="Someone else's", owner=another_user)
+    return Task.objects.bulk_create(
+        Task(title=f"Task {i}", completed=i < 2, owner=test_user) for i in range(5)
+    )
+
+
+@pytest.fixture
+def partitioned(tasks):
+    # DDL is transactional, the test's rollback restores the plain table.
+    call_command("partition_task_table", partitions=4, stdout=StringIO())
+
+
+@pytest.mark.django_db
+class TestPartitioning:
+    """Test the task table converts into hash partitions by owner."""
+
+    @pytest.mark.usefixtures("partitioned")
+    def test_tasks_are_kept(self, tasks, test_user):
+        assert is_partitioned()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_inherits, pg_class parent "
+                "WHERE inhparent = parent.oid AND relname = 'tasks_task'"
+            )
+            assert cursor.fetchone()[0] == 4
+        assert sorted(test_user.tasks.values_list("id", flat=True)) == sorted(
+            task.pk for task in tasks
+        )
+        assert Task.objects.count() == 6
+        counter = TaskCounter.objects.get(owner=test_user)
+        assert (counter.total, counter.completed) == (5, 2)
+
+    @pytest.mark.usefixtures("partitioned")
+    def test_owner_queries_scan_one_partition(self, test_user):
+        assert len(partitions_scanned(test_user.tasks.all())) == 1
+        assert len(partitions_scanned(Task.objects.all())) == 4
+
+    @pytest.mark.usefixtures("partitioned")
+    def test_api(self, authorized_client, tasks, test_user, task_url):
+        response = authorized_client.post(tasks_url, {"title": "New"})
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["id"] > max(task.pk for task in tasks)
+
+        response = authorized_client.get(tasks_url)
+        assert response.data["count"] == 6
+
+        response = authorized_client.patch(
+            task_url(tasks[0].pk), {"completed": False}, content_type="application/json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = authorized_client.delete(task_url(tasks[1].pk))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        counter = TaskCounter.objects.get(owner=test_user)
+        assert (counter.total, counter.completed) == (5, 0)
+        assert TaskTombstone.objects.filter(task_id=tasks[1].pk).exists()
+
+    @pytest.mark.usefixtures("partitioned")
+    def test_owner_change_moves_partition(self, tasks, test_user, another_user):
+        task = tasks[0]
+        task.owner = another_user
+        task.save()
+        assert Task.objects.get(pk=task.pk).owner_id == another_user.pk
+        assert TaskCounter.objects.get(owner=test_user).total == 4
+        assert TaskCounter.objects.get(owner=another_user).total == 2
+        assert TaskTombstone.objects.filter(task_id=task.pk, owner=test_user).exists()
+
+    @pytest.mark.usefixtures("partitioned")
+    def test_admin(self, admin_client, tasks):
+        response = admin_client.get(reverse("admin:tasks_task_changelist"))
+        assert response.status_code == status.HTTP_200_OK
+        response = admin_client.get(
+            reverse("admin:tasks_task_change", args=[tasks[0].pk])
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.usefixtures("partitioned")
+    def test_already_partitioned(self):
+        with pytest.raises(CommandError, match="already partitioned"):
+            call_command("partition_task_table")
+
+    @pytest.mark.usefixtures("tasks")
+    def test_dry_run(self):
+        out = StringIO()
+        call_command("partition_task_table", partitions=2, dry_run=True, stdout=out)
+        assert "PARTITION BY HASH (owner_id)" in out.getvalue()
+        assert "CREATE TRIGGER tasks_task_change " in out.getvalue()
+        assert not is_partitioned()
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+from django.contrib.auth.hashers import identify_hasher
+from django.urls import reverse
+from rest_framework import status
+
+from users.hashing import HashingPool, HashingPoolBusy, hashing_pool
+
+ARGON2_FIRST = [
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+]
+
+
+def test_pool_rejects_work_beyond_max_pending():
+    pool = HashingPool(workers=1, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+        return "done"
+
+    thread = threading.Thread(target=pool.run, args=(block,))
+    thread.start()
+    started.wait()
+    try:
+        with pytest.raises(HashingPoolBusy):
+            pool.run(str, "rejected")
+    finally:
+        release.set()
+        thread.join()
+    assert pool.run(str, "accepted") == "accepted"
+
+
+@pytest.mark.django_db
+class TestPasswordHashing:
+    """Test sign-up and login hashing passwords in the hashing pool."""
+
+    register_url = reverse("api:register")
+    login_url = reverse("api:login")
+
+    def test_sign_up_uses_preferred_hasher(
+        self, client, settings, django_user_model, test_user_data
+    ):
+        settings.PASSWORD_HASHERS = ARGON2_FIRST
+        response = client.post(self.register_url, data=test_user_data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        user = django_user_model.objects.get(email=test_user_data["email"])
+        assert identify_hasher(user.password).algorithm == "argon2"
+        assert user.check_password(test_user_data["password"])
+
+    def test_login_upgrades_hash(
+        self, client, settings, test_user, test_login_credentials
+    ):
+        """Test a hash of another hasher is replaced on successful login."""
+        assert identify_hasher(test_user.password).algorithm == "pbkdf2_sha256"
+        settings.PASSWORD_HASHERS = ARGON2_FIRST
+
+        response = client.post(self.login_url, data=test_login_credentials)
+        assert response.status_code == status.HTTP_200_OK
+        test_user.refresh_from_db()
+        assert identify_hasher(test_user.password).algorithm == "argon2"
+
+    def test_failed_login_keeps_hash(
+        self, client, settings, test_user, test_login_credentials
+    ):
+        password = test_user.password
+        settings.PASSWORD_HASHERS = ARGON2_FIRST
+
+        response = client.post(
+            self.login_url, data={**test_login_credentials, "password": "wrong"}
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        test_user.refresh_from_db()
+        assert test_user.password == password
+
+    @pytest.mark.usefixtures("test_user")
+    def test_saturated_pool(self, client, monkeypatch, test_login_credentials):
+        """Test logins are turned away while the pool is full."""
+        monkeypatch.setattr(hashing_pool, "_slots", threading.Semaphore(0))
+
+        response = client.post(self.login_url, data=test_login_credentials)
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response["Retry-After"] == "1"
+        assert response.data["detail"].code == "hashing_pool_busy"
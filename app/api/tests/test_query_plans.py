@@ -0,0 +1,247 @@
+import datetime as dt
+import json
+from typing import Any, Iterator
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from tasks.admin import TaskAdmin
+from tasks.archiving import archive_tasks
+from tasks.models import Task, TaskArchive
+
+TASKS_TABLE = Task._meta.db_table
+ARCHIVE_TABLE = TaskArchive._meta.db_table
+FORBIDDEN_NODES = {"Seq Scan", "Sort", "Incremental Sort", "BitmapAnd", "BitmapOr"}
+# Admin changelist pages by filter, every filter of TaskAdmin has a plan
+# test. The owner is filled in with the test user.
+ADMIN_PLAN_PARAMS = {
+    "default": {},
+    "open": {"completed__exact": "0"},
+    "created": {"created": "2024-02"},
+    "owner": {"owner__id__exact": None},
+    "search": {"q": "Task"},
+}
+
+
+def iter_plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def explain(sql: str) -> dict[str, Any]:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        (result,) = cursor.fetchone()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+@pytest.fixture
+def planner_without_fallbacks():
+    """
+    Make the planner avoid sequential scans and explicit sorts whenever an
+    index can serve the query, so that small test tables produce the same
+    plans as production-sized ones. A plan that still contains such a node
+    means no index covers the access pattern.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_sort = off")
+        cursor.execute(f"ANALYZE {TASKS_TABLE}")
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("planner_without_fallbacks")
+class TestTaskQueryPlans:
+    """Test that task endpoint queries are served by indexes."""
+
+    @pytest.fixture(autouse=True)
+    def tasks(self, test_user, another_user):
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {i}",
+                description=f"Description {i}",
+                completed=bool(i % 2),
+                owner=owner,
+            )
+            for owner in (test_user, another_user)
+            for i in range(50)
+        )
+
+    def assert_index_backed(
+        self,
+        client,
+        url: str,
+        params: dict[str, str],
+        forbidden_nodes: set[str] = FORBIDDEN_NODES,
+        relations: frozenset[str] = frozenset({TASKS_TABLE}),
+    ):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, data=params)
+        assert response.status_code == status.HTTP_200_OK
+
+        task_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and TASKS_TABLE in query["sql"]
+        ]
+        assert task_queries, "No task queries were captured"
+        for sql in task_queries:
+            nodes = list(iter_plan_nodes(explain(sql)))
+            forbidden = [
+                node["Node Type"]
+                for node in nodes
+                if node["Node Type"] in forbidden_nodes
+                and node.get("Relation Name", TASKS_TABLE) in relations
+            ]
+            assert not forbidden, f"{forbidden} in plan for: {sql}"
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"page": "2"},
+            {"completed": "true"},
+            {"completed": "false"},
+        ],
+        ids=["default", "second_page", "completed", "open"],
+    )
+    def test_list_plans(self, authorized_client, params):
+        """Test list queries use owner-scoped indexes without sorting."""
+        self.assert_index_backed(authorized_client, reverse("api:tasks-list"), params)
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"search": "Task"},
+            {"search": "Descr"},
+            {"search": "Taks"},
+            {"search": "Task", "completed": "true"},
+            {"search": "Task", "completed": "false"},
+        ],
+        ids=["word", "substring", "typo", "completed", "open"],
+    )
+    def test_search_plans(self, authorized_client, params):
+        """
+        Test search queries are index-backed.
+        Ranked results have to be sorted, so only sequential scans fail.
+        """
+        self.assert_index_backed(
+            authorized_client,
+            reverse("api:tasks-list"),
+            params,
+            forbidden_nodes={"Seq Scan"},
+        )
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"pagination": "cursor"},
+            {"pagination": "cursor", "completed": "true"},
+            {"pagination": "cursor", "completed": "false"},
+        ],
+        ids=["default", "completed", "open"],
+    )
+    def test_keyset_plans(self, authorized_client, params):
+        """Test keyset pages seek into the indexes in both directions."""
+        url = reverse("api:tasks-list")
+        response = authorized_client.get(url, data={**params, "page_size": 5})
+        next_url = response.data["next"]
+        self.assert_index_backed(authorized_client, next_url, {})
+        previous_url = authorized_client.get(next_url).data["previous"]
+        self.assert_index_backed(authorized_client, previous_url, {})
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"include_archived": "true"},
+            {"include_archived": "true", "page": "2"},
+            {"completed": "true"},
+            {"include_archived": "true", "completed": "false"},
+        ],
+        ids=["default", "second_page", "completed", "open"],
+    )
+    def test_archive_plans(self, authorized_client, params):
+        """Test lists with archived tasks merge both tables' indexes in order."""
+        archive_tasks(older_than=dt.timedelta(0), batch_size=10)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {ARCHIVE_TABLE}")
+        self.assert_index_backed(
+            authorized_client,
+            reverse("api:tasks-list"),
+            params,
+            relations=frozenset({TASKS_TABLE, ARCHIVE_TABLE}),
+        )
+
+    def test_changes_plan(self, authorized_client):
+        """Test delta sync pages seek into the owner's changes in order."""
+        url = reverse("api:tasks-changes")
+        next_url = authorized_client.get(url, data={"page_size": 5}).data["next"]
+        self.assert_index_backed(authorized_client, next_url, {})
+
+    def test_list_validators_plan(self, authorized_client):
+        """Test list ETags are computed from indexes alone."""
+        with CaptureQueriesContext(connection) as context:
+            authorized_client.get(reverse("api:tasks-list"))
+        (sql,) = [
+            query["sql"]
+            for query in context.captured_queries
+            if '"last_modified"' in query["sql"]
+        ]
+        # Without a vacuumed visibility map, small tables favour bitmap scans.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+        scans = [
+            (node["Node Type"], node.get("Index Name"))
+            for node in iter_plan_nodes(explain(sql))
+            if "Relation Name" in node
+        ]
+        assert sorted(scans) == [
+            ("Index Only Scan", "task_owner_updated_idx"),
+            ("Index Scan", "tasks_taskcounter_pkey"),
+        ]
+
+    @pytest.mark.parametrize(
+        "params", ADMIN_PLAN_PARAMS.values(), ids=ADMIN_PLAN_PARAMS.keys()
+    )
+    def test_admin_plans(self, admin_client, test_user, params):
+        """Test the admin changelist's pages seek into the created index."""
+        if "owner__id__exact" in params:
+            params = {"owner__id__exact": str(test_user.pk)}
+        url = reverse("admin:tasks_task_changelist")
+        # Searches combine several indexes, only sequential scans fail.
+        nodes = {"Seq Scan"} if "q" in params else FORBIDDEN_NODES
+        self.assert_index_backed(admin_client, url, params, nodes)
+        # The next pages continue after the last task shown.
+        cursor = Task.objects.order_by("-created_at", "-id")[10]
+        after = f"{cursor.created_at.isoformat()}_{cursor.id}"
+        self.assert_index_backed(admin_client, url, {**params, "after": after}, nodes)
+
+    def test_admin_filters_have_plans(self):
+        """Test every changelist filter is covered by the admin plans."""
+        filters = {
+            (field if isinstance(field, str) else field.parameter_name).split("__")[0]
+            for field in TaskAdmin.list_filter
+        }
+        covered = {
+            name.split("__")[0]
+            for params in ADMIN_PLAN_PARAMS.values()
+            for name in params
+            if name != "q"
+        }
+        assert filters == covered
+
+    def test_detail_plan(self, authorized_client, test_user):
+        """Test task retrieval uses an index."""
+        task = Task.objects.filter(owner=test_user).first()
+        self.assert_index_backed(
+            authorized_client,
+            reverse("api:tasks-detail", args=[task.id]),
+            {},
+        )
@@ -0,0 +1,167 @@
+import pytest
+from django.core.cache import cache
+from django.db import connections
+from django.urls import reverse
+from rest_framework import status
+
+from task_tracker.routers import ReplicaRouter, replica_alias, use_replica
+from tasks.cache import primary_pin_key
+from tasks.models import Task
+
+tasks_url = reverse("api:tasks-list")
+
+
+@pytest.fixture
+def replica(settings):
+    """
+    A replica lagging behind every write of the test: a second connection to
+    the test database, which doesn't see the rows of the test's transaction.
+    """
+    primary = connections["default"]
+    settings_dict = {**primary.settings_dict, "OPTIONS": {}, "CONN_MAX_AGE": None}
+    # Test cases only allow connections to their databases and to ones
+    # unknown to the settings, so it's connected before it's configured.
+    wrapper = primary.__class__(settings_dict, "replica")
+    connections["replica"] = wrapper
+    wrapper.ensure_connection()
+    # Lets other threads look up the alias.
+    connections.settings["replica"] = settings_dict
+    settings.DATABASE_REPLICAS = ["replica"]
+    yield wrapper
+    wrapper.close()
+    del connections["replica"]
+    del connections.settings["replica"]
+
+
+@pytest.fixture
+def task(test_user) -> Task:
+    task = Task.objects.create(title="Task", owner=test_user)
+    # Written long enough ago for the pin to have expired.
+    cache.delete(primary_pin_key(test_user.pk))
+    return task
+
+
+@pytest.fixture
+def get(authorized_client, replica, capture_statements):
+    """GET a URL, returning the response and the statements run on the replica."""
+
+    def get(url, **params):
+        with capture_statements(replica.alias) as statements:
+            response = authorized_client.get(url, data=params)
+            if response.streaming:
+                # Exports are read while they're sent.
+                b"".join(response.streaming_content)
+        return response, statements
+
+    return get
+
+
+@pytest.mark.django_db
+class TestReplicaReads:
+    """Test task reads go to replicas unless the user just wrote."""
+
+    @pytest.mark.usefixtures("task")
+    def test_list_reads_replica(self, get):
+        response, statements = get(tasks_url)
+        assert response.status_code == status.HTTP_200_OK
+        # The replica hasn't caught up with the task yet.
+        assert response.data["count"] == 0
+        assert statements
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            reverse("api:tasks-stats"),
+            reverse("api:tasks-export"),
+            reverse("api:tasks-changes"),
+        ],
+    )
+    @pytest.mark.usefixtures("task")
+    def test_reads_from_replica(self, url, get):
+        response, statements = get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert statements
+
+    def test_retrieve_reads_replica(self, task, task_url, get):
+        response, _ = get(task_url(task.pk))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_writes_go_to_primary(
+        self, authorized_client, replica, task, task_url, capture_statements
+    ):
+        with capture_statements(replica.alias) as statements:
+            response = authorized_client.patch(
+                task_url(task.pk), {"completed": True}, content_type="application/json"
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert not statements
+
+    def test_reads_own_writes(self, authorized_client, replica, test_user, get):
+        response = authorized_client.post(tasks_url, {"title": "New"})
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response, statements = get(tasks_url)
+        assert response.data["count"] == 1
+        assert not statements
+
+        # Once the pin expires, the user reads the replica again.
+        cache.delete(primary_pin_key(test_user.pk))
+        response, statements = get(tasks_url, page=1)
+        assert response.data["results"] == []
+        assert statements
+
+    def test_pin_is_per_user(self, test_user, another_user, get):
+        Task.objects.create(title="Someone else's", owner=another_user)
+        response, statements = get(tasks_url)
+        assert response.data["count"] == 0
+        assert statements
+        assert not cache.get(primary_pin_key(test_user.pk))
+        assert cache.get(primary_pin_key(another_user.pk))
+
+    @pytest.mark.usefixtures("task")
+    def test_replica_reads_not_cached(self, authorized_client, replica, settings, get):
+        response, _ = get(tasks_url)
+        assert response.data["count"] == 0
+        etag = response["ETag"]
+
+        # Reads of the primary don't get the lagging replica's page or ETag.
+        settings.DATABASE_REPLICAS = []
+        response = authorized_client.get(tasks_url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == 1
+
+    @pytest.mark.usefixtures("task")
+    def test_without_replicas(self, authorized_client, settings, test_user):
+        settings.DATABASE_REPLICAS = []
+        response = authorized_client.get(tasks_url)
+        assert response.data["count"] == 1
+        assert not cache.get(primary_pin_key(test_user.pk))
+
+
+class TestReplicaRouter:
+    """Test the router keeps a request on the primary after it writes."""
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        settings.DATABASE_REPLICAS = ["replica_1"]
+        token = replica_alias.set(None)
+        yield
+        replica_alias.reset(token)
+
+    def test_reads_default_unless_replica_picked(self):
+        router = ReplicaRouter()
+        assert router.db_for_read(Task) == "default"
+        use_replica()
+        assert router.db_for_read(Task) == "replica_1"
+
+    def test_write_moves_reads_to_primary(self):
+        router = ReplicaRouter()
+        use_replica()
+        assert router.db_for_write(Task) == "default"
+        assert router.db_for_read(Task) == "default"
+
+    def test_migrates_primary_only(self):
+        router = ReplicaRouter()
+        assert router.allow_migrate("default", "tasks")
+        assert not router.allow_migrate("replica_1", "tasks")
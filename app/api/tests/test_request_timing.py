@@ -0,0 +1,88 @@
+import json
+import logging
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+
+from tasks.models import Task
+
+
+def parse_server_timing(header: str) -> dict[str, dict[str, str]]:
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+@pytest.fixture
+def timing_logs(caplog):
+    logger = logging.getLogger("api.timing")
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.mark.django_db
+class TestRequestTiming:
+    """Test the Server-Timing header and timing logs of sampled requests."""
+
+    list_url = reverse("api:tasks-list")
+
+    @pytest.fixture(autouse=True)
+    def tasks(self, test_user):
+        Task.objects.bulk_create(
+            Task(title=f"Task {i}", owner=test_user) for i in range(3)
+        )
+
+    def test_server_timing(self, authorized_client, django_assert_num_queries):
+        with django_assert_num_queries(3) as context:
+            response = authorized_client.get(self.list_url)
+
+        metrics = parse_server_timing(response["Server-Timing"])
+        assert list(metrics) == ["db", "auth", "serialize", "render", "total"]
+        assert metrics["db"]["desc"] == f'"{len(context.captured_queries)} queries"'
+        assert all(float(metric["dur"]) >= 0 for metric in metrics.values())
+        assert float(metrics["total"]["dur"]) >= float(metrics["db"]["dur"])
+
+    def test_log_line(self, authorized_client, timing_logs):
+        authorized_client.get(self.list_url, {"search": "task"})
+
+        (record,) = timing_logs.records
+        entry = json.loads(record.getMessage())
+        assert entry["method"] == "GET"
+        assert entry["path"] == self.list_url
+        assert entry["view"] == "api:tasks-list"
+        assert entry["status"] == status.HTTP_200_OK
+        assert entry["db_queries"] > 0
+        assert set(entry) >= {"db_ms", "auth_ms", "serialize_ms", "render_ms"}
+
+    def test_unsampled_requests(self, authorized_client, settings, timing_logs):
+        settings.REQUEST_TIMING_SAMPLE_RATE = 0
+        response = authorized_client.get(self.list_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "Server-Timing" not in response
+        assert not timing_logs.records
+
+    def test_errors_are_timed(self, client):
+        response = client.get(self.list_url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert re.search(r"auth;dur=[\d.]+", response["Server-Timing"])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_request_timing(authentication_token, test_user):
+    """Test queries made in threads of an ASGI request are counted."""
+    Task.objects.create(title="Task", owner=test_user)
+    response = async_to_sync(AsyncClient().get)(
+        reverse("api:tasks-list"),
+        headers={"Authorization": f"Bearer {authentication_token}"},
+    )
+
+    metrics = parse_server_timing(response["Server-Timing"])
+    assert metrics["db"]["desc"] == '"3 queries"'
@@ -0,0 +1,150 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.cache import response_cache_stats
+from tasks.cache import generation_key, get_task_generation
+from tasks.models import Task
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Test caching of task list and detail responses."""
+
+    list_url = reverse("api:tasks-list")
+
+    @pytest.fixture(autouse=True)
+    def reset_stats(self):
+        response_cache_stats.reset()
+
+    @pytest.fixture
+    def test_task(self, test_user) -> Task:
+        return Task.objects.create(title="Cached task", owner=test_user)
+
+    def detail_url(self, task: Task) -> str:
+        return reverse("api:tasks-detail", args=[task.id])
+
+    def test_repeated_list_is_served_from_cache(self, authorized_client, test_task):
+        """Test a repeated request skips the task queries."""
+        first = authorized_client.get(self.list_url)
+        with CaptureQueriesContext(connection) as context:
+            second = authorized_client.get(self.list_url)
+
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+        assert not [
+            query
+            for query in context.captured_queries
+            if Task._meta.db_table in query["sql"]
+        ]
+        assert response_cache_stats.snapshot() == {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        }
+
+    def test_query_string_is_part_of_the_key(self, authorized_client, test_task):
+        """Test different query strings are cached separately."""
+        authorized_client.get(self.list_url)
+        response = authorized_client.get(self.list_url, {"completed": "true"})
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == 0
+
+    def test_vary_headers_are_part_of_the_key(self, authorized_client, test_task):
+        """Test the pagination mode header selects a separate entry."""
+        authorized_client.get(self.list_url)
+        response = authorized_client.get(self.list_url, HTTP_X_PAGINATION="cursor")
+        assert response["X-Cache"] == "MISS"
+        assert "count" not in response.data
+
+    def test_users_do_not_share_entries(
+        self, authorized_client, client, another_user, test_task
+    ):
+        """Test cached responses are never served to another user."""
+        authorized_client.get(self.list_url)
+        Task.objects.create(title="Other task", owner=another_user)
+        token = RefreshToken.for_user(another_user).access_token
+
+        response = client.get(self.list_url, HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert response["X-Cache"] == "MISS"
+        assert [task["title"] for task in response.data["results"]] == ["Other task"]
+
+    @pytest.mark.parametrize(
+        "method, data, expected_status",
+        [
+            ("post", {"title": "New task"}, status.HTTP_201_CREATED),
+            ("patch", {"completed": True}, status.HTTP_200_OK),
+            ("delete", None, status.HTTP_204_NO_CONTENT),
+        ],
+        ids=["create", "update", "delete"],
+    )
+    def test_writes_invalidate(
+        self, authorized_client, test_task, method, data, expected_status
+    ):
+        """Test writes through the API invalidate list and detail responses."""
+        authorized_client.get(self.list_url)
+        authorized_client.get(self.detail_url(test_task))
+
+        url = self.list_url if method == "post" else self.detail_url(test_task)
+        response = getattr(authorized_client, method)(
+            url, data, content_type="application/json"
+        )
+        assert response.status_code == expected_status
+
+        response = authorized_client.get(self.list_url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == Task.objects.count()
+        response = authorized_client.get(self.detail_url(test_task))
+        assert response.get("X-Cache") != "HIT"
+
+    def test_model_save_invalidates(self, authorized_client, test_task):
+        """Test saves outside the API, e.g. in the admin, invalidate too."""
+        authorized_client.get(self.detail_url(test_task))
+        test_task.title = "Renamed"
+        test_task.save()
+
+        response = authorized_client.get(self.detail_url(test_task))
+        assert response["X-Cache"] == "MISS"
+        assert response.data["title"] == "Renamed"
+
+    def test_owner_change_invalidates_both_owners(
+        self, authorized_client, test_user, another_user, test_task
+    ):
+        """Test moving a task invalidates the previous owner as well."""
+        authorized_client.get(self.list_url)
+        previous = get_task_generation(test_user.id)
+        task = Task.objects.get(pk=test_task.pk)
+        task.owner = another_user
+        task.save()
+
+        assert get_task_generation(test_user.id) != previous
+        response = authorized_client.get(self.list_url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == 0
+
+    def test_owner_profile_change_invalidates(self, authorized_client, test_user):
+        """Test tasks are refreshed when their embedded owner changes."""
+        Task.objects.create(title="Task", owner=test_user)
+        authorized_client.get(self.list_url)
+        test_user.first_name = "Renamed"
+        test_user.save()
+
+        response = authorized_client.get(self.list_url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["owner"]["first_name"] == "Renamed"
+
+    def test_lost_generation_does_not_revive_entries(
+        self, authorized_client, test_user, test_task
+    ):
+        """Test an evicted generation counter never reuses an old value."""
+        authorized_client.get(self.list_url)
+        previous = get_task_generation(test_user.id)
+        cache.delete(generation_key(test_user.id))
+
+        assert get_task_generation(test_user.id) > previous
+        assert authorized_client.get(self.list_url)["X-Cache"] == "MISS"
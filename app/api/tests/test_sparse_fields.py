@@ -0,0 +1,107 @@
+import datetime as dt
+import json
+
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import ORJSONRenderer
+from api.serializers import TasksSerializer
+from tasks.models import Task
+
+tasks_url = reverse("api:tasks-list")
+
+
+def task_queries(statements: list[str]) -> list[str]:
+    return [sql for sql in statements if 'FROM "tasks_task"' in sql]
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+    """Test ``?fields=`` narrows task responses and the columns fetched."""
+
+    @pytest.fixture(autouse=True)
+    def tasks(self, test_user) -> list[Task]:
+        return Task.objects.bulk_create(
+            Task(title=f"Task {i}", description="x" * 1000, owner=test_user)
+            for i in range(15)
+        )
+
+    @pytest.mark.parametrize(
+        "params", [{}, {"pagination": "cursor"}, {"search": "task"}]
+    )
+    def test_list(self, get_statements, params):
+        response, statements = get_statements(
+            tasks_url, fields="id,title,completed", **params
+        )
+        queries = task_queries(statements)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert all(
+            set(task) == {"id", "title", "completed"}
+            for task in response.data["results"]
+        )
+        assert queries
+        assert not any('"description"' in sql for sql in queries)
+
+    def test_keyset_cursor(self, get_statements):
+        response, _ = get_statements(tasks_url, fields="title", pagination="cursor")
+        _, statements = get_statements(response.data["next"])
+        # The page and nothing else, the cursor doesn't refetch rows.
+        assert len(task_queries(statements)) == 1
+
+    def test_retrieve(self, get_statements, tasks, task_url):
+        response, statements = get_statements(
+            task_url(tasks[0].id), fields="title,owner"
+        )
+        assert set(response.data) == {"title", "owner"}
+        assert not any('"description"' in sql for sql in task_queries(statements))
+
+    def test_changes(self, get_statements):
+        url = reverse("api:tasks-changes")
+        response, _ = get_statements(url, fields="id,completed")
+        assert len(response.data["changed"]) == 15
+        assert set(response.data["changed"][0]) == {"id", "completed"}
+
+    def test_unknown_fields(self, get_statements):
+        response, _ = get_statements(tasks_url, fields="title,secret,x")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["fields"] == ["Unknown fields: secret, x."]
+
+    def test_writes_return_all_fields(self, authorized_client):
+        response = authorized_client.post(
+            f"{tasks_url}?fields=id", {"title": "New"}, content_type="application/json"
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert set(response.data) == set(TasksSerializer.Meta.fields)
+
+
+class TestORJSONRenderer:
+    """Test the orjson renderer matches DRF's JSON renderer."""
+
+    def test_same_output(self):
+        data = {
+            "count": 3,
+            "next": None,
+            "results": [
+                {"id": 1, "title": "Ünïcode ✓", "completed": False, "ratio": 0.5},
+                {"id": 2, "title": 'Quote " and \\ slash', "tags": []},
+                {"id": 3, "title": "Line\u2028and paragraph\u2029separators"},
+            ],
+            "detail": gettext_lazy("Not found."),
+            "created_at": dt.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt.UTC),
+            1: "non-string key",
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent(self):
+        rendered = ORJSONRenderer().render({"a": [1]}, "application/json; indent=2", {})
+        assert rendered == JSONRenderer().render(
+            {"a": [1]}, "application/json; indent=2", {}
+        )
+        assert json.loads(rendered) == {"a": [1]}
+
+    def test_empty(self):
+        assert ORJSONRenderer().render(None) == b""
@@ -0,0 +1,160 @@
+import datetime as dt
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from tasks.admin import EstimatedCountPaginator, TaskAdmin
+from tasks.models import Task
+
+changelist_url = reverse("admin:tasks_task_changelist")
+
+
+@pytest.fixture
+def tasks(test_user, another_user) -> list[Task]:
+    """150 tasks of the user, newest first, and 10 of another user."""
+    Task.objects.bulk_create(
+        Task(title=f"Other task {i}", owner=another_user) for i in range(10)
+    )
+    tasks = Task.objects.bulk_create(
+        Task(title=f"Task {i}", owner=test_user) for i in range(150)
+    )
+    # Tied timestamps are ordered by id.
+    Task.objects.filter(owner=test_user).update(created_at=timezone.now())
+    return sorted(tasks, key=lambda task: task.id, reverse=True)
+
+
+def result_ids(response) -> list[int]:
+    return [task.id for task in response.context["cl"].result_list]
+
+
+@pytest.mark.django_db
+class TestTaskAdmin:
+    """Test the task changelist pages by keyset and avoids full scans."""
+
+    def test_keyset_pages(self, admin_client, tasks, django_assert_max_num_queries):
+        with django_assert_max_num_queries(10):
+            response = admin_client.get(changelist_url)
+        assert response.status_code == status.HTTP_200_OK
+        cl = response.context["cl"]
+        assert cl.result_count == 160
+        assert cl.full_result_count is None
+        ids = result_ids(response)
+        assert ids == [task.id for task in tasks[:100]]
+        assert cl.first_page_url is None
+
+        response = admin_client.get(changelist_url + cl.next_page_url)
+        cl = response.context["cl"]
+        assert result_ids(response) == [task.id for task in tasks[100:]] + [
+            task.id for task in Task.objects.exclude(owner=tasks[0].owner)
+        ]
+        assert cl.next_page_url is None
+        assert cl.first_page_url == "?"
+
+    @pytest.mark.usefixtures("tasks")
+    def test_filter_keeps_position_out(self, admin_client):
+        response = admin_client.get(changelist_url)
+        next_page_url = response.context["cl"].next_page_url
+        response = admin_client.get(changelist_url + next_page_url + "&completed=0")
+        cl = response.context["cl"]
+        assert "after" not in cl.params
+        assert "after" not in cl.get_query_string({"completed__exact": 1})
+
+    @pytest.mark.usefixtures("tasks")
+    def test_invalid_cursor(self, admin_client):
+        response = admin_client.get(changelist_url, {"after": "yesterday"})
+        assert response.status_code == status.HTTP_302_FOUND
+        assert response.url.endswith("?e=1")
+
+    def test_sorted_by_created_at(self, admin_client, tasks):
+        response = admin_client.get(changelist_url, {"o": "3", "p": "2"})
+        cl = response.context["cl"]
+        assert not cl.keyset
+        assert len(result_ids(response)) == 60
+
+    @pytest.mark.usefixtures("tasks")
+    def test_estimated_count(self, admin_client, monkeypatch):
+        monkeypatch.setattr("tasks.admin.PAGINATION_COUNT_CAP", 10)
+        response = admin_client.get(changelist_url)
+        assert response.context["cl"].paginator.estimated
+        assert b"about" in response.content
+
+        paginator = EstimatedCountPaginator(Task.objects.filter(title="Task 1"), 100)
+        assert paginator.count == 1
+        assert not paginator.estimated
+
+    def test_owner_filter(self, admin_client, tasks, test_user, another_user):
+        response = admin_client.get(
+            changelist_url, {"owner__id__exact": another_user.pk}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert set(result_ids(response)) == set(
+            another_user.tasks.values_list("id", flat=True)
+        )
+        content = response.content.decode()
+        assert "admin-autocomplete" in content
+        assert f'<option value="{another_user.pk}" selected>' in content
+        # Users are only listed by the autocomplete.
+        assert test_user.username not in content
+
+        response = admin_client.get(changelist_url, {"owner__id__exact": "me"})
+        assert response.status_code == status.HTTP_302_FOUND
+
+    @pytest.mark.usefixtures("tasks")
+    def test_search(self, admin_client, another_user):
+        response = admin_client.get(changelist_url, {"q": "other"})
+        assert len(result_ids(response)) == 10
+        response = admin_client.get(changelist_url, {"q": "ask 14"})
+        assert {task.title for task in response.context["cl"].result_list} == {
+            "Task 14",
+            *(f"Task 14{i}" for i in range(10)),
+        }
+        response = admin_client.get(changelist_url, {"q": another_user.email})
+        assert set(result_ids(response)) == set(
+            another_user.tasks.values_list("id", flat=True)
+        )
+
+    def test_created_filter(self, admin_client, tasks, django_assert_max_num_queries):
+        day = dt.datetime(2024, 2, 29, 12, tzinfo=dt.UTC)
+        Task.objects.filter(pk__in=[tasks[0].pk, tasks[1].pk]).update(created_at=day)
+        Task.objects.filter(pk=tasks[2].pk).update(created_at=day.replace(day=1))
+        this_year = str(timezone.now().year)
+
+        response = admin_client.get(changelist_url)
+        spec = next(
+            spec
+            for spec in response.context["cl"].filter_specs
+            if spec.title == "created"
+        )
+        years = [value for value, _ in spec.lookup_choices]
+        assert years == [str(year) for year in range(int(this_year), 2023, -1)]
+
+        response = admin_client.get(changelist_url, {"created": "2024"})
+        assert result_ids(response) == [tasks[0].id, tasks[1].id, tasks[2].id]
+        spec = response.context["cl"].filter_specs[1]
+        assert len(spec.lookup_choices) == 13
+
+        with django_assert_max_num_queries(10):
+            response = admin_client.get(changelist_url, {"created": "2024-02"})
+        assert len(result_ids(response)) == 3
+        spec = response.context["cl"].filter_specs[1]
+        assert spec.lookup_choices[:2] == [
+            ("2024", "2024"),
+            ("2024-02", "February 2024"),
+        ]
+        assert len(spec.lookup_choices) == 2 + 29
+
+        response = admin_client.get(changelist_url, {"created": "2024-02-29"})
+        assert result_ids(response) == [tasks[0].id, tasks[1].id]
+
+        for value in ("2024-02-30", "2024-13", "last year"):
+            response = admin_client.get(changelist_url, {"created": value})
+            assert response.status_code == status.HTTP_302_FOUND
+
+    def test_change_form_autocompletes_owner(self, admin_client, tasks):
+        assert TaskAdmin.autocomplete_fields == ("owner",)
+        url = reverse("admin:tasks_task_change", args=[tasks[0].pk])
+        response = admin_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert "admin-autocomplete" in response.content.decode()
@@ -0,0 +1,142 @@
+import datetime as dt
+import threading
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.sync import ChangesCursor, encode_cursor
+from tasks.models import Task, TaskTombstone
+
+changes_url = reverse("api:tasks-changes")
+
+
+@pytest.mark.django_db
+class TestTaskChanges:
+    """Test delta sync of tasks through the changes endpoint."""
+
+    @pytest.fixture
+    def tasks(self, test_user, another_user) -> list[Task]:
+        Task.objects.create(title="Someone else's", owner=another_user)
+        return Task.objects.bulk_create(
+            Task(title=f"Task {i}", owner=test_user) for i in range(5)
+        )
+
+    def sync(self, client, **params) -> dict:
+        response = client.get(changes_url, data=params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    def walk(self, client, **params) -> tuple[list[dict], list[int], str]:
+        """Follow ``next`` links, returning all changes and the last cursor."""
+        data = self.sync(client, **params)
+        changed, deleted = data["changed"], data["deleted"]
+        while data["next"]:
+            data = client.get(data["next"]).data
+            changed += data["changed"]
+            deleted += data["deleted"]
+        return changed, deleted, data["cursor"]
+
+    def test_initial_sync(self, authorized_client, tasks):
+        changed, deleted, _ = self.walk(authorized_client, page_size=2)
+        assert [task["id"] for task in changed] == [task.id for task in tasks]
+        assert deleted == []
+
+    def test_changes_since_cursor(self, authorized_client, tasks, test_user):
+        cursor = self.sync(authorized_client)["cursor"]
+        tasks[1].completed = True
+        tasks[1].save()
+        Task.objects.delete_owned(test_user.pk, [tasks[2].id])
+        deleted_id = tasks[3].id
+        tasks[3].delete()
+        created = Task.objects.create(title="New", owner=test_user)
+
+        changed, deleted, cursor = self.walk(
+            authorized_client, since=cursor, page_size=1
+        )
+        assert [task["id"] for task in changed] == [tasks[1].id, created.id]
+        assert changed[0]["completed"] is True
+        assert deleted == [tasks[2].id, deleted_id]
+
+        data = self.sync(authorized_client, since=cursor)
+        assert data == {
+            "changed": [],
+            "deleted": [],
+            "cursor": data["cursor"],
+            "next": None,
+        }
+
+    def test_moved_task(self, authorized_client, tasks, another_user):
+        cursor = self.sync(authorized_client)["cursor"]
+        tasks[0].owner = another_user
+        tasks[0].save()
+
+        data = self.sync(authorized_client, since=cursor)
+        assert data["changed"] == []
+        assert data["deleted"] == [tasks[0].id]
+
+    def test_queries(self, authorized_client, tasks, django_assert_num_queries):
+        cursor = self.sync(authorized_client)["cursor"]
+        # Changed tasks and tombstones, the user is cached.
+        with django_assert_num_queries(2):
+            self.sync(authorized_client, since=cursor)
+
+    def test_invalid_cursor(self, authorized_client):
+        response = authorized_client.get(changes_url, data={"since": "garbage"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_expired_cursor(self, authorized_client):
+        cursor = ChangesCursor(1, 1, timezone.now() - dt.timedelta(days=31))
+        response = authorized_client.get(
+            changes_url, data={"since": encode_cursor(cursor)}
+        )
+        assert response.status_code == status.HTTP_410_GONE
+
+    def test_prune_tombstones(self, tasks, test_user, capsys):
+        Task.objects.filter(owner=test_user).delete()
+        TaskTombstone.objects.filter(task_id=tasks[0].id).update(
+            deleted_at=timezone.now() - dt.timedelta(days=40)
+        )
+        call_command("prune_task_tombstones")
+        assert "Pruned 1 tombstones." in capsys.readouterr().out
+        assert TaskTombstone.objects.count() == 4
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTaskChangesSnapshot:
+    """Test a sync page reads tasks and tombstones from one snapshot."""
+
+    def test_change_committed_between_reads(self, authorized_client, test_user):
+        tasks = Task.objects.bulk_create(
+            Task(title=f"Task {i}", owner=test_user) for i in range(2)
+        )
+        updated_id, deleted_id = (task.id for task in tasks)
+        cursor = authorized_client.get(changes_url).data["cursor"]
+
+        def write():
+            tasks[0].completed = True
+            tasks[0].save()
+            tasks[1].delete()
+            connection.close()
+
+        def write_after_tasks_read(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if 'FROM "tasks_task"' in sql and not written.is_set():
+                written.set()
+                thread = threading.Thread(target=write)
+                thread.start()
+                thread.join()
+            return result
+
+        written = threading.Event()
+        with connection.execute_wrapper(write_after_tasks_read):
+            data = authorized_client.get(changes_url, data={"since": cursor}).data
+        assert written.is_set()
+        assert (data["changed"], data["deleted"]) == ([], [])
+
+        data = authorized_client.get(changes_url, data={"since": data["cursor"]}).data
+        assert [task["id"] for task in data["changed"]] == [updated_id]
+        assert data["deleted"] == [deleted_id]
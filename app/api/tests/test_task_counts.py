@@ -0,0 +1,156 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from api.pagination import TaskPageNumberPagination
+from tasks.models import Task, TaskCounter
+
+tasks_url = reverse("api:tasks-list")
+
+
+@pytest.mark.django_db
+class TestTaskCounters:
+    """Test the counters are kept exact by every write path."""
+
+    def test_create_update_delete(self, test_user, another_user, task_counts):
+        task = Task.objects.create(title="Task", owner=test_user)
+        Task.objects.create(title="Done", completed=True, owner=test_user)
+        assert task_counts(test_user) == (2, 1, 0)
+
+        task.completed = True
+        task.save()
+        assert task_counts(test_user) == (2, 2, 0)
+
+        task.owner = another_user
+        task.save()
+        assert task_counts(test_user) == (1, 1, 0)
+        assert task_counts(another_user) == (1, 1, 0)
+
+        task.delete()
+        assert task_counts(another_user) == (0, 0, 0)
+
+    def test_queryset_writes(self, test_user, task_counts):
+        Task.objects.bulk_create(
+            Task(title=f"Task {i}", completed=i % 2 == 0, owner=test_user)
+            for i in range(10)
+        )
+        assert task_counts(test_user) == (10, 5, 0)
+
+        Task.objects.filter(owner=test_user).update(completed=True)
+        assert task_counts(test_user) == (10, 10, 0)
+
+        ids = list(Task.objects.values_list("id", flat=True)[:3])
+        Task.objects.delete_owned(test_user.pk, ids)
+        assert task_counts(test_user) == (7, 7, 0)
+
+    def test_api_writes(self, authorized_client, test_user, task_counts):
+        bulk_url = reverse("api:tasks-bulk")
+        response = authorized_client.post(
+            bulk_url,
+            [{"title": "A"}, {"title": "B", "completed": True}],
+            content_type="application/json",
+        )
+        assert task_counts(test_user) == (2, 1, 0)
+
+        ids = [task["id"] for task in response.data]
+        authorized_client.patch(
+            bulk_url,
+            [{"id": ids[0], "completed": True}],
+            content_type="application/json",
+        )
+        assert task_counts(test_user) == (2, 2, 0)
+
+        authorized_client.post(
+            reverse("api:tasks-import"),
+            b'{"title": "C"}\n{"title": "D"}\n',
+            content_type="application/x-ndjson",
+        )
+        assert task_counts(test_user) == (4, 2, 0)
+
+        authorized_client.delete(
+            bulk_url, {"ids": ids}, content_type="application/json"
+        )
+        assert task_counts(test_user) == (2, 0, 0)
+
+    def test_user_deletion(self, test_user):
+        Task.objects.create(title="Task", owner=test_user)
+        test_user.delete()
+        assert not TaskCounter.objects.exists()
+
+
+@pytest.mark.django_db
+class TestPageNumberCounts:
+    """Test page-number pagination counts lists without COUNT(*)."""
+
+    @pytest.fixture
+    def tasks(self, test_user, another_user) -> list[Task]:
+        Task.objects.create(title="Someone else's", owner=another_user)
+        return Task.objects.bulk_create(
+            Task(title=f"Task {i}", completed=i < 4, owner=test_user) for i in range(25)
+        )
+
+    @pytest.mark.usefixtures("tasks")
+    @pytest.mark.parametrize(
+        ("params", "expected"),
+        [({}, 25), ({"completed": "true"}, 4), ({"completed": "false"}, 21)],
+    )
+    def test_counted_from_counters(self, get_statements, params, expected):
+        response, statements = get_statements(tasks_url, **params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == expected
+        assert not any("COUNT(" in sql.upper() for sql in statements)
+
+    @pytest.mark.usefixtures("tasks")
+    def test_search_count_is_capped(self, get_statements, monkeypatch):
+        monkeypatch.setattr(TaskPageNumberPagination, "count_cap", 10)
+        response, _ = get_statements(tasks_url, search="task")
+        assert response.data["count"] == "10+"
+
+        monkeypatch.setattr(TaskPageNumberPagination, "count_cap", 25)
+        response, _ = get_statements(tasks_url, search="task", page=2)
+        assert response.data["count"] == 25
+
+    @pytest.mark.usefixtures("tasks")
+    def test_estimated_count(self, get_statements):
+        response, statements = get_statements(
+            tasks_url, search="task", count="estimate"
+        )
+        assert isinstance(response.data["count"], int)
+        assert any(sql.startswith("EXPLAIN") for sql in statements)
+
+    @pytest.mark.usefixtures("tasks")
+    def test_count_can_be_left_out(self, get_statements):
+        response, statements = get_statements(tasks_url, search="task", count="false")
+        assert "count" not in response.data
+        assert len(response.data["results"]) == 10
+        assert not any("COUNT(" in sql.upper() for sql in statements)
+
+    @pytest.mark.usefixtures("tasks")
+    def test_links(self, authorized_client, get_statements):
+        response, _ = get_statements(tasks_url, search="task")
+        assert response.data["previous"] is None
+        response = authorized_client.get(response.data["next"])
+        assert response.data["previous"].endswith("search=task")
+        response = authorized_client.get(response.data["next"])
+        assert len(response.data["results"]) == 5
+        assert response.data["next"] is None
+
+    @pytest.mark.usefixtures("tasks")
+    def test_last_page(self, get_statements):
+        response, _ = get_statements(tasks_url, page="last")
+        assert len(response.data["results"]) == 5
+        assert response.data["next"] is None
+
+        response, _ = get_statements(tasks_url, page="last", count="estimate")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.usefixtures("tasks")
+    @pytest.mark.parametrize("page", ["0", "x", "4"])
+    def test_invalid_page(self, get_statements, page):
+        response, _ = get_statements(tasks_url, page=page)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_empty_list(self, get_statements):
+        response, _ = get_statements(tasks_url)
+        assert response.data["count"] == 0
+        assert response.data["results"] == []
@@ -0,0 +1,119 @@
+import datetime as dt
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from tasks.models import Task, TaskCounter, TaskCreationCount
+from tasks.stats import reconcile_owner
+
+stats_url = reverse("api:tasks-stats")
+
+
+@pytest.fixture
+def tasks(test_user, another_user) -> list[Task]:
+    Task.objects.create(title="Someone else's", owner=another_user)
+    tasks = Task.objects.bulk_create(
+        Task(title=f"Task {i}", completed=i < 3, owner=test_user) for i in range(10)
+    )
+    now = timezone.now()
+    # Moves the tasks' creation counts to earlier hours.
+    Task.objects.filter(pk__in=[task.pk for task in tasks[:2]]).update(
+        created_at=now - dt.timedelta(days=3)
+    )
+    Task.objects.filter(pk=tasks[2].pk).update(created_at=now - dt.timedelta(days=30))
+    return tasks
+
+
+@pytest.mark.django_db
+class TestTaskStats:
+    """Test the task statistics endpoint."""
+
+    @pytest.mark.usefixtures("tasks")
+    def test_stats(self, authorized_client, django_assert_num_queries):
+        # The user, their counter and the sum of their creation counts.
+        with django_assert_num_queries(3):
+            response = authorized_client.get(stats_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "total": 10,
+            "completed": 3,
+            "open": 7,
+            "archived": 0,
+            "created_last_day": 7,
+            "created_last_week": 9,
+        }
+
+    def test_stats_follow_writes(self, authorized_client, tasks, test_user):
+        tasks[3].completed = True
+        tasks[3].save()
+        Task.objects.delete_owned(test_user.pk, [tasks[0].pk, tasks[9].pk])
+
+        response = authorized_client.get(stats_url)
+        assert response.data == {
+            "total": 8,
+            "completed": 3,
+            "open": 5,
+            "archived": 0,
+            "created_last_day": 6,
+            "created_last_week": 7,
+        }
+
+    def test_no_tasks(self, authorized_client):
+        response = authorized_client.get(stats_url)
+        assert set(response.data.values()) == {0}
+
+    def test_unauthorized(self, client):
+        response = client.get(stats_url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("tasks")
+class TestReconcileTaskCounters:
+    """Test the reconcile_task_counters management command."""
+
+    @pytest.fixture
+    def drift(self, test_user):
+        TaskCounter.objects.filter(owner=test_user).update(total=1, completed=5)
+        TaskCreationCount.objects.filter(owner=test_user).delete()
+
+    def test_reconcile(self, authorized_client, test_user, drift):
+        out, err = StringIO(), StringIO()
+        call_command("reconcile_task_counters", stdout=out, stderr=err)
+
+        assert "Fixed counters of 1 of 2 users" in out.getvalue()
+        assert f"User {test_user.pk}: total: 1 -> 10, completed: 5 -> 3" in (
+            err.getvalue()
+        )
+        response = authorized_client.get(stats_url)
+        assert response.data["total"] == 10
+        assert response.data["created_last_week"] == 9
+        assert reconcile_owner(test_user.pk) == {}
+
+    def test_dry_run(self, test_user, drift):
+        out = StringIO()
+        call_command(
+            "reconcile_task_counters",
+            owner=test_user.email,
+            dry_run=True,
+            stdout=out,
+            stderr=StringIO(),
+        )
+        assert "1 of 1 users have drifted counters." in out.getvalue()
+        assert TaskCounter.objects.get(owner=test_user).total == 1
+
+    def test_prunes_old_creation_counts(self, test_user):
+        old_hour = timezone.now() - dt.timedelta(days=9)
+        TaskCreationCount.objects.create(owner=test_user, hour=old_hour, count=1)
+        out = StringIO()
+        call_command("reconcile_task_counters", stdout=out)
+        assert "pruned 1 creation counts" in out.getvalue()
+
+    def test_unknown_owner(self):
+        with pytest.raises(CommandError, match="not found"):
+            call_command("reconcile_task_counters", owner="no@one.com")
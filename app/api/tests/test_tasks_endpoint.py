@@ -2,11 +2,16 @@ import datetime as dt
 from typing import Generator
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.settings import api_settings
 
+from api.pagination import TaskKeysetPagination
 from tasks.models import Task
+from users.cache import local_user_cache
 
 
 class TestTasksBase:
@@ -194,6 +199,40 @@ class TestListTasks(TestTasksBase):
         assert len(response.data["results"]) == 1
         assert response.data["results"][0]["id"] == test_task.id
 
+    @pytest.fixture
+    def searchable_tasks(self, test_user) -> dict[str, Task]:
+        return {
+            key: self.model_class.objects.create(
+                title=title, description=description, owner=test_user
+            )
+            for key, title, description in (
+                ("in_title", "Renew passport", "Before the trip"),
+                ("in_description", "Errands", "Take the passport photos"),
+                ("unrelated", "Buy groceries", "Milk and bread"),
+            )
+        }
+
+    def search(self, client, term: str) -> list[int]:
+        response = client.get(reverse(self.tasks_url_path), data={"search": term})
+        assert response.status_code == status.HTTP_200_OK
+        return [task["id"] for task in response.data["results"]]
+
+    def test_search_ranks_title_above_description(
+        self, authorized_client, searchable_tasks
+    ):
+        """Test full-text search covers descriptions, ranking titles higher."""
+        assert self.search(authorized_client, "passports") == [
+            searchable_tasks["in_title"].id,
+            searchable_tasks["in_description"].id,
+        ]
+
+    @pytest.mark.parametrize("term", ["rocer", "groceris"], ids=["substring", "typo"])
+    def test_search_fuzzy_title(self, authorized_client, searchable_tasks, term):
+        """Test title search matches substrings and typos."""
+        assert self.search(authorized_client, term) == [
+            searchable_tasks["unrelated"].id
+        ]
+
     @pytest.mark.usefixtures("multiple_tasks")
     def test_filters_by_completed(self, authorized_client, test_task):
         """Test filtering tasks by completed status."""
@@ -298,3 +337,154 @@ class TestTaskPermissions(TestTasksBase):
             reverse(self.tasks_url_detail_path, args=[another_user_task.id]),
         )
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestKeysetPagination(TestTasksBase):
+    """Test class for testing keyset pagination of the task list."""
+
+    page_size = 3
+
+    @pytest.fixture
+    def tied_tasks(self, test_user) -> list[Task]:
+        """Tasks sharing a single creation timestamp."""
+        tasks = self.model_class.objects.bulk_create(
+            self.model_class(title=f"Task {i}", completed=bool(i % 2), owner=test_user)
+            for i in range(8)
+        )
+        self.model_class.objects.update(created_at=tasks[0].created_at)
+        return tasks
+
+    def walk(self, client, params: dict[str, str], direction: str = "next"):
+        """Follow pagination links, yielding every page."""
+        response = client.get(reverse(self.tasks_url_path), data=params)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            yield response.data
+            link = response.data[direction]
+            if link is None:
+                return
+            response = client.get(link)
+
+    @pytest.mark.usefixtures("multiple_tasks")
+    def test_default_is_page_number(self, authorized_client):
+        """Test page-number clients keep getting counted pages."""
+        response = authorized_client.get(reverse(self.tasks_url_path))
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" in response.data
+
+    @pytest.mark.usefixtures("multiple_tasks")
+    @pytest.mark.parametrize("opt_in", ["query", "header"])
+    def test_opt_in(self, authorized_client, opt_in):
+        """Test keyset pagination is enabled by query parameter or header."""
+        params, headers = {}, {}
+        if opt_in == "query":
+            params["pagination"] = "cursor"
+        else:
+            headers["X-Pagination"] = "cursor"
+        response = authorized_client.get(
+            reverse(self.tasks_url_path), data=params, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert response.data["previous"] is None
+        assert "cursor=" in response.data["next"]
+        assert len(response.data["results"]) == api_settings.PAGE_SIZE
+
+    def test_stable_with_tied_timestamps(self, authorized_client, tied_tasks):
+        """Test walking forward and back returns every task exactly once."""
+        params = {"pagination": "cursor", "page_size": self.page_size}
+        pages = list(self.walk(authorized_client, params))
+        ids = [task["id"] for page in pages for task in page["results"]]
+        assert ids == sorted((task.id for task in tied_tasks), reverse=True)
+        assert all(len(page["results"]) <= self.page_size for page in pages)
+
+        response = authorized_client.get(pages[-1]["previous"])
+        assert response.data["results"] == pages[-2]["results"]
+
+    def test_with_filter(self, authorized_client, tied_tasks):
+        """Test keyset pagination combines with the filter."""
+        params = {"pagination": "cursor", "page_size": 1, "completed": "true"}
+        pages = list(self.walk(authorized_client, params))
+        ids = [task["id"] for page in pages for task in page["results"]]
+        assert ids == sorted(
+            (task.id for task in tied_tasks if task.completed), reverse=True
+        )
+
+    @pytest.mark.usefixtures("test_task")
+    def test_search_is_rejected(self, authorized_client):
+        """Test searches, ranked by relevance, aren't paged by cursor."""
+        response = authorized_client.get(
+            reverse(self.tasks_url_path),
+            data={"pagination": "cursor", "search": "Task"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "search" in response.data
+
+    @pytest.mark.usefixtures("multiple_tasks")
+    def test_page_size_is_capped(self, authorized_client, monkeypatch):
+        """Test the requested page size is limited by the cap."""
+        max_page_size = api_settings.PAGE_SIZE // 2
+        monkeypatch.setattr(TaskKeysetPagination, "max_page_size", max_page_size)
+        response = authorized_client.get(
+            reverse(self.tasks_url_path),
+            data={"pagination": "cursor", "page_size": 1000},
+        )
+        assert len(response.data["results"]) == max_page_size
+
+    @pytest.mark.usefixtures("test_task")
+    def test_invalid_cursor(self, authorized_client):
+        """Test a malformed cursor is rejected."""
+        response = authorized_client.get(
+            reverse(self.tasks_url_path), data={"cursor": "not-a-cursor"}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestOwnerSerialization(TestTasksBase):
+    """Test class for testing owner serialization in task responses."""
+
+    @pytest.fixture
+    def many_tasks(self, test_user):
+        self.model_class.objects.bulk_create(
+            self.model_class(title=f"Task {i}", owner=test_user) for i in range(20)
+        )
+
+    def count_list_queries(self, client, page_size: int) -> int:
+        # Count the queries of an uncached request.
+        cache.clear()
+        local_user_cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                reverse(self.tasks_url_path),
+                data={"pagination": "cursor", "page_size": page_size},
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == page_size
+        return len(context.captured_queries)
+
+    @pytest.mark.usefixtures("many_tasks")
+    def test_constant_query_count(self, authorized_client):
+        """Test the number of queries doesn't depend on the page size."""
+        assert self.count_list_queries(authorized_client, 1) == (
+            self.count_list_queries(authorized_client, 20)
+        )
+
+    def test_detail_owner_without_extra_queries(
+        self, authorized_client, test_task, test_user, django_assert_num_queries
+    ):
+        """Test retrieving a task doesn't look up its owner separately."""
+        url = reverse(self.tasks_url_detail_path, args=[test_task.id])
+        # One query authenticates the user, one fetches the task.
+        with django_assert_num_queries(2):
+            response = authorized_client.get(url)
+        assert response.data["owner"]["id"] == test_user.id
+
+    @pytest.mark.usefixtures("many_tasks")
+    def test_hoisted_owner(self, authorized_client, test_user):
+        """Test the owner can be moved from each task to the envelope."""
+        response = authorized_client.get(
+            reverse(self.tasks_url_path), data={"hoist_owner": "true"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["owner"]["id"] == test_user.id
+        assert all("owner" not in task for task in response.data["results"])
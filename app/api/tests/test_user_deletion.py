@@ -0,0 +1,141 @@
+import datetime as dt
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from tasks.archiving import archive_tasks
+from tasks.models import Task, TaskArchive, TaskCounter, TaskImport, TaskTombstone
+from users.deletion import purge_user, request_deletion
+
+login_url = reverse("api:login")
+tasks_url = reverse("api:tasks-list")
+
+
+@pytest.fixture
+def tasks(test_user, another_user) -> list[Task]:
+    """25 tasks of the user, 5 of them archived, and one of another user."""
+    Task.objects.create(title="Someone else's", owner=another_user)
+    tasks = Task.objects.bulk_create(
+        Task(title=f"Task {i}", completed=i < 5, owner=test_user) for i in range(25)
+    )
+    archive_tasks(older_than=dt.timedelta(0))
+    TaskImport.objects.create(owner=test_user, format=TaskImport.Format.CSV)
+    return tasks
+
+
+@pytest.mark.django_db
+class TestUserDeletion:
+    """Test deleted users are deactivated and purged in batches."""
+
+    @pytest.mark.usefixtures("tasks")
+    def test_request_deletion(
+        self, client, authorized_client, test_user, test_login_credentials
+    ):
+        assert request_deletion([test_user.pk]) == 1
+        test_user.refresh_from_db()
+        assert not test_user.is_active
+        requested_at = test_user.deletion_requested_at
+        assert requested_at is not None
+        # Tasks stay until the purge.
+        assert test_user.tasks.count() == 20
+
+        response = authorized_client.get(tasks_url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        response = client.post(login_url, test_login_credentials)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        assert request_deletion([test_user.pk]) == 0
+        test_user.refresh_from_db()
+        assert test_user.deletion_requested_at == requested_at
+
+    def test_purge(self, tasks, test_user, another_user, django_user_model):
+        # Left by archiving, purged tasks add none.
+        tombstones = TaskTombstone.objects.filter(owner_id=test_user.pk).count()
+        progress = []
+        purged = purge_user(
+            test_user.pk,
+            batch_size=8,
+            progress=lambda count, rate: progress.append(count),
+        )
+        assert purged == 25
+        assert progress == [8, 16, 20, 25]
+        assert not django_user_model.objects.filter(pk=test_user.pk).exists()
+        assert not Task.objects.filter(owner_id=test_user.pk).exists()
+        assert not TaskArchive.objects.filter(owner_id=test_user.pk).exists()
+        assert not TaskCounter.objects.filter(owner_id=test_user.pk).exists()
+        assert not TaskImport.objects.filter(owner_id=test_user.pk).exists()
+        assert TaskTombstone.objects.filter(owner_id=test_user.pk).count() == tombstones
+        assert another_user.tasks.count() == 1
+
+    @pytest.mark.usefixtures("tasks")
+    def test_purge_partitioned(self, test_user):
+        call_command("partition_task_table", partitions=2, stdout=StringIO())
+        assert purge_user(test_user.pk, batch_size=8) == 25
+
+    @pytest.mark.usefixtures("tasks")
+    def test_command(self, test_user, another_user, django_user_model):
+        request_deletion([test_user.pk])
+        out = StringIO()
+        call_command("purge_deleted_users", batch_size=10, stdout=out)
+        assert f"User {test_user.pk}: 10 tasks deleted" in out.getvalue()
+        assert f"User {test_user.pk} deleted with 25 tasks." in out.getvalue()
+        assert "Deleted 1 users." in out.getvalue()
+        assert list(django_user_model.objects.values_list("pk", flat=True)) == [
+            another_user.pk
+        ]
+
+
+@pytest.mark.django_db
+class TestUserAdminDeletion:
+    """Test the admin previews deletions from counts and defers them."""
+
+    @pytest.mark.usefixtures("tasks")
+    def test_delete_view(self, admin_client, test_user, django_assert_max_num_queries):
+        url = reverse("admin:users_customuser_delete", args=[test_user.pk])
+        with django_assert_max_num_queries(10):
+            response = admin_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert dict(response.context["model_count"]) == {
+            "users": 1,
+            "Tasks": 20,
+            "Archived tasks": 5,
+        }
+
+        response = admin_client.post(url, {"post": "yes"}, follow=True)
+        assert [str(message) for message in response.context["messages"]] == [
+            f"The user “{test_user}” was queued for deletion. They are "
+            "deactivated, their tasks are deleted in the background."
+        ]
+        test_user.refresh_from_db()
+        assert not test_user.is_active
+        assert test_user.deletion_requested_at is not None
+        assert test_user.tasks.count() == 20
+
+    @pytest.mark.usefixtures("tasks")
+    def test_delete_action(self, admin_client, test_user, another_user):
+        url = reverse("admin:users_customuser_changelist")
+        data = {
+            "action": "delete_selected",
+            "_selected_action": [test_user.pk, another_user.pk],
+        }
+        response = admin_client.post(url, data)
+        assert response.status_code == status.HTTP_200_OK
+        assert dict(response.context["model_count"]) == {
+            "users": 2,
+            "Tasks": 21,
+            "Archived tasks": 5,
+        }
+
+        response = admin_client.post(url, {**data, "post": "yes"}, follow=True)
+        assert [str(message) for message in response.context["messages"]] == [
+            "2 users queued for deletion. They are deactivated, their tasks are "
+            "deleted in the background."
+        ]
+        test_user.refresh_from_db()
+        another_user.refresh_from_db()
+        assert test_user.deletion_requested_at is not None
+        assert another_user.deletion_requested_at is not None
+        assert Task.objects.count() == 21
@@ -0,0 +1,193 @@
+"""
+Per-request timings of the database, authentication, serialization and
+rendering.
+
+``RequestTimingMiddleware`` keeps the timings of a request in a context
+variable, which follows the request into the threads its sync code runs
+in. Database queries are timed by an execute wrapper installed on every
+connection, the other phases by ``timed`` blocks in their hooks.
+
+Every request is recorded in the Prometheus metrics. For a sample of
+requests, timings are also sent back in the ``Server-Timing`` header and
+logged as one JSON line to the ``api.timing`` logger.
+"""
+
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .metrics import observe_request, query_duration, requests_in_flight
+
+logger = logging.getLogger("api.timing")
+
+PHASES = ("db", "auth", "serialize", "render")
+
+
+class RequestTimings:
+    """Time spent per phase of a request, in seconds."""
+
+    __slots__ = ("started", "durations", "queries")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+
+    def add(self, phase: str, seconds: float):
+        self.durations[phase] += seconds
+
+    def milliseconds(self) -> dict[str, float]:
+        return {
+            phase: round(seconds * 1000, 2) for phase, seconds in self.durations.items()
+        }
+
+
+current_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "current_timings", default=None
+)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the time spent in the block to the current request's timings."""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+def time_query(execute, sql, params, many, context):
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        seconds = time.perf_counter() - started
+        timings.add("db", seconds)
+        timings.queries += 1
+        query_duration.observe(seconds)
+
+
+@receiver(connection_created, dispatch_uid="install_query_timer")
+def install_query_timer(sender, connection, **kwargs):
+    # Connections are per thread, so each gets the wrapper when it first
+    # connects. It goes first, so scoped wrappers still pop their own.
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+class TimedSerializerMixin:
+    """Time building a serializer's ``data`` as serialization."""
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+
+class RequestTimingMiddleware:
+    """
+    Time requests for metrics, and report a sample of them, see
+    ``REQUEST_TIMING_SAMPLE_RATE``.
+
+    Rendering happens after the view returns, so it's timed from the
+    template response hook to the response's post-render callback.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Keeps the hook on the event loop instead of a thread.
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = current_timings.set(RequestTimings())
+        requests_in_flight.inc()
+        try:
+            response = self.get_response(request)
+            self.report(request, response)
+        finally:
+            requests_in_flight.dec()
+            current_timings.reset(token)
+        return response
+
+    async def __acall__(self, request):
+        token = current_timings.set(RequestTimings())
+        requests_in_flight.inc()
+        try:
+            response = await self.get_response(request)
+            self.report(request, response)
+        finally:
+            requests_in_flight.dec()
+            current_timings.reset(token)
+        return response
+
+    def is_sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def time_rendering(self, response):
+        timings = current_timings.get()
+        if timings is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: timings.add("render", time.perf_counter() - started)
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        return self.time_rendering(response)
+
+    async def aprocess_template_response(self, request, response):
+        return self.time_rendering(response)
+
+    def report(self, request, response):
+        timings = current_timings.get()
+        seconds = time.perf_counter() - timings.started
+        observe_request(request, response, seconds, timings.queries)
+        if not self.is_sampled():
+            return
+        total = round(seconds * 1000, 2)
+        phases = timings.milliseconds()
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={phases["db"]};desc="{timings.queries} queries"',
+                *(f"{phase};dur={phases[phase]}" for phase in PHASES[1:]),
+                f"total;dur={total}",
+            ]
+        )
+        match = request.resolver_match
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "view": match.view_name if match else None,
+                    "status": response.status_code,
+                    "total_ms": total,
+                    **{f"{phase}_ms": phases[phase] for phase in PHASES},
+                    "db_queries": timings.queries,
+                }
+            )
+        )
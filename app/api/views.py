@@ -1,11 +1,37 @@
+from adrf import viewsets
+from django.db import transaction
+from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, views, viewsets
+from rest_framework import exceptions, status, views
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from tasks.models import Task
+from task_tracker.constants import MAX_BULK_SIZE
+from tasks.archiving import restore_tasks
+from tasks.cache import invalidate_user_tasks
+from tasks.importing import ImportConflict, import_tasks
+from tasks.models import Task, TaskCounter, TaskImport
+from tasks.stats import aget_task_stats
 
-from .serializers import SignUpSerializer, TasksSerializer
+from .cache import CachedResponseMixin
+from .conditional import ConditionalResponseMixin
+from .export import export_response
+from .filters import TaskSearchFilter
+from .pagination import TaskKeysetPagination, TaskPageNumberPagination
+from .renderers import CSVRenderer, NDJSONRenderer
+from .replicas import ReplicaReadMixin
+from .serializers import (
+    SignUpSerializer,
+    TaskIdsSerializer,
+    TaskImportSerializer,
+    TaskListSerializer,
+    TaskOwnerSerializer,
+    TasksSerializer,
+    TaskStatsSerializer,
+)
+from .sync import aget_changes
 
 
 class UserSignUpView(views.APIView):
@@ -22,14 +48,342 @@ class UserSignUpView(views.APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class TasksViewSet(viewsets.ModelViewSet):
+IMPORT_FORMATS = {
+    NDJSONRenderer.media_type: TaskImport.Format.NDJSON,
+    CSVRenderer.media_type: TaskImport.Format.CSV,
+}
+
+
+class TasksViewSet(
+    ReplicaReadMixin,
+    ConditionalResponseMixin,
+    CachedResponseMixin,
+    viewsets.ModelViewSet,
+):
+    """
+    Tasks of the current user.
+
+    List, retrieve and create are async and use the async ORM. The other
+    actions are sync, under ASGI they run in a worker thread. Reads are
+    served from replicas when they are configured.
+
+    Archived tasks are only read when asked for, see ``includes_archived()``.
+    Writing to an archived task restores it first.
+    """
+
+    replica_actions = frozenset({"list", "retrieve", "export", "stats", "changes"})
+    archive_actions = frozenset({"list", "retrieve", "export"})
+    archive_query_param = "include_archived"
+
     serializer_class = TasksSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    pagination_class = TaskPageNumberPagination
+    # Writes invalidate the cache through the task model signals, which
+    # also covers changes made in the admin.
+    cache_vary_headers = (TaskKeysetPagination.mode_header,)
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter]
     filterset_fields = ["completed"]
-    search_fields = ["title"]
+
+    @property
+    def paginator(self):
+        """
+        Page-number pagination by default, keyset pagination when the client
+        opts in with ``?pagination=cursor`` or the ``X-Pagination`` header.
+        """
+        if not hasattr(self, "_paginator"):
+            pagination_class = self.pagination_class
+            if TaskKeysetPagination.is_requested(getattr(self, "request", None)):
+                pagination_class = TaskKeysetPagination
+            self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
+
+    fields_query_param = "fields"
+    # Loaded even when not requested: the ordering and cursors use the
+    # creation time, ETags the update time, and the owner is attached
+    # without being fetched.
+    always_loaded_fields = {"id", "created_at", "updated_at", "owner"}
 
     def get_queryset(self):
-        return Task.objects.filter(owner=self.request.user)
+        # Going through the reverse relation attaches request.user as the
+        # owner of every fetched task, so no per-row owner lookups are made.
+        if self.includes_archived():
+            queryset = self.request.user.tasks_with_archive.all()
+        else:
+            queryset = self.request.user.tasks.all()
+        requested = self.get_requested_fields()
+        if requested is not None:
+            # Columns of fields left out, such as long descriptions, aren't
+            # fetched at all.
+            queryset = queryset.defer(
+                *set(TasksSerializer.Meta.fields)
+                - requested
+                - self.always_loaded_fields
+            )
+        return queryset
+
+    def includes_archived(self) -> bool:
+        """
+        Check whether archived tasks are read along with live ones: for
+        completed tasks, which they all are, or when the client asks with
+        ``?include_archived=true``.
+        """
+        if self.action not in self.archive_actions:
+            return False
+        params = self.request.query_params
+        return params.get(self.archive_query_param) == "true" or params.get(
+            "completed", ""
+        ).lower() in {"true", "1"}
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if not self.restore_archived_object():
+                raise
+        return super().get_object()
+
+    def get_locked_object(self):
+        try:
+            return super().get_locked_object()
+        except Http404:
+            if not self.restore_archived_object():
+                raise
+        return super().get_locked_object()
+
+    def restore_archived_object(self) -> bool:
+        """
+        Restore the task being written to from the archive, if it's there.
+        Reads leave archived tasks where they are.
+        """
+        if self.request.method not in ("PUT", "PATCH", "DELETE"):
+            return False
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            task_id = int(lookup)
+        except ValueError:
+            return False
+        return bool(restore_tasks(self.request.user.pk, [task_id]))
+
+    async def get_memoized_validator(self, name: str, compute):
+        # Archived tasks are only found when included, so detail validators
+        # are memoized apart.
+        if self.includes_archived():
+            name = f"{name}:with-archive"
+        return await super().get_memoized_validator(name, compute)
+
+    def get_requested_fields(self) -> set[str] | None:
+        """
+        Task fields to read, from a comma-separated ``?fields=``, or None for
+        all of them. Writes always respond with every field.
+        """
+        if not hasattr(self, "_requested_fields"):
+            value = self.request.query_params.get(self.fields_query_param)
+            if value is None or self.request.method != "GET":
+                self._requested_fields = None
+            else:
+                requested = {name.strip() for name in value.split(",")} - {""}
+                unknown = requested - set(TasksSerializer.Meta.fields)
+                if unknown:
+                    raise exceptions.ValidationError(
+                        {
+                            self.fields_query_param: [
+                                f"Unknown fields: {', '.join(sorted(unknown))}."
+                            ]
+                        }
+                    )
+                self._requested_fields = requested
+        return self._requested_fields
+
+    def get_counted_total(self) -> int | None:
+        """
+        Count the listed tasks from the owner's counters, unless a search or
+        another filter than ``completed`` narrows the list. Archived tasks
+        count as completed when included.
+        """
+        if self.request.query_params.get(TaskSearchFilter.search_param):
+            return None
+        filterset = DjangoFilterBackend().get_filterset(
+            self.request, self.get_queryset(), self
+        )
+        if not filterset.is_valid() or any(
+            value not in (None, "")
+            for name, value in filterset.form.cleaned_data.items()
+            if name != "completed"
+        ):
+            return None
+        # Usually already read along with the list validators.
+        counter = (
+            getattr(self, "task_counts", None)
+            or (
+                TaskCounter.objects.filter(owner=self.request.user)
+                .values("total", "completed", "archived")
+                .first()
+            )
+            or {"total": 0, "completed": 0, "archived": 0}
+        )
+        archived = counter["archived"] if self.includes_archived() else 0
+        completed = filterset.form.cleaned_data.get("completed")
+        if completed is None:
+            return counter["total"] + archived
+        return (
+            counter["completed"] + archived
+            if completed
+            else (counter["total"] - counter["completed"])
+        )
+
+    def should_hoist_owner(self) -> bool:
+        """Check whether the owner goes to the list envelope, not each task."""
+        return (
+            self.action == "list"
+            and self.request.query_params.get("hoist_owner") == "true"
+        )
 
-    def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["hoist_owner"] = self.should_hoist_owner()
+        context["fields"] = self.get_requested_fields()
+        return context
+
+    async def list(self, request, *args, **kwargs):
+        response = await super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and self.should_hoist_owner():
+            response.data["owner"] = TaskOwnerSerializer(request.user).data
+        return response
+
+    async def create(self, request, *args, **kwargs):
+        return await self.acreate(request, *args, **kwargs)
+
+    async def perform_acreate(self, serializer):
+        serializer.instance = await Task.objects.acreate(
+            owner=self.request.user, **serializer.validated_data
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+    )
+    def export(self, request):
+        """
+        Stream every task matching the filters and search as NDJSON, or CSV
+        with ``?format=csv`` or ``Accept: text/csv``.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        # Every exported task is the user's own, so the owner is left out.
+        fields = {
+            name: field
+            for name, field in self.get_serializer().fields.items()
+            if name != "owner"
+        }
+        return export_response(request, queryset, fields, "tasks")
+
+    @action(detail=False, methods=["get"])
+    async def stats(self, request):
+        """
+        Count the user's tasks from their maintained counters, which takes
+        the same time whatever the number of tasks.
+        """
+        stats = await aget_task_stats(request.user.pk)
+        return Response(TaskStatsSerializer(stats).data)
+
+    @action(detail=False, methods=["get"])
+    async def changes(self, request):
+        """
+        Tasks created or updated and ids of tasks deleted since the
+        ``?since=`` cursor, oldest change first. Follow ``next`` while it is
+        set, then keep ``cursor`` for the next sync.
+        """
+        changes = await aget_changes(request, self.get_queryset(), self.get_serializer)
+        return Response(changes)
+
+    @action(detail=False, methods=["post"], url_path="import", url_name="import")
+    def import_tasks(self, request):
+        """
+        Import tasks from an NDJSON or CSV body, picked by its content type.
+        ``?resume=<id>`` continues an interrupted import from the same body.
+        """
+        media_type = request.content_type.split(";")[0].strip()
+        if media_type not in IMPORT_FORMATS:
+            raise exceptions.UnsupportedMediaType(media_type)
+        if "resume" in request.query_params:
+            task_import = get_object_or_404(
+                request.user.imports, pk=request.query_params["resume"]
+            )
+            if task_import.format != IMPORT_FORMATS[media_type]:
+                raise exceptions.ValidationError(
+                    {"resume": [f"The import is {task_import.get_format_display()}."]}
+                )
+            response_status = status.HTTP_200_OK
+        else:
+            task_import = TaskImport.objects.create(
+                owner=request.user, format=IMPORT_FORMATS[media_type]
+            )
+            response_status = status.HTTP_201_CREATED
+
+        try:
+            import_tasks(task_import, request.stream or [])
+        except ImportConflict:
+            return Response(
+                {"detail": "The import is running in another request."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(TaskImportSerializer(task_import).data, status=response_status)
+
+    @import_tasks.mapping.get
+    def import_list(self, request):
+        """List the user's imports with their progress, newest first."""
+        return Response(
+            TaskImportSerializer(request.user.imports.all(), many=True).data
+        )
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        return self.get_serializer(
+            *args, many=True, allow_empty=False, max_length=MAX_BULK_SIZE, **kwargs
+        )
+
+    # Bulk writes skip model signals, so they invalidate cached responses
+    # once per request themselves.
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Create a batch of tasks, all or none."""
+        serializer = self.get_bulk_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save(owner=request.user)
+        invalidate_user_tasks(request.user.pk)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request):
+        """Partially update a batch of tasks, identified by ``id``, all or none."""
+        ids = TaskListSerializer.get_instance_ids(request.data)
+        with transaction.atomic():
+            # A single query checks ownership and locks the tasks.
+            tasks = self.get_queryset().select_for_update().in_bulk(ids)
+            # Archived tasks are restored to be updated, and stay archived
+            # if the update fails.
+            missing = set(ids) - tasks.keys()
+            if missing and restore_tasks(request.user.pk, missing):
+                tasks = self.get_queryset().select_for_update().in_bulk(ids)
+            serializer = self.get_bulk_serializer(
+                tasks, data=request.data, partial=True
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        invalidate_user_tasks(request.user.pk)
+        return Response(serializer.data)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request):
+        """Delete a batch of tasks, ids that aren't found are reported back."""
+        serializer = TaskIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        deleted = Task.objects.delete_owned(request.user.pk, ids)
+        invalidate_user_tasks(request.user.pk)
+        return Response(
+            {
+                "deleted": [pk for pk in ids if pk in deleted],
+                "not_found": [pk for pk in ids if pk not in deleted],
+            }
+        )
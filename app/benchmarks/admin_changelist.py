@@ -0,0 +1,111 @@
+"""
+Compare task changelist page loads of the admin's previous configuration
+with the scalable ``TaskAdmin``.
+
+The previous configuration lists every user in the owner filter, runs the
+date hierarchy's distinct-date aggregates, searches with ``icontains`` and
+counts every page exactly, both filtered and in total. Each case renders
+the whole changelist response for a superuser, as the admin serves it.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.admin_changelist --tasks 5000000 --users 10000 --keepdb
+"""
+
+import datetime as dt
+
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    measure,
+    print_table,
+    seed_tasks,
+    seed_users,
+    setup_django,
+)
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(users=10_000, repeat=10)
+    parser.add_argument("--depth", type=int, default=50, metavar="PAGES")
+    args = parser.parse_args()
+    setup_django()
+
+    from django.contrib import admin
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import RequestFactory
+
+    from tasks.admin import TaskAdmin
+    from tasks.models import Task
+
+    class PreviousTaskAdmin(admin.ModelAdmin):
+        list_display = ("title", "owner", "created_at", "updated_at", "completed")
+        list_filter = ("completed", "created_at", "updated_at", "owner")
+        search_fields = ("title", "description", "owner__username")
+        date_hierarchy = "created_at"
+
+        def get_queryset(self, request):
+            return super().get_queryset(request).select_related("owner")
+
+    User = get_user_model()
+    superuser = User(is_superuser=True, is_staff=True, is_active=True)
+
+    with benchmark_database(keepdb=args.keepdb):
+        users = seed_users(args.users)
+        seed_tasks(users, args.tasks)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE tasks_task")
+
+        live = Task.objects.count()
+        owner = users[len(users) // 2]
+        newest = Task.objects.order_by("-created_at", "-id")
+        deep = newest[args.depth * 100 - 1]
+        month = dt.date.today().replace(day=1) - dt.timedelta(days=60)
+        word = Task.objects.filter(owner=owner).values_list("title", flat=True)[0]
+        word = word.split()[0]
+
+        def page(model_admin, params):
+            def run():
+                request = RequestFactory().get("/admin/tasks/task/", params)
+                request.user = superuser
+                response = model_admin.changelist_view(request)
+                assert response.status_code == 200, response
+                response.render()
+
+            return run
+
+        after = f"{deep.created_at.isoformat()}_{deep.id}"
+        cases = [
+            ("first page", {}, {}),
+            (f"page {args.depth + 1}", {"p": args.depth + 1}, {"after": after}),
+            (
+                "owner filter",
+                {"owner__id__exact": owner.pk},
+                {"owner__id__exact": owner.pk},
+            ),
+            ("search", {"q": word}, {"q": word}),
+            (
+                "created month",
+                {"created_at__year": month.year, "created_at__month": month.month},
+                {"created": f"{month:%Y-%m}"},
+            ),
+        ]
+        admins = {
+            "previous": PreviousTaskAdmin(Task, admin.site),
+            "scalable": TaskAdmin(Task, admin.site),
+        }
+        rows = []
+        for name, previous, scalable in cases:
+            for label, params in (("previous", previous), ("scalable", scalable)):
+                stats = measure(page(admins[label], params), args.repeat, warmup=1)
+                rows.append((name, label, stats))
+                print(f"  {name:<20}{label:<10}{stats['p50']:>10.1f} ms", flush=True)
+
+    print(f"\n{live:,} live tasks over {args.users:,} users")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
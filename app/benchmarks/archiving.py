@@ -0,0 +1,123 @@
+"""
+Compare task list latency and the size of the task table before and after
+archiving old completed tasks.
+
+The seeded tasks are spread over three years and 60% of them are
+completed. The lists are measured, the ``archive_tasks`` job moves the
+completed tasks older than ``--older-than`` days to the archive, and the
+lists are measured again, along with the lists that read the archive too.
+With ``--keepdb`` an already archived database is only measured after.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.archiving --tasks 5000000 --users 10000 --keepdb
+"""
+
+import datetime as dt
+import random
+import time
+
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    measure,
+    print_table,
+    seed_tasks,
+    seed_users,
+    setup_django,
+)
+
+PAGE_SIZE = 10
+
+
+def table_size(table: str) -> str:
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            # Partitioned tables are summed over their partitions.
+            "SELECT pg_size_pretty(coalesce(sum(pg_total_relation_size(relid)), "
+            "pg_total_relation_size(%s::regclass))) FROM pg_partition_tree(%s)",
+            [table, table],
+        )
+        return cursor.fetchone()[0]
+
+
+def run_cases(users: list, repeat: int, label: str) -> list[tuple]:
+    def page(manager: str, page_number: int = 1, **filters):
+        start = (page_number - 1) * PAGE_SIZE
+
+        def run():
+            user = random.choice(users)
+            queryset = getattr(user, manager).filter(**filters)
+            return list(queryset[start : start + PAGE_SIZE])
+
+        return run
+
+    rows = [
+        ("first page", label, measure(page("tasks"), repeat)),
+        ("open tasks", label, measure(page("tasks", completed=False), repeat)),
+        ("page 21", label, measure(page("tasks", 21), repeat)),
+    ]
+    if label == "archived":
+        rows += [
+            (
+                "completed, with archive",
+                label,
+                measure(page("tasks_with_archive", completed=True), repeat),
+            ),
+            (
+                "page 21, with archive",
+                label,
+                measure(page("tasks_with_archive", 21), repeat),
+            ),
+        ]
+    return rows
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(users=10_000)
+    parser.add_argument("--older-than", type=int, default=180, metavar="DAYS")
+    args = parser.parse_args()
+    setup_django()
+
+    from django.db import connection
+
+    from tasks.archiving import archive_tasks
+    from tasks.models import TaskArchive
+
+    with benchmark_database(keepdb=args.keepdb):
+        users = seed_users(args.users)
+        seed_tasks(users, args.tasks)
+
+        rows = []
+        sizes = []
+        if not TaskArchive.objects.exists():
+            rows += run_cases(users, args.repeat, "live only")
+            sizes.append(("before", table_size("tasks_task"), "-"))
+            start = time.perf_counter()
+            archived = archive_tasks(older_than=dt.timedelta(days=args.older_than))
+            elapsed = time.perf_counter() - start
+            print(
+                f"  archived {archived:,} tasks in {elapsed:.0f} s "
+                f"({archived / elapsed:,.0f} tasks/s)",
+                flush=True,
+            )
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM FULL tasks_task")
+                cursor.execute("ANALYZE tasks_task")
+                cursor.execute("VACUUM ANALYZE tasks_taskarchive")
+        rows += run_cases(users, args.repeat, "archived")
+        sizes.append(
+            ("after", table_size("tasks_task"), table_size("tasks_taskarchive"))
+        )
+
+    print(f"\n{args.tasks:,} tasks over {args.users:,} users")
+    for name, tasks, archive in sizes:
+        print(f"{name:<8} tasks_task {tasks:>10}   tasks_taskarchive {archive:>10}")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
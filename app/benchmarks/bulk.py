@@ -0,0 +1,64 @@
+"""
+Compare syncing tasks one request at a time with the bulk endpoints.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.bulk --tasks 500 --repeat 5
+"""
+
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    measure,
+    print_table,
+    seed_users,
+    setup_django,
+)
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(tasks=500, users=1, repeat=5)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from task_tracker.constants import MAX_BULK_SIZE
+
+    list_url = reverse("api:tasks-list")
+    bulk_url = reverse("api:tasks-bulk")
+    items = [{"title": f"Synced task {i}"} for i in range(args.tasks)]
+    batches = [
+        items[start : start + MAX_BULK_SIZE]
+        for start in range(0, len(items), MAX_BULK_SIZE)
+    ]
+
+    with benchmark_database(keepdb=args.keepdb):
+        (user,) = seed_users(1)
+        client = APIClient(SERVER_NAME="localhost")
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+        def one_by_one():
+            for item in items:
+                client.post(list_url, item, format="json")
+            user.tasks.all().delete()
+
+        def bulk():
+            for batch in batches:
+                client.post(bulk_url, batch, format="json")
+            user.tasks.all().delete()
+
+        rows = [
+            (f"{len(items)} requests", "one by one", measure(one_by_one, args.repeat)),
+            (f"{len(batches)} requests", "bulk", measure(bulk, args.repeat)),
+        ]
+
+    print(f"\ncreating {args.tasks:,} tasks")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Fixtures of the API benchmark suite.
+
+Every benchmark checks its endpoint against a query count and a wall-clock
+budget. Query counts don't depend on the machine and are checked in every
+run, including the normal test run, so CI fails on a new N+1 query.
+Timings do, so wall-clock budgets are only checked when a previous results
+file is passed as ``--benchmark-baseline``, which also fails benchmarks
+that got slower than ``--benchmark-threshold`` or run more queries than
+before. Results can be written to a JSON file with ``--benchmark-json``.
+"""
+
+import json
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from benchmarks.utils import insert_tasks, seed_tasks, seed_users
+from tasks.models import Task
+
+BACKGROUND_USERS = 50
+DEFAULTS = {
+    "--benchmark-threshold": 0.5,
+    "--benchmark-repeat": 20,
+    "--benchmark-tasks": 50_000,
+    "--benchmark-user-tasks": 2_000,
+}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark-json", help="Write benchmark results to a file.")
+    group.addoption(
+        "--benchmark-baseline", help="Compare benchmark results with a file."
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=DEFAULTS["--benchmark-threshold"],
+        help="Relative slowdown over the baseline that fails a benchmark.",
+    )
+    group.addoption(
+        "--benchmark-repeat", type=int, default=DEFAULTS["--benchmark-repeat"]
+    )
+    group.addoption(
+        "--benchmark-tasks",
+        type=int,
+        default=DEFAULTS["--benchmark-tasks"],
+        help="Tasks of other users in the table while benchmarking.",
+    )
+    group.addoption(
+        "--benchmark-user-tasks",
+        type=int,
+        default=DEFAULTS["--benchmark-user-tasks"],
+        help="Tasks of the benchmarked user.",
+    )
+
+
+def option(config, name: str):
+    # Options are only registered when the suite is run on its own, full
+    # runs of the test suite use the defaults.
+    return config.getoption(name, default=DEFAULTS.get(name))
+
+
+@pytest.fixture(scope="package")
+def background_tasks(request, django_db_setup, django_db_blocker):
+    """Fill the tasks table with tasks of other users for the suite."""
+    with django_db_blocker.unblock():
+        users = seed_users(BACKGROUND_USERS)
+        seed_tasks(users, option(request.config, "--benchmark-tasks"))
+    yield
+    # Leave the database empty for any tests that run after the suite.
+    owner_ids = [user.pk for user in users]
+    with django_db_blocker.unblock(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {Task._meta.db_table} WHERE owner_id = ANY(%s)", [owner_ids]
+        )
+        get_user_model().objects.filter(pk__in=owner_ids).delete()
+
+
+@pytest.fixture
+def user_tasks(request, background_tasks, test_user) -> int:
+    count = option(request.config, "--benchmark-user-tasks")
+    insert_tasks([test_user.pk], 0, count - 1)
+    return count
+
+
+@pytest.fixture(autouse=True)
+def uncached(settings):
+    # Measure the work behind the response cache, not the cache itself.
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request):
+    results = {}
+    yield results
+    path = option(request.config, "--benchmark-json")
+    if path and results:
+        Path(path).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(request) -> dict:
+    path = option(request.config, "--benchmark-baseline")
+    return json.loads(Path(path).read_text()) if path else {}
+
+
+@pytest.fixture
+def benchmark(request, benchmark_results, benchmark_baseline):
+    """
+    Return a function that benchmarks a callable against its budgets.
+
+    The callable runs once to warm up and once to count queries, then
+    ``repeat`` times to time it.
+    """
+    threshold = option(request.config, "--benchmark-threshold")
+
+    def run(func, *, max_queries: int, max_ms: float, repeat: int | None = None):
+        name = request.node.name
+        func()
+        # Requests reset connection.queries, so count queries as they run.
+        queries = []
+        with connection.execute_wrapper(
+            lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)
+        ):
+            func()
+        timings = []
+        for _ in range(repeat or option(request.config, "--benchmark-repeat")):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        result = {
+            "queries": len(queries),
+            "p50_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(
+                timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3
+            ),
+        }
+        benchmark_results[name] = result
+
+        assert result["queries"] <= max_queries, (
+            f"{name} ran {result['queries']} queries, budget is {max_queries}"
+        )
+        if option(request.config, "--benchmark-baseline"):
+            assert result["p50_ms"] <= max_ms, (
+                f"{name} took {result['p50_ms']} ms, budget is {max_ms} ms"
+            )
+        baseline = benchmark_baseline.get(name)
+        if baseline:
+            assert result["queries"] <= baseline["queries"], (
+                f"{name} ran {result['queries']} queries, "
+                f"{baseline['queries']} in the baseline"
+            )
+            limit = baseline["p50_ms"] * (1 + threshold)
+            assert result["p50_ms"] <= limit, (
+                f"{name} took {result['p50_ms']} ms, "
+                f"{baseline['p50_ms']} ms in the baseline"
+            )
+        return result
+
+    return run
@@ -0,0 +1,102 @@
+"""
+Compare loading tasks through the bulk endpoint with the COPY based import.
+
+The bulk endpoint takes batches of ``MAX_BULK_SIZE`` tasks per request, the
+import takes the whole file in one NDJSON or CSV request. Imported tasks are
+deleted after every run, ``--background`` tasks of other users stay, so
+indexes have a realistic size.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.imports --tasks 100000 --background 1000000 --keepdb
+"""
+
+import csv
+import io
+import json
+import time
+
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    seed_tasks,
+    seed_users,
+    setup_django,
+)
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(tasks=100_000, users=20)
+    parser.add_argument("--background", type=int, default=1_000_000)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from task_tracker.constants import MAX_BULK_SIZE
+
+    rows = [
+        {
+            "title": f"Imported task {i}",
+            "description": f"Moved over from the old tracker, item {i}.",
+            "completed": i % 3 == 0,
+        }
+        for i in range(args.tasks)
+    ]
+    ndjson = "".join(json.dumps(row) + "\n" for row in rows).encode()
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    csv_content = buffer.getvalue().encode()
+
+    with benchmark_database(keepdb=args.keepdb):
+        users = seed_users(args.users + 1)
+        seed_tasks(users[:-1], args.background)
+        user = users[-1]
+        user.tasks.all().delete()
+        client = APIClient(SERVER_NAME="localhost")
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+        def bulk():
+            for start in range(0, len(rows), MAX_BULK_SIZE):
+                client.post(
+                    reverse("api:tasks-bulk"),
+                    rows[start : start + MAX_BULK_SIZE],
+                    format="json",
+                )
+
+        def load(content: bytes, content_type: str):
+            def run():
+                response = client.post(
+                    reverse("api:tasks-import"), content, content_type=content_type
+                )
+                assert response.data["imported"] == len(rows), response.data
+
+            return run
+
+        cases = {
+            f"bulk endpoint ({MAX_BULK_SIZE}/request)": bulk,
+            "import, NDJSON": load(ndjson, "application/x-ndjson"),
+            "import, CSV": load(csv_content, "text/csv"),
+        }
+        results = []
+        for name, run in cases.items():
+            started = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - started
+            assert user.tasks.count() == len(rows)
+            user.tasks.all().delete()
+            results.append((name, seconds))
+
+    print(f"\nloading {args.tasks:,} tasks next to {args.background:,} others")
+    print(f"{'case':<34}{'seconds':>10}{'rows/s':>12}")
+    for name, seconds in results:
+        print(f"{name:<34}{seconds:>10.2f}{len(rows) / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
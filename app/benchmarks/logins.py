@@ -0,0 +1,138 @@
+"""
+Measure task list latency while other clients keep logging in.
+
+Runs the ASGI server twice: with the default bounded hashing pool, and with
+a pool as large as the login load, which hashes every login at once like
+hashing on the request thread did. For each, task list latency is measured
+without logins and then next to ``--logins`` clients logging in back to
+back. Logins turned away by a saturated pool count as rejected.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.logins --workers 2 --logins 16 --duration 10 --keepdb
+"""
+
+import asyncio
+import json
+import random
+import time
+
+from benchmarks.serving import fetch, run_server
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    seed_tasks,
+    seed_users,
+    setup_django,
+)
+
+PASSWORD = "benchmark-password"
+
+
+async def run_load(port, paths, tokens, clients, login_path, logins, duration):
+    """Run task list clients next to login clients for ``duration`` seconds."""
+    latencies, login_statuses = [], []
+    deadline = time.perf_counter() + duration
+
+    async def task_client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await fetch(port, random.choice(paths), random.choice(tokens))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async def login_client(email):
+        body = json.dumps({"email": email, "password": PASSWORD})
+        while time.perf_counter() < deadline:
+            login_statuses.append(await fetch(port, login_path, None, body))
+
+    await asyncio.gather(
+        *(task_client() for _ in range(clients)),
+        *(login_client(email) for email in logins),
+    )
+    latencies.sort()
+    return {
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "task rps": len(latencies) / duration,
+        "logins": login_statuses.count(200),
+        "rejected": login_statuses.count(503),
+    }
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(tasks=100_000, users=20)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.urls import reverse
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    pools = {
+        "bounded pool": {},
+        "unbounded": {
+            "PASSWORD_HASHING_WORKERS": str(args.logins),
+            "PASSWORD_HASHING_MAX_PENDING": str(args.logins),
+        },
+    }
+
+    with benchmark_database(keepdb=args.keepdb) as connection:
+        users = seed_users(args.users)
+        seed_tasks(users, args.tasks)
+        get_user_model().objects.filter(pk__in=[user.pk for user in users]).update(
+            password=make_password(PASSWORD)
+        )
+        tokens = [str(AccessToken.for_user(user)) for user in users]
+        emails = [user.email for user in users]
+        list_url = reverse("api:tasks-list")
+        paths = [f"{list_url}?page={page}" for page in range(1, 11)]
+        login_url = reverse("api:login")
+
+        rows = []
+        for name, env in pools.items():
+            with run_server(
+                "uvicorn_worker.UvicornWorker",
+                "task_tracker.asgi",
+                args.workers,
+                args.port,
+                connection.settings_dict["NAME"],
+                env,
+            ):
+                for logins in (0, args.logins):
+                    stats = asyncio.run(
+                        run_load(
+                            args.port,
+                            paths,
+                            tokens,
+                            args.clients,
+                            login_url,
+                            [random.choice(emails) for _ in range(logins)],
+                            args.duration,
+                        )
+                    )
+                    rows.append((name, logins, stats))
+
+    print(
+        f"\n{args.workers} workers, {args.clients} task clients, "
+        f"{args.duration:.0f} s per run"
+    )
+    print(
+        f"{'hashing':<16}{'logins':>8}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'task rps':>10}{'logged in':>11}{'rejected':>10}"
+    )
+    for name, logins, stats in rows:
+        print(
+            f"{name:<16}{logins:>8}{stats['p50']:>10.2f}{stats['p99']:>10.2f}"
+            f"{stats['task rps']:>10.1f}{stats['logins']:>11}{stats['rejected']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Compare task list latency and vacuum time of the plain task table with the
+table hash-partitioned by owner.
+
+The seeded table is measured first, then converted with the
+``partition_task_table`` command and measured again. With ``--keepdb`` the
+database stays partitioned, later runs only measure the partitioned table.
+Every list query reads the tasks of a random user. Vacuum is measured after
+updating ``--churn`` of the tasks, for the whole table and, as autovacuum
+processes partitions one at a time, for its largest partition.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.partitioning --tasks 100000000 --users 10000 --keepdb
+"""
+
+import random
+import time
+
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    measure,
+    print_table,
+    seed_tasks,
+    seed_users,
+    setup_django,
+)
+
+PAGE_SIZE = 10
+
+
+def timed_sql(sql: str) -> float:
+    from django.db import connection
+
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+    return (time.perf_counter() - start) * 1000
+
+
+def largest_partition() -> str | None:
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = 'tasks_task'::regclass "
+            "ORDER BY pg_relation_size(inhrelid) DESC LIMIT 1"
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def run_cases(users: list, repeat: int, churn: float, table: str) -> list[tuple]:
+    from django.db.models import Max
+
+    def list_query(**filters):
+        def run():
+            user = random.choice(users)
+            return list(user.tasks.filter(**filters)[:PAGE_SIZE])
+
+        return run
+
+    def deep_page():
+        user = random.choice(users)
+        return list(user.tasks.all()[100 * PAGE_SIZE : 101 * PAGE_SIZE])
+
+    def last_modified():
+        user = random.choice(users)
+        return user.tasks.aggregate(Max("updated_at"))
+
+    rows = [
+        ("first page", table, measure(list_query(), repeat)),
+        ("open tasks", table, measure(list_query(completed=False), repeat)),
+        ("page 101", table, measure(deep_page, repeat)),
+        ("max(updated_at)", table, measure(last_modified, repeat)),
+    ]
+
+    modulus = round(1 / churn)
+    timed_sql(
+        f"UPDATE tasks_task SET completed = NOT completed WHERE id % {modulus} = 0"
+    )
+    rows.append(("vacuum", table, single(timed_sql("VACUUM tasks_task"))))
+    if partition := largest_partition():
+        timed_sql(
+            f"UPDATE {partition} SET completed = NOT completed WHERE id % {modulus} = 0"
+        )
+        rows.append(
+            (
+                "vacuum largest partition",
+                table,
+                single(timed_sql(f"VACUUM {partition}")),
+            )
+        )
+    return rows
+
+
+def single(milliseconds: float) -> dict:
+    return {"p50": milliseconds, "p95": milliseconds, "max": milliseconds}
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(users=10_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument(
+        "--churn",
+        type=float,
+        default=0.01,
+        help="Share of tasks updated before vacuum.",
+    )
+    args = parser.parse_args()
+    setup_django()
+
+    from tasks.partitioning import is_partitioned, partition_task_table
+
+    with benchmark_database(keepdb=args.keepdb):
+        users = seed_users(args.users)
+        seed_tasks(users, args.tasks)
+
+        rows = []
+        if not is_partitioned():
+            rows += run_cases(users, args.repeat, args.churn, "plain")
+            start = time.perf_counter()
+            partition_task_table(args.partitions)
+            print(f"  partitioned in {time.perf_counter() - start:.0f} s", flush=True)
+            timed_sql("VACUUM ANALYZE tasks_task")
+        rows += run_cases(users, args.repeat, args.churn, "partitioned")
+
+    print(f"\n{args.tasks:,} tasks over {args.users:,} users")
+    print(f"{args.partitions} partitions")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Load test a cheap endpoint with and without database connection pooling.
+
+Task detail requests make a single indexed query, so connecting to Postgres
+is a large part of their cost when every request opens its own connection.
+Each server runs with ``DB_POOL`` switched off and on, and the Postgres
+connections of the benchmark database are counted once the load is over.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.pooling --workers 4 --duration 10 --keepdb
+"""
+
+import asyncio
+
+from benchmarks.serving import WORKER_CLASSES, load, run_server
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    seed_tasks,
+    seed_users,
+    setup_django,
+)
+
+POOLING = {"no pool": {"DB_POOL": "False"}, "pool": {"DB_POOL": "True"}}
+
+
+def count_connections(connection) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND pid <> pg_backend_pid()"
+        )
+        return cursor.fetchone()[0]
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(tasks=100_000, users=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.urls import reverse
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from tasks.models import Task
+
+    with benchmark_database(keepdb=args.keepdb) as connection:
+        users = seed_users(args.users)
+        seed_tasks(users, args.tasks)
+        user = users[0]
+        tokens = [str(AccessToken.for_user(user))]
+        task_ids = Task.objects.filter(owner=user).values_list("pk", flat=True)[:100]
+        paths = [reverse("api:tasks-detail", args=[pk]) for pk in task_ids]
+        db_name = connection.settings_dict["NAME"]
+
+        rows = []
+        for name, (worker_class, app) in WORKER_CLASSES.items():
+            for pooling, env in POOLING.items():
+                with run_server(
+                    worker_class, app, args.workers, args.port, db_name, env
+                ):
+                    asyncio.run(load(args.port, paths, tokens, 4, 2))  # warm up
+                    stats = asyncio.run(
+                        load(args.port, paths, tokens, args.concurrency, args.duration)
+                    )
+                    rows.append((name, pooling, stats, count_connections(connection)))
+
+    print(f"\n{args.workers} workers, {args.concurrency} clients, task detail")
+    print(
+        f"{'server':<18}{'pooling':<10}{'rps':>10}{'p50 ms':>10}"
+        f"{'p99 ms':>10}{'errors':>8}{'idle conns':>12}"
+    )
+    for name, pooling, stats, connections in rows:
+        print(
+            f"{name:<18}{pooling:<10}{stats['rps']:>10.1f}{stats['p50']:>10.2f}"
+            f"{stats['p99']:>10.2f}{stats['errors']:>8}{connections:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
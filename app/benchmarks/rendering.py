@@ -0,0 +1,107 @@
+"""
+Compare task pages rendered with DRF's JSONRenderer and the orjson renderer,
+with all fields and with a sparse ``?fields=`` selection.
+
+Pages of ``--page-size`` tasks with ``--description-size`` character
+descriptions are requested in-process, and their data rendered on its own.
+Every request has a distinct URL, so the response cache never answers.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.rendering --tasks 10000 --description-size 4000 --keepdb
+"""
+
+import itertools
+
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    measure,
+    print_table,
+    seed_users,
+    setup_django,
+)
+
+INSERT_SQL = """
+    INSERT INTO tasks_task (title, description, completed, created_at, updated_at,
+        owner_id)
+    SELECT 'Task ' || g, repeat('Lorem ipsum dolor sit amet. ', %s / 28 + 1),
+        g %% 3 = 0, now() - g * interval '1 minute', now(), %s
+    FROM generate_series(1, %s) g
+"""
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(tasks=10_000, repeat=50)
+    parser.add_argument("--description-size", type=int, default=4000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.db import connection
+    from django.urls import reverse
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from api.renderers import ORJSONRenderer
+    from api.views import TasksViewSet
+
+    with benchmark_database(keepdb=args.keepdb):
+        (user,) = seed_users(1)
+        if user.tasks.count() != args.tasks:
+            user.tasks.all().delete()
+            with connection.cursor() as cursor:
+                cursor.execute(INSERT_SQL, [args.description_size, user.pk, args.tasks])
+                cursor.execute("VACUUM ANALYZE tasks_task")
+        client = APIClient(SERVER_NAME="localhost")
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        url = reverse("api:tasks-list")
+        counter = itertools.count()
+        renderers = {"JSONRenderer": JSONRenderer, "ORJSONRenderer": ORJSONRenderer}
+        cases = {
+            "all fields": {},
+            "id,title,completed": {"fields": "id,title,completed"},
+        }
+
+        rows, sizes = [], {}
+        for case, params in cases.items():
+            for name, renderer in renderers.items():
+                TasksViewSet.renderer_classes = [renderer]
+
+                def get_page():
+                    response = client.get(
+                        url,
+                        {
+                            "pagination": "cursor",
+                            "page_size": args.page_size,
+                            "nocache": next(counter),
+                            **params,
+                        },
+                    )
+                    assert response.status_code == 200, response.content
+                    return response
+
+                page = get_page()
+                sizes[case] = len(page.content)
+                rows.append((case, name, measure(get_page, args.repeat)))
+                rows.append(
+                    (
+                        f"{case}, render only",
+                        name,
+                        measure(lambda: renderer().render(page.data), args.repeat),
+                    )
+                )
+
+    print(
+        f"\npages of {args.page_size} tasks with "
+        f"{args.description_size:,} character descriptions"
+    )
+    print_table(rows)
+    for case, size in sizes.items():
+        print(f"{case}: {size / 1024:,.0f} KiB per page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare DRF's SearchFilter with TaskSearchFilter on a seeded dataset.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.search --tasks 5000000 --users 100 --keepdb
+"""
+
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
+
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    measure,
+    print_table,
+    seed_tasks,
+    seed_users,
+    setup_django,
+)
+
+TERMS = {
+    "rare word": "123456",
+    "common word": "passport",
+    "two words": "renew passport",
+    "substring": "assp",
+    "typo": "pasport",
+    "no match": "zzzzzz",
+}
+PAGE_SIZE = 10
+
+
+@contextmanager
+def without_trigram_index():
+    """Run SearchFilter against the schema it had before TaskSearchFilter."""
+    from django.db import connection, transaction
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX task_owner_title_trgm_idx")
+        yield
+        transaction.set_rollback(True)
+
+
+def main():
+    args = base_parser(__doc__).parse_args()
+    setup_django()
+
+    from rest_framework import filters
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api.filters import TaskSearchFilter
+
+    backends = {
+        "SearchFilter": (filters.SearchFilter(), without_trigram_index),
+        "TaskSearchFilter": (TaskSearchFilter(), nullcontext),
+    }
+    view = SimpleNamespace(search_fields=["title"])
+    factory = APIRequestFactory()
+
+    with benchmark_database(keepdb=args.keepdb):
+        users = seed_users(args.users)
+        seed_tasks(users, args.tasks)
+        user = users[0]
+        user_tasks = user.tasks.count()
+
+        rows = []
+        for case, term in TERMS.items():
+            request = Request(factory.get("/", {"search": term}))
+            for name, (backend, schema) in backends.items():
+
+                def first_page():
+                    queryset = backend.filter_queryset(request, user.tasks.all(), view)
+                    return queryset.count(), list(queryset[:PAGE_SIZE])
+
+                with schema():
+                    hits, _ = first_page()
+                    stats = measure(first_page, args.repeat)
+                rows.append((f"{case} ({hits} hits)", name, stats))
+
+    print(f"\n{args.tasks:,} tasks over {args.users} users, count + first page")
+    print(f"searching {user_tasks:,} tasks of a single user")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Load test the task list under WSGI and ASGI gunicorn workers.
+
+Each server runs with the same number of workers against the seeded
+benchmark database, with the response cache disabled so every request
+reaches Postgres. Requests pick a random user and page, and every request
+opens a new connection since sync workers don't keep connections alive.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.serving --workers 4 --duration 10 --keepdb
+"""
+
+import asyncio
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    seed_tasks,
+    seed_users,
+    setup_django,
+)
+
+APP_DIR = Path(__file__).resolve().parent.parent
+WORKER_CLASSES = {
+    "WSGI (sync)": ("sync", "task_tracker.wsgi"),
+    "ASGI (uvicorn)": ("uvicorn_worker.UvicornWorker", "task_tracker.asgi"),
+}
+
+
+@contextmanager
+def run_server(
+    worker_class: str,
+    app: str,
+    workers: int,
+    port: int,
+    db_name: str,
+    extra_env: dict[str, str] | None = None,
+):
+    env = {
+        **os.environ,
+        "POSTGRES_DB": db_name,
+        "DJANGO_SETTINGS_MODULE": "benchmarks.serving_settings",
+        **(extra_env or {}),
+    }
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        app,
+        f"--bind=127.0.0.1:{port}",
+        f"--workers={workers}",
+        f"--worker-class={worker_class}",
+        "--log-level=warning",
+    ]
+    server = subprocess.Popen(command, cwd=APP_DIR, env=env)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError(f"{app} did not start")
+                time.sleep(0.2)
+        yield
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+
+async def fetch(port: int, path: str, token: str | None, body: str = "") -> int:
+    """Send a GET request, or a POST of a JSON ``body``, and return the status."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = f"{'POST' if body else 'GET'} {path} HTTP/1.1\r\nHost: localhost\r\n"
+    if token:
+        head += f"Authorization: Bearer {token}\r\n"
+    if body:
+        head += (
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body.encode())}\r\n"
+        )
+    writer.write(f"{head}Connection: close\r\n\r\n{body}".encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1])
+
+
+async def load(port: int, paths, tokens, concurrency: int, duration: float):
+    """Keep ``concurrency`` requests in flight for ``duration`` seconds."""
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def client():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            token_index = random.randrange(len(tokens))
+            path = random.choice(paths)
+            start = time.perf_counter()
+            try:
+                status = await fetch(port, path, tokens[token_index])
+            except OSError:
+                status = 0
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "errors": errors,
+    }
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(tasks=100_000, users=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 8, 32, 64],
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.urls import reverse
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    with benchmark_database(keepdb=args.keepdb) as connection:
+        users = seed_users(args.users)
+        seed_tasks(users, args.tasks)
+        tokens = [str(AccessToken.for_user(user)) for user in users]
+        db_name = connection.settings_dict["NAME"]
+        pages = max(1, args.tasks // args.users // 10)
+        list_url = reverse("api:tasks-list")
+        paths = [f"{list_url}?page={page}" for page in range(1, pages + 1)]
+
+        rows = []
+        for name, (worker_class, app) in WORKER_CLASSES.items():
+            with run_server(worker_class, app, args.workers, args.port, db_name):
+                asyncio.run(load(args.port, paths, tokens, 4, 2))  # warm up
+                for concurrency in args.concurrency:
+                    stats = asyncio.run(
+                        load(args.port, paths, tokens, concurrency, args.duration)
+                    )
+                    rows.append((name, concurrency, stats))
+
+    print(f"\n{args.workers} workers, {args.tasks:,} tasks over {args.users} users")
+    print(
+        f"{'server':<18}{'clients':>8}{'rps':>10}{'p50 ms':>10}"
+        f"{'p99 ms':>10}{'errors':>8}"
+    )
+    for name, concurrency, stats in rows:
+        print(
+            f"{name:<18}{concurrency:>8}{stats['rps']:>10.1f}"
+            f"{stats['p50']:>10.2f}{stats['p99']:>10.2f}{stats['errors']:>8}"
+        )
+    for name in WORKER_CLASSES:
+        best = max(stats["rps"] for server, _, stats in rows if server == name)
+        print(f"max sustained rps, {name}: {best:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Settings for benchmark servers, with the response cache switched off."""
+
+from task_tracker.settings import *  # noqa: F403
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
@@ -0,0 +1,126 @@
+"""
+Query count and latency budgets of the API endpoints.
+
+Query budgets are exact for the warm path and catch N+1 queries in every
+test run. Latency budgets are only checked against a baseline from the
+same machine, which also catches smaller slowdowns.
+
+Run on its own (from the ``app`` directory):
+
+    python -m pytest benchmarks --benchmark-json=results.json
+    python -m pytest benchmarks --benchmark-baseline=results.json
+"""
+
+import itertools
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from tasks.models import Task
+
+list_url = reverse("api:tasks-list")
+
+
+def get(client, url, data=None):
+    response = client.get(url, data)
+    assert response.status_code == status.HTTP_200_OK
+    return response
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_tasks")
+class TestTaskBenchmarks:
+    """Benchmark the task endpoints of a user with many tasks."""
+
+    def test_list(self, benchmark, authorized_client):
+        # List validators, count and page.
+        benchmark(lambda: get(authorized_client, list_url), max_queries=3, max_ms=100)
+
+    def test_list_last_page(self, benchmark, authorized_client, user_tasks):
+        page = user_tasks // 10
+        benchmark(
+            lambda: get(authorized_client, list_url, {"page": page}),
+            max_queries=3,
+            max_ms=100,
+        )
+
+    def test_list_keyset(self, benchmark, authorized_client):
+        benchmark(
+            lambda: get(authorized_client, list_url, {"pagination": "cursor"}),
+            max_queries=2,
+            max_ms=100,
+        )
+
+    def test_filter(self, benchmark, authorized_client):
+        benchmark(
+            lambda: get(authorized_client, list_url, {"completed": "true"}),
+            max_queries=3,
+            max_ms=100,
+        )
+
+    def test_search(self, benchmark, authorized_client):
+        benchmark(
+            lambda: get(authorized_client, list_url, {"search": "invoice"}),
+            max_queries=3,
+            max_ms=200,
+        )
+
+    def test_retrieve(self, benchmark, authorized_client, test_user):
+        task = Task.objects.filter(owner=test_user).first()
+        url = reverse("api:tasks-detail", args=[task.pk])
+        benchmark(lambda: get(authorized_client, url), max_queries=1, max_ms=50)
+
+    def test_create(self, benchmark, authorized_client):
+        def create():
+            response = authorized_client.post(
+                list_url, {"title": "Benchmark"}, content_type="application/json"
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+        benchmark(create, max_queries=1, max_ms=50)
+
+    def test_update(self, benchmark, authorized_client, test_user):
+        task = Task.objects.filter(owner=test_user).first()
+        url = reverse("api:tasks-detail", args=[task.pk])
+        completed = itertools.cycle([True, False])
+
+        def update():
+            response = authorized_client.patch(
+                url, {"completed": next(completed)}, content_type="application/json"
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+        # Fetch the task and update it in a transaction, which rolls back
+        # a restore from the archive with a failed write.
+        benchmark(update, max_queries=4, max_ms=50)
+
+
+@pytest.mark.django_db
+class TestAuthBenchmarks:
+    """Benchmark sign-up and login, which are dominated by password hashing."""
+
+    def test_register(self, benchmark, client, test_user_data):
+        numbers = itertools.count()
+
+        def register():
+            number = next(numbers)
+            response = client.post(
+                reverse("api:register"),
+                {
+                    **test_user_data,
+                    "email": f"user{number}@example.com",
+                    "username": f"user{number}",
+                },
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+        benchmark(register, max_queries=3, max_ms=2000, repeat=5)
+
+    @pytest.mark.usefixtures("test_user")
+    def test_login(self, benchmark, client, test_login_credentials):
+        def login():
+            response = client.post(reverse("api:login"), test_login_credentials)
+            assert response.status_code == status.HTTP_200_OK
+
+        benchmark(login, max_queries=1, max_ms=2000, repeat=5)
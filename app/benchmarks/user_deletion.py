@@ -0,0 +1,110 @@
+"""
+Compare deleting a user with many tasks through the ORM collector with the
+batched purge, and the admin's deletion preview before and after.
+
+The ORM runs first inside a transaction that is rolled back, so both
+delete the same tasks. Time, the longest transaction and the Python memory
+peak are reported. Memory is traced with ``tracemalloc``, which slows both
+down.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.user_deletion --tasks 500000 --background 1000000
+"""
+
+import time
+import tracemalloc
+
+from benchmarks.utils import (
+    base_parser,
+    benchmark_database,
+    insert_tasks,
+    seed_tasks,
+    seed_users,
+    setup_django,
+)
+
+
+def traced(func) -> tuple[float, float, object]:
+    """Run ``func``, return its seconds, memory peak in MB and result."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak / 2**20, result
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(tasks=500_000, users=20)
+    parser.add_argument("--background", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.contrib import admin
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.admin import UserAdmin
+    from django.db import transaction
+    from django.test import RequestFactory
+
+    from users.admin import CustomUserAdmin
+    from users.deletion import purge_user
+
+    User = get_user_model()
+
+    with benchmark_database(keepdb=args.keepdb):
+        seed_tasks(seed_users(args.users), args.background)
+        user = User.objects.create(
+            username="bench_deleted", email="bench_deleted@example.com"
+        )
+        for start in range(0, args.tasks, 500_000):
+            insert_tasks([user.pk], start, min(start + 500_000, args.tasks) - 1)
+
+        request = RequestFactory().get("/")
+        request.user = User(is_superuser=True, is_staff=True, is_active=True)
+        previews = {
+            "collector preview": UserAdmin(User, admin.site),
+            "counter preview": CustomUserAdmin(User, admin.site),
+        }
+        rows = []
+        for name, model_admin in previews.items():
+            seconds, peak, _ = traced(
+                lambda: model_admin.get_deleted_objects([user], request)
+            )
+            rows.append((name, seconds, seconds, peak))
+
+        def orm_delete():
+            with transaction.atomic():
+                User.objects.filter(pk=user.pk).delete()
+                transaction.set_rollback(True)
+
+        seconds, peak, _ = traced(orm_delete)
+        rows.append(("ORM delete", seconds, seconds, peak))
+
+        batches = []
+        last = [time.perf_counter()]
+
+        def progress(purged, rate):
+            now = time.perf_counter()
+            batches.append(now - last[0])
+            last[0] = now
+
+        seconds, peak, purged = traced(
+            lambda: purge_user(user.pk, batch_size=args.batch_size, progress=progress)
+        )
+        assert purged == args.tasks, purged
+        rows.append(("batched purge", seconds, max(batches), peak))
+
+    print(f"\ndeleting a user with {args.tasks:,} tasks next to {args.background:,}")
+    print(f"{'case':<24}{'seconds':>10}{'longest tx s':>14}{'peak MB':>10}")
+    for name, seconds, longest, peak in rows:
+        print(f"{name:<24}{seconds:>10.2f}{longest:>14.2f}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Benchmarks run against a throwaway copy of the configured database
+(``test_<name>``), the same one pytest uses, so seeded data never ends up
+in the development database. Pass ``--keepdb`` to reuse seeded data
+between runs.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+import django
+
+WORDS = (
+    "buy fix call write review plan book clean send pay update read email "
+    "order check prepare schedule meet renew cancel report deploy test "
+    "groceries passport invoice dentist garden budget meeting release "
+    "presentation insurance tickets laundry birthday contract backup server "
+    "database kitchen project hotel flight doctor taxes client website"
+).split()
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_tracker.settings")
+    django.setup()
+
+
+def base_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--keepdb",
+        action="store_true",
+        help="Keep the benchmark database and reuse its data on the next run.",
+    )
+    return parser
+
+
+@contextmanager
+def benchmark_database(keepdb: bool = False):
+    """Switch the default connection to the throwaway benchmark database."""
+    from django.db import connection
+
+    # Not serialized, reused databases hold millions of seeded rows.
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=keepdb, serialize=False
+    )
+    try:
+        yield connection
+    finally:
+        if not keepdb:
+            connection.creation.destroy_test_db(
+                connection.settings_dict["NAME"], verbosity=0
+            )
+
+
+def seed_users(count: int) -> list:
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    existing = list(User.objects.filter(username__startswith="bench_"))
+    if len(existing) >= count:
+        return existing[:count]
+    return existing + User.objects.bulk_create(
+        User(
+            username=f"bench_{i}",
+            email=f"bench_{i}@example.com",
+            password="!",
+        )
+        for i in range(len(existing), count)
+    )
+
+
+INSERT_TASKS_SQL = """
+    INSERT INTO {table}
+        (title, description, completed, created_at, updated_at, owner_id)
+    SELECT
+        initcap(w[1 + floor(random() * n)::int]) || ' '
+            || w[1 + floor(random() * n)::int] || ' ' || g,
+        -- Half common words, half a long tail of rare ones, so term
+        -- frequencies look like real text. Referencing g makes the
+        -- subquery run once per row.
+        array_to_string(ARRAY(
+            SELECT w[1 + floor(random() * n)::int]
+                || CASE WHEN s %% 2 = 0 THEN floor(random() * 50000)::text
+                   ELSE '' END
+            FROM generate_series(1, 12 + 0 * g) s
+        ), ' '),
+        random() < 0.6,
+        ts,
+        ts,
+        o[1 + g %% array_length(o, 1)]
+    FROM (
+        SELECT g, now() - random() * interval '3 years' AS ts
+        FROM generate_series(%s, %s) g
+    ) seq,
+    (SELECT %s::text[] AS w, %s AS n, %s::bigint[] AS o) params
+"""
+
+
+def insert_tasks(owner_ids: list[int], start: int, stop: int):
+    """Insert random tasks numbered ``start`` to ``stop``, spread over owners."""
+    from django.db import connection
+
+    from tasks.models import Task
+
+    sql = INSERT_TASKS_SQL.format(table=Task._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [start, stop, list(WORDS), len(WORDS), owner_ids])
+
+
+def seed_tasks(users: list, count: int, batch_size: int = 500_000) -> int:
+    """
+    Spread ``count`` random tasks over ``users`` with set-based inserts.
+    Returns the number of tasks created, existing tasks count towards the total.
+    """
+    from django.db import connection
+
+    from tasks.models import Task
+
+    existing = Task.objects.count()
+    owner_ids = [user.pk for user in users]
+    created = 0
+    for start in range(existing, count, batch_size):
+        stop = min(start + batch_size, count) - 1
+        insert_tasks(owner_ids, start, stop)
+        created += stop - start + 1
+        print(f"  seeded {stop + 1:,}/{count:,} tasks", flush=True)
+    if created:
+        with connection.cursor() as cursor:
+            cursor.execute(f"VACUUM ANALYZE {Task._meta.db_table}")
+    return created
+
+
+def measure(func: Callable[[], object], repeat: int, warmup: int = 2) -> dict:
+    """Call ``func`` repeatedly and return latency statistics in milliseconds."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "min": timings[0],
+        "p50": statistics.median(timings),
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "max": timings[-1],
+    }
+
+
+def print_table(rows: list[tuple[str, str, dict]]):
+    print(f"{'case':<34}{'backend':<18}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for case, backend, stats in rows:
+        print(
+            f"{case:<34}{backend:<18}"
+            f"{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['max']:>10.2f}"
+        )
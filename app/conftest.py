@@ -1,14 +1,30 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from typing import TypeVar
 
 import pytest
 from django.contrib.auth.models import AbstractBaseUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
 from django.test.client import Client
+from django.urls import reverse
 from django.utils.module_loading import import_string
 from rest_framework_simplejwt.settings import api_settings
 
+from tasks.models import TaskCounter
+from users.cache import local_user_cache
+
 User = TypeVar("User", bound=AbstractBaseUser)
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yield
+    cache.clear()
+    local_user_cache.clear()
+
+
 @pytest.fixture
 def test_user_email() -> str:
     return "test@example.com"
@@ -68,3 +84,72 @@ def authentication_token(test_user) -> str:
 def authorized_client(client, authentication_token) -> Client:
     client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {authentication_token}"
     return client
+
+
+@pytest.fixture
+def admin_user(django_user_model) -> User:
+    # Replaces pytest-django's, which doesn't set the required username. Its
+    # admin_client logs this user in.
+    return django_user_model.objects.create_superuser(
+        username="admin", email="admin@example.com", password="adminpassword"
+    )
+
+
+@pytest.fixture
+def task_url() -> Callable[[int], str]:
+    def url(task_id: int) -> str:
+        return reverse("api:tasks-detail", kwargs={"pk": task_id})
+
+    return url
+
+
+@pytest.fixture
+def capture_statements():
+    """
+    Return a context manager collecting the SQL statements run on a
+    database connection, by default the primary.
+    """
+
+    @contextmanager
+    def capture(using: str = DEFAULT_DB_ALIAS) -> Iterator[list[str]]:
+        statements = []
+
+        def log(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with connections[using].execute_wrapper(log):
+            yield statements
+
+    return capture
+
+
+@pytest.fixture
+def get_statements(authorized_client, capture_statements):
+    """
+    Return a function making an authorized GET request, which returns the
+    response and the SQL statements run for it.
+    """
+
+    def get(url: str, **params) -> tuple[HttpResponse, list[str]]:
+        with capture_statements() as statements:
+            response = authorized_client.get(url, data=params)
+        return response, statements
+
+    return get
+
+
+@pytest.fixture
+def task_counts() -> Callable[[AbstractBaseUser], tuple[int, int, int]]:
+    """
+    Return a function reading a user's task counter as the total, completed
+    and archived counts, zeros without a counter.
+    """
+
+    def counts(user: AbstractBaseUser) -> tuple[int, int, int]:
+        counter = TaskCounter.objects.filter(owner=user).first()
+        if counter is None:
+            return 0, 0, 0
+        return counter.total, counter.completed, counter.archived
+
+    return counts
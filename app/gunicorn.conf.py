@@ -0,0 +1,25 @@
+"""
+Gunicorn settings, loaded from the working directory.
+
+Server options are passed on the command line, the hooks here maintain the
+Prometheus multiprocess directory, see api/metrics.py.
+"""
+
+import os
+from pathlib import Path
+
+
+def on_starting(server):
+    # Samples left by a previous run would be added to the new ones.
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        Path(path).mkdir(parents=True, exist_ok=True)
+        for samples in Path(path).glob("*.db"):
+            samples.unlink()
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
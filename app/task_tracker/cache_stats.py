@@ -0,0 +1,55 @@
+"""
+Hit and miss counting of the caches of the project.
+
+Lives outside the apps, as both the API's response cache and the users'
+authentication cache count their lookups. The ``cache_requests`` metric is
+served by the API's metrics view with all others.
+"""
+
+import threading
+
+from prometheus_client import Counter
+
+cache_requests = Counter(
+    "cache_requests",
+    "Cache lookups by cache and result, for hit ratios.",
+    ["cache", "result"],
+)
+
+
+class CacheStats:
+    """
+    Hit and miss counters of the current process.
+
+    Lookups are also counted in the ``cache_requests`` metric under ``name``,
+    which adds up all processes.
+    """
+
+    def __init__(self, name: str):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter = cache_requests.labels(cache=name, result="hit")
+        self._miss_counter = cache_requests.labels(cache=name, result="miss")
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        (self._hit_counter if hit else self._miss_counter).inc()
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
@@ -1,2 +1,18 @@
 TITLE_FIELD_MAX_LENGTH = 200
 SECONDS_IN_YEAR = 31536000
+MAX_PAGE_SIZE = 100
+SEARCH_CONFIG = "english"
+RESPONSE_CACHE_TIMEOUT = 300
+RESPONSE_CACHE_MAX_ENTRIES = 10000
+MAX_BULK_SIZE = 500
+AUTH_CACHE_TIMEOUT = 300
+AUTH_LOCAL_CACHE_TTL = 5
+AUTH_LOCAL_CACHE_MAX_ENTRIES = 1024
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 5000
+IMPORT_MAX_ERRORS = 100
+PAGINATION_COUNT_CAP = 10000
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+TASK_ARCHIVE_AFTER_DAYS = 180
+ARCHIVE_BATCH_SIZE = 1000
+USER_PURGE_BATCH_SIZE = 5000
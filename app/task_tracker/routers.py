@@ -0,0 +1,56 @@
+"""
+Routing of reads to read replicas.
+
+Nothing reads from a replica unless a view picks one for the request with
+``use_replica``, so admin pages, authentication and background jobs always
+see the default database. Writes always go to the default database, and the
+first write of a request sends its later reads there too, so a request
+reads its own writes.
+
+The alias is kept in a context variable, which follows the request into
+the threads its sync code runs in.
+
+Replicas may lag behind the task generation their reads are cached under,
+so nothing read from a replica is cached, or it could be served from the
+cache to later requests, on the primary too, after the user's pin expired.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+replica_alias: ContextVar[str | None] = ContextVar("replica_alias", default=None)
+
+
+def use_replica() -> str:
+    """Route the request's reads to a random replica."""
+    alias = random.choice(settings.DATABASE_REPLICAS)
+    replica_alias.set(alias)
+    return alias
+
+
+def use_primary() -> None:
+    replica_alias.set(None)
+
+
+def reads_replica() -> bool:
+    return replica_alias.get() is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # Also overrides the database an instance was loaded from, so objects
+        # read from a replica load their relations from the primary later.
+        return replica_alias.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        use_primary()
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -1,10 +1,15 @@
+import copy
 import datetime as dt
 import os
 from pathlib import Path
 
 import dotenv
 
-from task_tracker.constants import SECONDS_IN_YEAR
+from task_tracker.constants import (
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TIMEOUT,
+    SECONDS_IN_YEAR,
+)
 
 dotenv.load_dotenv()
 
@@ -27,6 +32,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django_filters",
     "rest_framework",
     "rest_framework_simplejwt",
@@ -36,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.timing.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -64,6 +71,11 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "task_tracker.wsgi.application"
 
+# Each worker process keeps a psycopg connection pool, so requests don't
+# connect to Postgres themselves. With DB_POOL=False, DB_CONN_MAX_AGE keeps
+# a connection per thread open between requests instead, which doesn't
+# suit ASGI, where sync code runs in changing threads.
+DB_POOL = os.getenv("DB_POOL", "True") == "True"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -72,9 +84,81 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
         "HOST": os.getenv("DB_HOST", ""),
         "PORT": os.getenv("DB_PORT", 5432),
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", 0)),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+                # Seconds to wait for a free connection before failing.
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+                "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+                "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", 3600)),
+            }
+        }
+        if DB_POOL
+        else {},
     }
 }
 
+# Streaming replicas of the default database, as comma-separated host or
+# host:port. Task reads are spread over them, see task_tracker.routers. A
+# user's reads stay on the primary for REPLICA_PIN_SECONDS after they write,
+# which has to cover the replication lag.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1
+):
+    host, _, port = replica.strip().partition(":")
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        # Tests read the primary's test database through replicas.
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["task_tracker.routers.ReplicaRouter"]
+REPLICA_PIN_SECONDS = float(os.getenv("REPLICA_PIN_SECONDS", 5))
+
+# Local memory is per process and meant for development and tests, set
+# REDIS_URL to share the cache between workers. Redis evicts keys with
+# its own maxmemory-policy, allkeys-lru is expected.
+REDIS_URL = os.getenv("REDIS_URL")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "TIMEOUT": RESPONSE_CACHE_TIMEOUT,
+    }
+    if REDIS_URL
+    else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "TIMEOUT": RESPONSE_CACHE_TIMEOUT,
+        "OPTIONS": {"MAX_ENTRIES": RESPONSE_CACHE_MAX_ENTRIES},
+    }
+}
+
+AUTHENTICATION_BACKENDS = ["users.backends.PooledHashingModelBackend"]
+
+# The preferred hasher comes first, the others still verify older hashes,
+# which are upgraded on login.
+_PASSWORD_HASHERS = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "pbkdf2_sha1": "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+}
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS.pop(os.getenv("PASSWORD_HASHER", "pbkdf2")),
+    *_PASSWORD_HASHERS.values(),
+]
+# Threads hashing passwords per process, and how many sign-ups and logins
+# may wait for them before the rest get 503.
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", 1))
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv("PASSWORD_HASHING_MAX_PENDING", 8))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -103,9 +187,12 @@ STATIC_ROOT = BASE_DIR / "static"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# JSON responses rendered with orjson instead of the standard library.
+ORJSON_RENDERER = os.getenv("ORJSON_RENDERER", "False") == "True"
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -113,10 +200,33 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "DEFAULT_RENDERER_CLASSES": [
+        (
+            "api.renderers.ORJSONRenderer"
+            if ORJSON_RENDERER
+            else "rest_framework.renderers.JSONRenderer"
+        ),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 AUTH_USER_MODEL = "users.CustomUser"
 
+# Share of requests timed by api.timing.RequestTimingMiddleware, 0 to 1.
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv("REQUEST_TIMING_SAMPLE_RATE", 1))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"message": {"format": "{message}", "style": "{"}},
+    "handlers": {
+        "timing": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "api.timing": {"handlers": ["timing"], "level": "INFO", "propagate": False},
+    },
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": dt.timedelta(days=1),
     "TOKEN_OBTAIN_SERIALIZER": "api.serializers.SimpleTokenObtainSerializer",
@@ -1,7 +1,14 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from api.health import healthz, readyz
+from api.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("api.urls")),
+    # Not routed by nginx, reachable from inside the deployment only.
+    path("metrics", metrics_view, name="metrics"),
+    path("healthz", healthz, name="healthz"),
+    path("readyz", readyz, name="readyz"),
 ]
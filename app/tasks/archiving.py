@@ -0,0 +1,133 @@
+"""
+Archival of old completed tasks.
+
+Completed tasks nobody looks at anymore are moved from the task table to
+``TaskArchive``, keeping the task table and its indexes down to the working
+set. Each batch moves an owner's tasks with a single statement in its own
+transaction, so locks and WAL stay bounded and the job can be interrupted
+and rerun at any time. Batches skip tasks locked by a write in progress,
+the next run picks them up.
+
+Archiving goes through the task table's triggers like any delete: the
+owner's counters move the tasks from ``total`` and ``completed`` to
+``archived``, and tombstones drop them from synced clients. Restoring a
+task moves it back with its id, as a completed task.
+"""
+
+import datetime as dt
+import time
+from collections.abc import Callable, Iterable
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from task_tracker.constants import ARCHIVE_BATCH_SIZE, TASK_ARCHIVE_AFTER_DAYS
+from tasks.cache import invalidate_user_tasks
+from tasks.models import Task, TaskArchive, TaskCounter
+
+TASK_TABLE = Task._meta.db_table
+ARCHIVE_TABLE = TaskArchive._meta.db_table
+COLUMNS = "id, title, description, created_at, updated_at, owner_id"
+
+# The owner's tasks are found through the owner-leading indexes, which also
+# keeps a partitioned task table to the owner's partition.
+ARCHIVE_BATCH_SQL = f"""
+    WITH batch AS (
+        SELECT id FROM {TASK_TABLE}
+        WHERE owner_id = %(owner_id)s AND completed AND updated_at < %(cutoff)s
+        ORDER BY updated_at
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+    ), moved AS (
+        DELETE FROM {TASK_TABLE} task USING batch
+        WHERE task.owner_id = %(owner_id)s AND task.id = batch.id
+        RETURNING task.id, task.title, task.description, task.created_at,
+            task.updated_at, task.owner_id
+    )
+    INSERT INTO {ARCHIVE_TABLE} ({COLUMNS}, archived_at)
+    SELECT {COLUMNS}, now() FROM moved
+"""
+
+RESTORE_SQL = f"""
+    WITH restored AS (
+        DELETE FROM {ARCHIVE_TABLE}
+        WHERE owner_id = %(owner_id)s AND id = ANY(%(ids)s)
+        RETURNING {COLUMNS}
+    )
+    INSERT INTO {TASK_TABLE} ({COLUMNS}, completed) OVERRIDING SYSTEM VALUE
+    SELECT {COLUMNS}, true FROM restored
+    RETURNING id
+"""
+
+
+def archive_cutoff(older_than: dt.timedelta | None = None) -> dt.datetime:
+    if older_than is None:
+        older_than = dt.timedelta(days=TASK_ARCHIVE_AFTER_DAYS)
+    return timezone.now() - older_than
+
+
+def archive_owner_tasks(
+    owner_id: int, cutoff: dt.datetime, batch_size: int = ARCHIVE_BATCH_SIZE
+) -> int:
+    """
+    Archive a batch of the owner's completed tasks last updated before
+    ``cutoff`` and return the number archived.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            ARCHIVE_BATCH_SQL,
+            {"owner_id": owner_id, "cutoff": cutoff, "limit": batch_size},
+        )
+        archived = cursor.rowcount
+        if archived:
+            invalidate_user_tasks(owner_id)
+    return archived
+
+
+def archive_tasks(
+    older_than: dt.timedelta | None = None,
+    batch_size: int | None = None,
+    progress: Callable[[int, float], None] | None = None,
+) -> int:
+    """
+    Archive completed tasks last updated longer than ``older_than`` ago,
+    ``TASK_ARCHIVE_AFTER_DAYS`` by default, and return the number archived.
+
+    Owners are visited in order, only those with completed tasks according
+    to their counters. ``progress`` is called with the number of tasks
+    archived so far and the tasks per second after every batch.
+    """
+    cutoff = archive_cutoff(older_than)
+    batch_size = batch_size or ARCHIVE_BATCH_SIZE
+    owner_ids = (
+        TaskCounter.objects.filter(completed__gt=0)
+        .order_by("owner_id")
+        .values_list("owner_id", flat=True)
+        .iterator()
+    )
+    started = time.perf_counter()
+    archived = 0
+    for owner_id in owner_ids:
+        while True:
+            moved = archive_owner_tasks(owner_id, cutoff, batch_size)
+            if not moved:
+                break
+            archived += moved
+            if progress is not None:
+                progress(archived, archived / (time.perf_counter() - started))
+            if moved < batch_size:
+                break
+    return archived
+
+
+def restore_tasks(owner_id: int, ids: Iterable[int]) -> set[int]:
+    """
+    Move the owner's archived tasks among ``ids`` back to the task table and
+    return the ids restored.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(RESTORE_SQL, {"owner_id": owner_id, "ids": list(ids)})
+        restored = {pk for (pk,) in cursor.fetchall()}
+        if restored:
+            invalidate_user_tasks(owner_id)
+    return restored
@@ -0,0 +1,72 @@
+"""
+Per-user task generation counters and primary pins.
+
+Cached task responses are keyed by the owner's current generation, so
+bumping the counter invalidates all of them at once without looking up or
+deleting any keys. Stale entries are left to the cache's TTL and eviction.
+
+Writes also pin the owner's reads to the primary database for
+``REPLICA_PIN_SECONDS``, so they aren't served from a replica that hasn't
+replayed the write yet.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+
+def generation_key(user_id: int) -> str:
+    return f"tasks:generation:{user_id}"
+
+
+def get_task_generation(user_id: int) -> int:
+    # A counter lost to eviction restarts from the clock, so it never goes
+    # back to a generation that still has cached responses.
+    return cache.get_or_set(generation_key(user_id), time.time_ns, timeout=None)
+
+
+async def aget_task_generation(user_id: int) -> int:
+    return await cache.aget_or_set(generation_key(user_id), time.time_ns, timeout=None)
+
+
+def bump_task_generation(user_id: int) -> None:
+    key = generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def primary_pin_key(user_id: int) -> str:
+    return f"tasks:primary-pin:{user_id}"
+
+
+def pin_to_primary(user_id: int) -> None:
+    if settings.DATABASE_REPLICAS:
+        cache.set(primary_pin_key(user_id), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user_id: int) -> bool:
+    return cache.get(primary_pin_key(user_id), False)
+
+
+def _tasks_written(user_id: int) -> None:
+    bump_task_generation(user_id)
+    pin_to_primary(user_id)
+
+
+def invalidate_user_tasks(user_id: int) -> None:
+    """
+    Invalidate cached task responses of a user and pin their reads to the
+    primary database.
+
+    Runs right away and, inside a transaction, once more after commit, so
+    responses cached from the pre-commit data in the meantime are dropped,
+    and the pin lasts from the moment replicas can start replaying the
+    write.
+    """
+    _tasks_written(user_id)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _tasks_written(user_id))
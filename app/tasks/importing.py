@@ -0,0 +1,231 @@
+"""
+Bulk import of tasks from NDJSON or CSV.
+
+Rows are validated against the task model fields a batch at a time. Valid
+rows of a batch are copied with ``COPY`` into a temporary staging table and
+moved to the task table with a single ``INSERT ... SELECT``. The progress of
+the ``TaskImport`` is saved in the same transaction, so an interrupted
+import resumes from the first row that wasn't committed when the same
+source is sent again. Invalid rows are skipped and counted, the first
+``IMPORT_MAX_ERRORS`` of them are kept with their errors.
+"""
+
+import csv
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import ProhibitNullCharactersValidator
+from django.db import connection, transaction
+from django.utils import timezone
+
+from task_tracker.constants import IMPORT_BATCH_SIZE, IMPORT_MAX_ERRORS
+from tasks.cache import invalidate_user_tasks
+from tasks.models import Task, TaskImport
+
+IMPORT_FIELDS = ("title", "description", "completed", "created_at", "updated_at")
+FIELDS = {name: Task._meta.get_field(name) for name in IMPORT_FIELDS}
+BOOLEAN_VALUES = {
+    "true": True,
+    "t": True,
+    "1": True,
+    "false": False,
+    "f": False,
+    "0": False,
+}
+
+STAGING_TABLE = "task_import_staging"
+CREATE_STAGING_SQL = f"""
+    CREATE TEMPORARY TABLE {STAGING_TABLE} (
+        title text,
+        description text,
+        completed boolean,
+        created_at timestamptz,
+        updated_at timestamptz
+    ) ON COMMIT DROP
+"""
+COPY_SQL = f"COPY {STAGING_TABLE} ({', '.join(IMPORT_FIELDS)}) FROM STDIN"
+INSERT_SQL = f"""
+    INSERT INTO {Task._meta.db_table} (owner_id, {", ".join(IMPORT_FIELDS)})
+    SELECT %s, {", ".join(IMPORT_FIELDS)} FROM {STAGING_TABLE}
+"""
+
+
+class ImportConflict(Exception):
+    """The import was advanced by someone else since it was read."""
+
+
+class RowError(ValueError):
+    """A source row that couldn't be parsed."""
+
+
+def parse_ndjson(stream: Iterable[bytes]) -> Iterator[dict | RowError]:
+    """Parse an object per line, blank lines are skipped."""
+    for line in stream:
+        try:
+            line = line.decode("utf-8")
+        except UnicodeDecodeError:
+            yield RowError("Not valid UTF-8.")
+            continue
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield RowError(f"Invalid JSON: {exc.msg}.")
+
+
+def parse_csv(stream: Iterable[bytes]) -> Iterator[dict | RowError]:
+    """Parse rows of a CSV file with a header of field names."""
+    invalid_lines = set()
+
+    def lines():
+        for number, line in enumerate(stream, start=1):
+            try:
+                yield line.decode("utf-8")
+            except UnicodeDecodeError:
+                invalid_lines.add(number)
+                yield line.decode("utf-8", "replace")
+
+    reader = csv.DictReader(lines())
+    last_line = 0
+    for row in reader:
+        # Quoted values can span lines, so a row covers all lines read for it.
+        lines_read = range(last_line + 1, reader.line_num + 1)
+        last_line = reader.line_num
+        if invalid_lines.intersection(lines_read):
+            yield RowError("Not valid UTF-8.")
+        else:
+            yield row
+
+
+PARSERS = {TaskImport.Format.NDJSON: parse_ndjson, TaskImport.Format.CSV: parse_csv}
+
+
+prohibit_null_characters = ProhibitNullCharactersValidator()
+
+
+def clean_value(name: str, value):
+    field = FIELDS[name]
+    if name == "completed" and isinstance(value, str):
+        value = BOOLEAN_VALUES.get(value.strip().lower(), value)
+    value = field.clean(value, None)
+    if isinstance(value, str):
+        prohibit_null_characters(value)
+    elif field.get_internal_type() == "DateTimeField" and timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.get_default_timezone())
+    return value
+
+
+def clean_row(data, now) -> tuple:
+    """
+    Validate a row against the task fields and return its values in the
+    order of ``IMPORT_FIELDS``. Missing optional fields get their default,
+    other fields, such as the ``id`` and ``owner`` of exported tasks, are
+    ignored.
+    """
+    if isinstance(data, RowError):
+        raise ValidationError(str(data))
+    if not isinstance(data, dict):
+        raise ValidationError("Expected an object.")
+
+    defaults = {"description": "", "completed": False, "created_at": now}
+    values, errors = {}, {}
+    for name in IMPORT_FIELDS:
+        value = data.get(name)
+        if value in (None, "") and name != "title":
+            # Defaults are valid as they are. Tasks are last updated when
+            # created unless told otherwise.
+            values[name] = defaults.get(name, values.get("created_at"))
+            continue
+        try:
+            values[name] = clean_value(name, value)
+        except ValidationError as exc:
+            errors[name] = exc.messages
+    if errors:
+        raise ValidationError(errors)
+    return tuple(values[name] for name in IMPORT_FIELDS)
+
+
+def describe(exc: ValidationError) -> dict[str, list[str]]:
+    if hasattr(exc, "error_dict"):
+        return exc.message_dict
+    return {"non_field_errors": exc.messages}
+
+
+def copy_tasks(owner_id: int, rows: list[tuple]):
+    """Load rows of ``IMPORT_FIELDS`` values through the staging table."""
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_STAGING_SQL)
+        with cursor.copy(COPY_SQL) as copy:
+            for row in rows:
+                copy.write_row(row)
+        cursor.execute(INSERT_SQL, [owner_id])
+        # Dropped right away in case of an enclosing transaction.
+        cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+
+
+def import_tasks(
+    task_import: TaskImport,
+    stream: Iterable[bytes],
+    batch_size: int | None = None,
+    progress: Callable[[TaskImport, float], None] | None = None,
+) -> TaskImport:
+    """
+    Import the tasks of ``stream`` and return the updated ``task_import``.
+
+    Rows the import already processed are skipped, so an interrupted import
+    continues when given the same source again. ``progress`` is called with
+    the import and its rows per second after every batch.
+
+    Raises ``ImportConflict`` if the import progressed elsewhere meanwhile.
+    """
+    rows = enumerate(PARSERS[task_import.format](stream), start=1)
+    rows = islice(rows, task_import.processed, None)
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    started = time.perf_counter()
+    processed = 0
+    while batch := list(islice(rows, batch_size)):
+        now = timezone.now()
+        valid, errors = [], []
+        for number, data in batch:
+            try:
+                valid.append(clean_row(data, now))
+            except ValidationError as exc:
+                errors.append({"row": number, "errors": describe(exc)})
+
+        with transaction.atomic():
+            committed = (
+                TaskImport.objects.select_for_update()
+                .values_list("processed", flat=True)
+                .get(pk=task_import.pk)
+            )
+            if committed != task_import.processed:
+                raise ImportConflict(str(task_import.pk))
+            if valid:
+                copy_tasks(task_import.owner_id, valid)
+                invalidate_user_tasks(task_import.owner_id)
+            task_import.processed += len(batch)
+            task_import.imported += len(valid)
+            task_import.failed += len(errors)
+            room = IMPORT_MAX_ERRORS - len(task_import.errors)
+            task_import.errors += errors[: max(room, 0)]
+            task_import.save(
+                update_fields=[
+                    "processed",
+                    "imported",
+                    "failed",
+                    "errors",
+                    "updated_at",
+                ]
+            )
+
+        processed += len(batch)
+        if progress is not None:
+            progress(task_import, processed / (time.perf_counter() - started))
+
+    if task_import.finished_at is None:
+        task_import.finished_at = timezone.now()
+        task_import.save(update_fields=["finished_at", "updated_at"])
+    return task_import
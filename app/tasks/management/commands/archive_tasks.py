@@ -0,0 +1,41 @@
+import datetime as dt
+
+from django.core.management.base import BaseCommand
+
+from task_tracker.constants import ARCHIVE_BATCH_SIZE, TASK_ARCHIVE_AFTER_DAYS
+from tasks.archiving import archive_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed tasks not updated for --older-than days to the archive, "
+        "in batches. Safe to interrupt and rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=TASK_ARCHIVE_AFTER_DAYS,
+            metavar="DAYS",
+            help=f"Age in days, {TASK_ARCHIVE_AFTER_DAYS} by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help=f"Tasks per transaction, {ARCHIVE_BATCH_SIZE} by default.",
+        )
+
+    def report(self, archived: int, tasks_per_second: float):
+        self.stdout.write(
+            f"{archived:,} tasks archived ({tasks_per_second:,.0f} tasks/s)"
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_tasks(
+            older_than=dt.timedelta(days=options["older_than"]),
+            batch_size=options["batch_size"],
+            progress=self.report if options["verbosity"] > 0 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived:,} tasks."))
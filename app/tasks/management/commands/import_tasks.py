@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from task_tracker.constants import IMPORT_BATCH_SIZE
+from tasks.importing import ImportConflict, import_tasks
+from tasks.models import TaskImport
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks for a user from an NDJSON or CSV file. "
+        "Run again with --resume to continue an interrupted import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, - for stdin.")
+        parser.add_argument(
+            "--owner", required=True, help="Email or id of the owning user."
+        )
+        parser.add_argument(
+            "--format",
+            choices=TaskImport.Format.values,
+            help="Format of the file, by default guessed from its extension.",
+        )
+        parser.add_argument("--resume", metavar="IMPORT_ID")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help=f"Rows per transaction, {IMPORT_BATCH_SIZE} by default.",
+        )
+
+    def get_owner(self, owner: str):
+        User = get_user_model()
+        lookup = {"pk": owner} if owner.isdigit() else {"email": owner}
+        try:
+            return User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"User {owner} not found.")
+
+    def get_import(self, options, owner) -> TaskImport:
+        if options["resume"]:
+            try:
+                return owner.imports.get(pk=options["resume"])
+            except (TaskImport.DoesNotExist, ValidationError):
+                raise CommandError(f"Import {options['resume']} not found.")
+        format = options["format"]
+        if format is None:
+            suffix = Path(options["path"]).suffix.lower()
+            format = (
+                TaskImport.Format.CSV if suffix == ".csv" else TaskImport.Format.NDJSON
+            )
+        return TaskImport.objects.create(owner=owner, format=format)
+
+    def report(self, task_import: TaskImport, rows_per_second: float):
+        self.stdout.write(
+            f"{task_import.processed:,} rows processed, "
+            f"{task_import.imported:,} imported, {task_import.failed:,} failed "
+            f"({rows_per_second:,.0f} rows/s)"
+        )
+
+    def handle(self, *args, **options):
+        owner = self.get_owner(options["owner"])
+        task_import = self.get_import(options, owner)
+        self.stdout.write(f"Import {task_import.pk} ({task_import.format})")
+        path = options["path"]
+        source = sys.stdin.buffer if path == "-" else open(path, "rb")
+        try:
+            with source:
+                import_tasks(
+                    task_import,
+                    source,
+                    batch_size=options["batch_size"],
+                    progress=self.report,
+                )
+        except ImportConflict:
+            raise CommandError(f"Import {task_import.pk} is running elsewhere.")
+        except KeyboardInterrupt:
+            raise CommandError(f"Interrupted, continue with --resume {task_import.pk}")
+
+        for error in task_import.errors:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        if task_import.failed > len(task_import.errors):
+            self.stderr.write(
+                f"... {task_import.failed - len(task_import.errors):,} more"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {task_import.imported:,} tasks, "
+                f"{task_import.failed:,} rows failed."
+            )
+        )
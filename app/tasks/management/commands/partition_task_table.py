@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.partitioning import (
+    DEFAULT_PARTITIONS,
+    PartitioningError,
+    partition_task_table,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert the task table into a table hash-partitioned by owner. Task "
+        "writes wait until it's done, run it in a maintenance window."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--partitions",
+            type=int,
+            default=DEFAULT_PARTITIONS,
+            help=f"Number of partitions, {DEFAULT_PARTITIONS} by default.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the statements without running them.",
+        )
+
+    def log(self, statement: str):
+        self.stderr.write(f"{time.strftime('%H:%M:%S')} {statement}")
+
+    def handle(self, *args, **options):
+        try:
+            statements = partition_task_table(
+                options["partitions"],
+                log=None if options["verbosity"] < 2 else self.log,
+                dry_run=options["dry_run"],
+            )
+        except PartitioningError as exc:
+            raise CommandError(str(exc))
+        if options["dry_run"]:
+            self.stdout.write(";\n".join(statements) + ";")
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Partitioned the task table into {options['partitions']} partitions."
+            )
+        )
@@ -0,0 +1,20 @@
+import datetime as dt
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from task_tracker.constants import SYNC_TOMBSTONE_RETENTION_DAYS
+from tasks.models import TaskTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete tombstones of deleted tasks that no valid sync cursor needs "
+        f"anymore, older than {SYNC_TOMBSTONE_RETENTION_DAYS} days."
+    )
+
+    def handle(self, *args, **options):
+        # A day of margin for cursors issued while older deletes committed.
+        cutoff = timezone.now() - dt.timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+        deleted, _ = TaskTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstones."))
@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.stats import prune_creation_counts, reconcile_owner
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the tasks of every user, or of --owner, and fix task counters "
+        "that drifted. Also prunes creation counts of hours no longer reported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--owner", help="Email or id of a single user.")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report drift without fixing it."
+        )
+
+    def get_owner_ids(self, owner: str | None):
+        User = get_user_model()
+        if owner is None:
+            return User.objects.order_by("pk").values_list("pk", flat=True).iterator()
+        lookup = {"pk": owner} if owner.isdigit() else {"email": owner}
+        try:
+            return [User.objects.values_list("pk", flat=True).get(**lookup)]
+        except User.DoesNotExist:
+            raise CommandError(f"User {owner} not found.")
+
+    def handle(self, *args, **options):
+        checked = drifted = 0
+        for owner_id in self.get_owner_ids(options["owner"]):
+            drift = reconcile_owner(owner_id, dry_run=options["dry_run"])
+            checked += 1
+            if drift:
+                drifted += 1
+                changes = ", ".join(
+                    f"{key}: {stored} -> {actual}"
+                    for key, (stored, actual) in drift.items()
+                )
+                self.stderr.write(f"User {owner_id}: {changes}")
+
+        if options["dry_run"]:
+            self.stdout.write(f"{drifted} of {checked} users have drifted counters.")
+            return
+        pruned = prune_creation_counts()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Fixed counters of {drifted} of {checked} users, "
+                f"pruned {pruned} creation counts."
+            )
+        )
@@ -0,0 +1,84 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+# Names of the single-column indexes created by 0001_initial.
+LEGACY_INDEXES = (
+    "tasks_task_created_at_0fbeae19",
+    "tasks_task_completed_22b5ad70",
+    "tasks_task_owner_id_db3dcc3e",
+)
+
+
+class Migration(migrations.Migration):
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "-created_at", "-id"],
+                name="task_owner_created_id_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "completed", "-created_at", "-id"],
+                name="task_owner_completed_id_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("completed", False)),
+                fields=["owner", "-created_at", "-id"],
+                name="task_owner_open_id_idx",
+            ),
+        ),
+        # The composite indexes above cover every lookup the single-column
+        # ones served, so drop them without locking the table.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="task",
+                    name="created_at",
+                    field=models.DateTimeField(auto_now_add=True),
+                ),
+                migrations.AlterField(
+                    model_name="task",
+                    name="completed",
+                    field=models.BooleanField(default=False),
+                ),
+                migrations.AlterField(
+                    model_name="task",
+                    name="owner",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tasks",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=f'DROP INDEX CONCURRENTLY IF EXISTS "{name}";',
+                    reverse_sql=(
+                        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+                        f'ON "tasks_task" ("{column}");'
+                    ),
+                )
+                for name, column in zip(
+                    LEGACY_INDEXES, ("created_at", "completed", "owner_id")
+                )
+            ],
+        ),
+    ]
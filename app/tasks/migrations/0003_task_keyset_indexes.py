@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # The owner-scoped indexes of 0002 already end in -id, which keyset
+    # pagination needs to break created_at ties.
+    dependencies = [
+        ("tasks", "0002_task_owner_scoped_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="task",
+            options={
+                "ordering": ["-created_at", "-id"],
+                "verbose_name": "Task",
+                "verbose_name_plural": "Tasks",
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.conf import settings
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    BtreeGinExtension,
+    TrigramExtension,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0003_task_keyset_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        BtreeGinExtension(),
+        TrigramExtension(),
+        # Adding a stored generated column rewrites the table once,
+        # schedule it in a maintenance window on large deployments.
+        migrations.AddField(
+            model_name="task",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.SearchVector(
+                        "title", config="english", weight="A"
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "description", config="english", weight="B"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("english"),
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["owner", "search_vector"], name="task_owner_search_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GinIndex(
+                models.F("owner"),
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"),
+                    name="gin_trgm_ops",
+                ),
+                name="task_owner_title_trgm_idx",
+            ),
+        ),
+    ]
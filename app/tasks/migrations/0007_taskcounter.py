@@ -0,0 +1,119 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Statement-level triggers count a whole bulk write or import at once, from
+# its transition table. Deletes only update existing counters, so deleting a
+# user doesn't recreate the counter the cascade just removed.
+COUNTER_TRIGGERS_SQL = """
+CREATE FUNCTION tasks_task_count_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskcounter AS counter (owner_id, total, completed)
+    SELECT owner_id, count(*), count(*) FILTER (WHERE completed)
+    FROM new_tasks
+    GROUP BY owner_id
+    ORDER BY owner_id
+    ON CONFLICT (owner_id) DO UPDATE SET
+        total = counter.total + excluded.total,
+        completed = counter.completed + excluded.completed;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_count_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskcounter AS counter (owner_id, total, completed)
+    SELECT owner_id, sum(total), sum(completed)
+    FROM (
+        SELECT owner_id, 1 AS total, completed::int AS completed FROM new_tasks
+        UNION ALL
+        SELECT owner_id, -1, -completed::int FROM old_tasks
+    ) AS changes
+    GROUP BY owner_id
+    -- Most updates don't change completion or owner, and write nothing.
+    HAVING sum(total) <> 0 OR sum(completed) <> 0
+    ORDER BY owner_id
+    ON CONFLICT (owner_id) DO UPDATE SET
+        total = counter.total + excluded.total,
+        completed = counter.completed + excluded.completed;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_count_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_taskcounter AS counter SET
+        total = counter.total - deleted.total,
+        completed = counter.completed - deleted.completed
+    FROM (
+        SELECT owner_id, count(*) AS total, count(*) FILTER (WHERE completed)
+            AS completed
+        FROM old_tasks
+        GROUP BY owner_id
+    ) AS deleted
+    WHERE counter.owner_id = deleted.owner_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER tasks_task_count_insert AFTER INSERT ON tasks_task
+    REFERENCING NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_count_insert();
+CREATE TRIGGER tasks_task_count_update AFTER UPDATE ON tasks_task
+    REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_count_update();
+CREATE TRIGGER tasks_task_count_delete AFTER DELETE ON tasks_task
+    REFERENCING OLD TABLE AS old_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_count_delete();
+
+-- Creating the triggers locked out writers, so the counts can't drift
+-- until the migration commits.
+INSERT INTO tasks_taskcounter (owner_id, total, completed)
+SELECT owner_id, count(*), count(*) FILTER (WHERE completed)
+FROM tasks_task
+GROUP BY owner_id;
+"""
+
+DROP_COUNTER_TRIGGERS_SQL = """
+DROP TRIGGER tasks_task_count_insert ON tasks_task;
+DROP TRIGGER tasks_task_count_update ON tasks_task;
+DROP TRIGGER tasks_task_count_delete ON tasks_task;
+DROP FUNCTION tasks_task_count_insert();
+DROP FUNCTION tasks_task_count_update();
+DROP FUNCTION tasks_task_count_delete();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0006_taskimport"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskCounter",
+            fields=[
+                (
+                    "owner",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="task_counter",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("total", models.BigIntegerField(default=0)),
+                ("completed", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Task counter",
+                "verbose_name_plural": "Task counters",
+            },
+        ),
+        migrations.RunSQL(COUNTER_TRIGGERS_SQL, DROP_COUNTER_TRIGGERS_SQL),
+    ]
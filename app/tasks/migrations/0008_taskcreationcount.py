@@ -0,0 +1,133 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Tasks are counted per owner and hour of creation, for tasks created in the
+# last 8 days, which leaves a margin over the week reported by task stats.
+# The triggers are named to fire after the TaskCounter ones, so writers and
+# the reconcile command lock the counter row first.
+CREATION_TRIGGERS_SQL = """
+CREATE FUNCTION tasks_task_created_count_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskcreationcount AS bucket (owner_id, hour, count)
+    SELECT owner_id, date_trunc('hour', created_at, 'UTC'), count(*)
+    FROM new_tasks
+    WHERE created_at >= now() - interval '8 days'
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (owner_id, hour) DO UPDATE SET
+        count = bucket.count + excluded.count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_created_count_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskcreationcount AS bucket (owner_id, hour, count)
+    SELECT owner_id, date_trunc('hour', created_at, 'UTC'), sum(count)
+    FROM (
+        SELECT owner_id, created_at, 1 AS count FROM new_tasks
+        UNION ALL
+        SELECT owner_id, created_at, -1 FROM old_tasks
+    ) AS changes
+    WHERE created_at >= now() - interval '8 days'
+    GROUP BY 1, 2
+    -- Only moves to another owner or creation time write anything.
+    HAVING sum(count) <> 0
+    ORDER BY 1, 2
+    ON CONFLICT (owner_id, hour) DO UPDATE SET
+        count = bucket.count + excluded.count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_created_count_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_taskcreationcount AS bucket SET
+        count = bucket.count - deleted.count
+    FROM (
+        SELECT owner_id, date_trunc('hour', created_at, 'UTC') AS hour,
+            count(*) AS count
+        FROM old_tasks
+        WHERE created_at >= now() - interval '8 days'
+        GROUP BY 1, 2
+    ) AS deleted
+    WHERE bucket.owner_id = deleted.owner_id AND bucket.hour = deleted.hour;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER tasks_task_created_count_insert AFTER INSERT ON tasks_task
+    REFERENCING NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_created_count_insert();
+CREATE TRIGGER tasks_task_created_count_update AFTER UPDATE ON tasks_task
+    REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_created_count_update();
+CREATE TRIGGER tasks_task_created_count_delete AFTER DELETE ON tasks_task
+    REFERENCING OLD TABLE AS old_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_created_count_delete();
+
+INSERT INTO tasks_taskcreationcount (owner_id, hour, count)
+SELECT owner_id, date_trunc('hour', created_at, 'UTC'), count(*)
+FROM tasks_task
+WHERE created_at >= now() - interval '8 days'
+GROUP BY 1, 2;
+"""
+
+DROP_CREATION_TRIGGERS_SQL = """
+DROP TRIGGER tasks_task_created_count_insert ON tasks_task;
+DROP TRIGGER tasks_task_created_count_update ON tasks_task;
+DROP TRIGGER tasks_task_created_count_delete ON tasks_task;
+DROP FUNCTION tasks_task_created_count_insert();
+DROP FUNCTION tasks_task_created_count_update();
+DROP FUNCTION tasks_task_created_count_delete();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0007_taskcounter"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskCreationCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("count", models.BigIntegerField(default=0)),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Task creation count",
+                "verbose_name_plural": "Task creation counts",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("owner", "hour"),
+                        name="task_creation_owner_hour_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(CREATION_TRIGGERS_SQL, DROP_CREATION_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,120 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Every task write takes the next value of tasks_task_change_seq, and so does
+# the tombstone of every deleted task and of a task moved to another owner.
+# Writers first take a transaction-level advisory lock on the owner, so an
+# owner's changes commit in the order of their values and a reader never
+# sees a change while an earlier one of the same owner is still pending.
+# The lock is keyed by 'task' (0x7461736b) and a hash of the owner id.
+CHANGE_TRIGGERS_SQL = """
+CREATE SEQUENCE tasks_task_change_seq;
+
+CREATE FUNCTION tasks_task_lock_owner(owner_id bigint) RETURNS void
+LANGUAGE sql AS $$
+    SELECT pg_advisory_xact_lock(1952543595, hashint8(owner_id));
+$$;
+
+CREATE FUNCTION tasks_task_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.owner_id <> OLD.owner_id THEN
+        PERFORM tasks_task_lock_owner(least(NEW.owner_id, OLD.owner_id));
+        PERFORM tasks_task_lock_owner(greatest(NEW.owner_id, OLD.owner_id));
+        INSERT INTO tasks_tasktombstone (task_id, owner_id, change_seq, deleted_at)
+        VALUES (OLD.id, OLD.owner_id, nextval('tasks_task_change_seq'), now());
+    ELSE
+        PERFORM tasks_task_lock_owner(NEW.owner_id);
+    END IF;
+    NEW.change_seq := nextval('tasks_task_change_seq');
+    RETURN NEW;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_tombstone() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM tasks_task_lock_owner(owner_id)
+    FROM (SELECT DISTINCT owner_id FROM old_tasks ORDER BY owner_id) AS owners;
+    INSERT INTO tasks_tasktombstone (task_id, owner_id, change_seq, deleted_at)
+    SELECT id, owner_id, nextval('tasks_task_change_seq'), now()
+    FROM old_tasks
+    ORDER BY id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER tasks_task_change BEFORE INSERT OR UPDATE ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_change();
+CREATE TRIGGER tasks_task_tombstone AFTER DELETE ON tasks_task
+    REFERENCING OLD TABLE AS old_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_tombstone();
+"""
+
+DROP_CHANGE_TRIGGERS_SQL = """
+DROP TRIGGER tasks_task_change ON tasks_task;
+DROP TRIGGER tasks_task_tombstone ON tasks_task;
+DROP FUNCTION tasks_task_change();
+DROP FUNCTION tasks_task_tombstone();
+DROP FUNCTION tasks_task_lock_owner(bigint);
+DROP SEQUENCE tasks_task_change_seq;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0008_taskcreationcount"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Existing tasks keep 0 and are ordered by id among themselves, so
+        # the table isn't rewritten.
+        migrations.AddField(
+            model_name="task",
+            name="change_seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="TaskTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_id", models.BigIntegerField()),
+                ("change_seq", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField()),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Task tombstone",
+                "verbose_name_plural": "Task tombstones",
+                "indexes": [
+                    models.Index(
+                        fields=["owner", "change_seq"],
+                        name="tombstone_owner_change_seq_idx",
+                    ),
+                    models.Index(
+                        fields=["deleted_at"], name="tombstone_deleted_at_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(CHANGE_TRIGGERS_SQL, DROP_CHANGE_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,169 @@
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Archived tasks are counted per owner like live ones. They are only ever
+# inserted and deleted, moving between the task table and the archive.
+ARCHIVE_COUNTER_TRIGGERS_SQL = """
+CREATE FUNCTION tasks_taskarchive_count_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskcounter AS counter (owner_id, total, completed, archived)
+    SELECT owner_id, 0, 0, count(*)
+    FROM new_archived
+    GROUP BY owner_id
+    ORDER BY owner_id
+    ON CONFLICT (owner_id) DO UPDATE SET
+        archived = counter.archived + excluded.archived;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_taskarchive_count_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_taskcounter AS counter SET
+        archived = counter.archived - deleted.archived
+    FROM (
+        SELECT owner_id, count(*) AS archived FROM old_archived GROUP BY owner_id
+    ) AS deleted
+    WHERE counter.owner_id = deleted.owner_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER tasks_taskarchive_count_insert AFTER INSERT ON tasks_taskarchive
+    REFERENCING NEW TABLE AS new_archived
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskarchive_count_insert();
+CREATE TRIGGER tasks_taskarchive_count_delete AFTER DELETE ON tasks_taskarchive
+    REFERENCING OLD TABLE AS old_archived
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskarchive_count_delete();
+"""
+
+DROP_ARCHIVE_COUNTER_TRIGGERS_SQL = """
+DROP TRIGGER tasks_taskarchive_count_insert ON tasks_taskarchive;
+DROP TRIGGER tasks_taskarchive_count_delete ON tasks_taskarchive;
+DROP FUNCTION tasks_taskarchive_count_insert();
+DROP FUNCTION tasks_taskarchive_count_delete();
+"""
+
+# A UNION ALL of simple selects, which the planner flattens, so filters on
+# the owner reach both tables' indexes and ordered pages merge them.
+WITH_ARCHIVE_VIEW_SQL = """
+CREATE VIEW tasks_task_with_archive AS
+SELECT id, title, description, created_at, updated_at, completed,
+    false AS archived, owner_id, search_vector
+FROM tasks_task
+UNION ALL
+SELECT id, title, description, created_at, updated_at, true,
+    true, owner_id, search_vector
+FROM tasks_taskarchive;
+"""
+
+DROP_WITH_ARCHIVE_VIEW_SQL = "DROP VIEW tasks_task_with_archive;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0010_task_owner_change_seq_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskcounter",
+            name="archived",
+            field=models.BigIntegerField(db_default=0, default=0),
+        ),
+        migrations.CreateModel(
+            name="TaskArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=200)),
+                ("description", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "search_vector",
+                    models.GeneratedField(
+                        db_persist=True,
+                        expression=django.contrib.postgres.search.CombinedSearchVector(
+                            django.contrib.postgres.search.SearchVector(
+                                "title", config="english", weight="A"
+                            ),
+                            "||",
+                            django.contrib.postgres.search.SearchVector(
+                                "description", config="english", weight="B"
+                            ),
+                            django.contrib.postgres.search.SearchConfig("english"),
+                        ),
+                        output_field=django.contrib.postgres.search.SearchVectorField(),
+                    ),
+                ),
+                ("archived_at", models.DateTimeField()),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived task",
+                "verbose_name_plural": "Archived tasks",
+                "ordering": ["-created_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["owner", "-created_at", "-id"],
+                        name="task_archive_owner_created_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            ARCHIVE_COUNTER_TRIGGERS_SQL, DROP_ARCHIVE_COUNTER_TRIGGERS_SQL
+        ),
+        migrations.CreateModel(
+            name="TaskWithArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200)),
+                ("description", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("completed", models.BooleanField()),
+                ("archived", models.BooleanField()),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="tasks_with_archive",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(),
+                ),
+            ],
+            options={
+                "db_table": "tasks_task_with_archive",
+                "ordering": ["-created_at", "-id"],
+                "managed": False,
+            },
+        ),
+        migrations.RunSQL(WITH_ARCHIVE_VIEW_SQL, DROP_WITH_ARCHIVE_VIEW_SQL),
+    ]
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import migrations
+
+# Purging a deleted user's tasks sets tasks.skip_tombstones for its
+# transactions, nobody syncs the user's tasks anymore (see users.deletion).
+TOMBSTONE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tasks_task_tombstone() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('tasks.skip_tombstones', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    PERFORM tasks_task_lock_owner(owner_id)
+    FROM (SELECT DISTINCT owner_id FROM old_tasks ORDER BY owner_id) AS owners;
+    INSERT INTO tasks_tasktombstone (task_id, owner_id, change_seq, deleted_at)
+    SELECT id, owner_id, nextval('tasks_task_change_seq'), now()
+    FROM old_tasks
+    ORDER BY id;
+    RETURN NULL;
+END;
+$$;
+"""
+
+PREVIOUS_TOMBSTONE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tasks_task_tombstone() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM tasks_task_lock_owner(owner_id)
+    FROM (SELECT DISTINCT owner_id FROM old_tasks ORDER BY owner_id) AS owners;
+    INSERT INTO tasks_tasktombstone (task_id, owner_id, change_seq, deleted_at)
+    SELECT id, owner_id, nextval('tasks_task_change_seq'), now()
+    FROM old_tasks
+    ORDER BY id;
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0011_taskarchive"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(TOMBSTONE_FUNCTION_SQL, PREVIOUS_TOMBSTONE_FUNCTION_SQL),
+    ]
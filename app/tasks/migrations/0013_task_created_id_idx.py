@@ -0,0 +1,41 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class AddTaskIndex(AddIndexConcurrently):
+    """
+    Build the index concurrently, or with a plain CREATE INDEX on a
+    partitioned task table, where it can't be built concurrently.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relkind FROM pg_class WHERE oid = %s::regclass",
+                [model._meta.db_table],
+            )
+            (relkind,) = cursor.fetchone()
+        if relkind == "p":
+            schema_editor.add_index(model, self.index)
+        else:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0012_task_tombstone_skip"),
+    ]
+
+    operations = [
+        AddTaskIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="task_created_id_idx",
+            ),
+        ),
+    ]
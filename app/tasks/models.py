@@ -1,25 +1,331 @@
+import uuid
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import connection, models
+from django.db.models.functions import Upper
 
-from task_tracker.constants import TITLE_FIELD_MAX_LENGTH
+from task_tracker.constants import SEARCH_CONFIG, TITLE_FIELD_MAX_LENGTH
 
 User = get_user_model()
 
 
+def task_search_vector() -> models.GeneratedField:
+    # Full-text document with title matches weighted above description ones.
+    return models.GeneratedField(
+        expression=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+
+class TaskManager(models.Manager):
+    def get_queryset(self):
+        # The search document is only needed inside search queries.
+        return super().get_queryset().defer("search_vector")
+
+    def delete_owned(self, owner_id: int, ids: list[int]) -> set[int]:
+        """
+        Delete the owner's tasks among ``ids`` with a single statement and
+        return the ids actually deleted. Unlike ``QuerySet.delete()`` nothing
+        is fetched beforehand and no delete signals are sent.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.model._meta.db_table} "
+                "WHERE owner_id = %s AND id = ANY(%s) RETURNING id",
+                [owner_id, list(ids)],
+            )
+            return {pk for (pk,) in cursor.fetchall()}
+
+
 class Task(models.Model):
     """Model representing a task in the task tracker application."""
 
     title = models.CharField(max_length=TITLE_FIELD_MAX_LENGTH)
     description = models.TextField(blank=True, default="")
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    completed = models.BooleanField(default=False, db_index=True)
-    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tasks")
+    completed = models.BooleanField(default=False)
+    # Position of the task's last write among all changes, for delta sync.
+    # Assigned by a trigger on every insert and update (see migration 0009),
+    # tasks from before it keep 0.
+    change_seq = models.BigIntegerField(default=0, editable=False)
+    # Every lookup goes through the owner, so the FK is covered by the
+    # composite indexes below instead of a standalone one.
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="tasks",
+        db_index=False,
+    )
+    search_vector = task_search_vector()
+
+    objects = TaskManager()
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            # Default task list: owner's tasks, newest first. The id breaks
+            # timestamp ties for stable keyset pagination.
+            models.Index(
+                fields=["owner", "-created_at", "-id"],
+                name="task_owner_created_id_idx",
+            ),
+            # Admin changelist: everyone's tasks, newest first, paged by
+            # keyset. Filtered and searched lists are scanned along it too.
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="task_created_id_idx",
+            ),
+            # Task list filtered by completion status.
+            models.Index(
+                fields=["owner", "completed", "-created_at", "-id"],
+                name="task_owner_completed_id_idx",
+            ),
+            # Open tasks are the hot working set, keep them in a small index.
+            models.Index(
+                fields=["owner", "-created_at", "-id"],
+                condition=models.Q(completed=False),
+                name="task_owner_open_id_idx",
+            ),
+            # Covers max(updated_at) of the list validators with an
+            # index-only scan.
+            models.Index(
+                fields=["owner", "updated_at"],
+                name="task_owner_updated_idx",
+            ),
+            # Delta sync: the owner's changes in the order they were made.
+            models.Index(
+                fields=["owner", "change_seq", "id"],
+                name="task_owner_change_seq_idx",
+            ),
+            # Search: owner-scoped full-text and trigram indexes, the owner
+            # column is indexed via btree_gin so it prunes inside the index.
+            GinIndex(
+                fields=["owner", "search_vector"],
+                name="task_owner_search_idx",
+            ),
+            GinIndex(
+                models.F("owner"),
+                OpClass(Upper("title"), name="gin_trgm_ops"),
+                name="task_owner_title_trgm_idx",
+            ),
+        ]
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
 
     def __str__(self) -> str:
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so that moving a task to another owner can invalidate
+        # the previous owner's cached responses as well.
+        instance._loaded_owner_id = instance.__dict__.get("owner_id")
+        return instance
+
+
+class TaskArchive(models.Model):
+    """
+    A completed task moved out of the task table by ``archive_tasks`` (see
+    ``tasks.archiving``), keeping its id. Archived tasks are completed by
+    definition and never change, writing to one restores it to the task
+    table first.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=TITLE_FIELD_MAX_LENGTH)
+    description = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    search_vector = task_search_vector()
+    archived_at = models.DateTimeField()
+
+    objects = TaskManager()
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            # Lists merge the owner's archived tasks with their live ones in
+            # the same order. Searches scan the owner's archived tasks.
+            models.Index(
+                fields=["owner", "-created_at", "-id"],
+                name="task_archive_owner_created_idx",
+            ),
+        ]
+        verbose_name = "Archived task"
+        verbose_name_plural = "Archived tasks"
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class TaskWithArchive(models.Model):
+    """
+    Live and archived tasks together, read from a ``UNION ALL`` view (see
+    migration 0011). Postgres merges the two sides' owner-scoped indexes, so
+    pages come out in order without sorting either table.
+    """
+
+    title = models.CharField(max_length=TITLE_FIELD_MAX_LENGTH)
+    description = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    completed = models.BooleanField()
+    archived = models.BooleanField()
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="tasks_with_archive",
+    )
+    search_vector = SearchVectorField()
+
+    objects = TaskManager()
+
+    class Meta:
+        managed = False
+        db_table = "tasks_task_with_archive"
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class TaskTombstone(models.Model):
+    """
+    Trace of a task that was deleted or moved to another owner, so syncing
+    clients learn to drop it.
+
+    Written by triggers with the next ``change_seq`` (see migration 0009)
+    and pruned after ``SYNC_TOMBSTONE_RETENTION_DAYS`` by the
+    ``prune_task_tombstones`` command. Tombstones outlive a deleted owner
+    until they are pruned. Tasks purged along with their owner leave none
+    (see migration 0012).
+    """
+
+    task_id = models.BigIntegerField()
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["owner", "change_seq"], name="tombstone_owner_change_seq_idx"
+            ),
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_at_idx"),
+        ]
+        verbose_name = "Task tombstone"
+        verbose_name_plural = "Task tombstones"
+
+    def __str__(self) -> str:
+        return f"Task {self.task_id} deleted at {self.deleted_at}"
+
+
+class TaskCounter(models.Model):
+    """
+    Number of tasks of an owner, in total and completed, and of their
+    archived tasks, which the other two leave out.
+
+    Kept up to date by statement-level triggers on the task table (see
+    migration 0007) and the archive (see migration 0011), so every write
+    path counts, including bulk writes, raw deletes and imports. Counting a
+    busy owner's writes serializes them on the owner's counter row until
+    commit. Owners without tasks may have no row.
+    """
+
+    owner = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_counter",
+    )
+    total = models.BigIntegerField(default=0)
+    completed = models.BigIntegerField(default=0)
+    # The task table's triggers predate the column and leave it to its
+    # database default.
+    archived = models.BigIntegerField(default=0, db_default=0)
+
+    class Meta:
+        verbose_name = "Task counter"
+        verbose_name_plural = "Task counters"
+
+    def __str__(self) -> str:
+        return f"{self.completed}/{self.total} tasks completed"
+
+
+class TaskCreationCount(models.Model):
+    """
+    Number of an owner's tasks created within an hour.
+
+    Kept up to date like ``TaskCounter`` by triggers (see migration 0008),
+    for tasks created in the last 8 days only, so the activity of the last
+    week is summed from a bounded number of rows. Older hours are pruned by
+    the ``reconcile_task_counters`` command.
+    """
+
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    hour = models.DateTimeField()
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "hour"], name="task_creation_owner_hour_uniq"
+            )
+        ]
+        verbose_name = "Task creation count"
+        verbose_name_plural = "Task creation counts"
+
+    def __str__(self) -> str:
+        return f"{self.count} tasks created at {self.hour:%Y-%m-%d %H:00}"
+
+
+class TaskImport(models.Model):
+    """
+    Progress of a bulk import of tasks, see ``tasks.importing``.
+
+    Counters are updated in the transaction of every loaded batch, so an
+    interrupted import resumes right after the last committed row.
+    """
+
+    class Format(models.TextChoices):
+        NDJSON = "ndjson", "NDJSON"
+        CSV = "csv", "CSV"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="imports")
+    format = models.CharField(max_length=10, choices=Format.choices)
+    # Rows read from the source, valid or not.
+    processed = models.PositiveBigIntegerField(default=0)
+    imported = models.PositiveBigIntegerField(default=0)
+    failed = models.PositiveBigIntegerField(default=0)
+    # The first few invalid rows, with their number and errors.
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Task import"
+        verbose_name_plural = "Task imports"
+
+    def __str__(self) -> str:
+        return f"{self.get_format_display()} import {self.id}"
@@ -0,0 +1,201 @@
+"""
+Conversion of the task table into a table hash-partitioned by owner.
+
+Every task query is scoped to an owner, so with the table partitioned by
+``owner_id`` a query only touches the partition of its owner, and vacuum,
+index maintenance and the cache work on partitions a fraction of the size.
+Postgres requires the partition key in the primary key, which becomes
+``(id, owner_id)``. Ids still come from the table's identity sequence, but
+their uniqueness is no longer enforced on its own. The model keeps ``id``
+as its primary key, so Django is unaware of the change.
+
+The conversion copies the tasks into a new partitioned table with the same
+columns, indexes, constraints, triggers and dependent views, and swaps it
+in, all in one transaction. Writes to tasks wait while the tasks are copied
+and indexed, reads are only blocked for the final swap. Indexes can't be created
+concurrently on a partitioned table afterwards, so migrations adding task
+indexes have to fall back to a plain ``CREATE INDEX`` (see migration 0013).
+"""
+
+import re
+
+from django.db import connection, transaction
+
+from tasks.models import Task
+
+TABLE = Task._meta.db_table
+NEW_TABLE = f"{TABLE}_partitioned"
+# Indexes and constraints of the new table are renamed to their final names
+# once the old table is gone, as their names are unique per schema.
+TEMPORARY_SUFFIX = "_new"
+DEFAULT_PARTITIONS = 16
+
+
+class PartitioningError(Exception):
+    """The task table can't be converted."""
+
+
+def is_partitioned() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [TABLE])
+        return cursor.fetchone()[0] == "p"
+
+
+def partition_names(partitions: int) -> list[str]:
+    return [f"{TABLE}_p{remainder}" for remainder in range(partitions)]
+
+
+def fetch_definitions(
+    cursor,
+) -> tuple[list[tuple], list[str], list[str], list[tuple]]:
+    """
+    Return the foreign keys, as ``(name, definition)``, the index and
+    trigger definitions of the task table, without its primary key, and the
+    views reading it, as ``(name, query)``.
+    """
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid), contype, "
+        "conrelid = %(table)s::regclass "
+        "FROM pg_constraint "
+        "WHERE (conrelid = %(table)s::regclass AND contype NOT IN ('n', 'p')) "
+        "OR confrelid = %(table)s::regclass",
+        {"table": TABLE},
+    )
+    constraints = []
+    for name, definition, kind, own in cursor.fetchall():
+        # Foreign keys to the table would have to reference the owner too.
+        if kind != "f" or not own:
+            raise PartitioningError(f"Unsupported constraint {name}: {definition}")
+        constraints.append((name, definition))
+
+    cursor.execute(
+        "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+        "WHERE indrelid = %s::regclass AND NOT indisprimary",
+        [TABLE],
+    )
+    indexes = [definition for (definition,) in cursor.fetchall()]
+    for definition in indexes:
+        if not definition.startswith("CREATE INDEX "):
+            # Unique indexes would have to include the owner.
+            raise PartitioningError(f"Unsupported index: {definition}")
+
+    cursor.execute(
+        "SELECT pg_get_triggerdef(oid) FROM pg_trigger "
+        "WHERE tgrelid = %s::regclass AND NOT tgisinternal",
+        [TABLE],
+    )
+    triggers = [definition for (definition,) in cursor.fetchall()]
+
+    cursor.execute(
+        "SELECT DISTINCT view.relname, pg_get_viewdef(view.oid) "
+        "FROM pg_depend JOIN pg_rewrite ON pg_rewrite.oid = pg_depend.objid "
+        "JOIN pg_class view ON view.oid = pg_rewrite.ev_class "
+        "WHERE pg_depend.classid = 'pg_rewrite'::regclass "
+        "AND pg_depend.refobjid = %(table)s::regclass "
+        "AND view.oid <> %(table)s::regclass",
+        {"table": TABLE},
+    )
+    views = sorted(cursor.fetchall())
+    return constraints, indexes, triggers, views
+
+
+def index_name(definition: str) -> str:
+    return definition.split()[2]
+
+
+def build_statements(
+    partitions: int,
+    constraints: list[tuple],
+    indexes: list[str],
+    triggers: list[str],
+    views: list[tuple],
+) -> tuple[list[str], list[str]]:
+    """
+    Return the statements building the partitioned copy while writes are
+    blocked, and the statements swapping it in.
+    """
+    columns = ", ".join(
+        field.column for field in Task._meta.concrete_fields if not field.generated
+    )
+    build = [
+        f"CREATE TABLE {NEW_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS "
+        "INCLUDING IDENTITY INCLUDING GENERATED INCLUDING STORAGE) "
+        "PARTITION BY HASH (owner_id)",
+        *(
+            f"CREATE TABLE {name} PARTITION OF {NEW_TABLE} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            for remainder, name in enumerate(partition_names(partitions))
+        ),
+        # The new table has no triggers yet, so the copy leaves counters,
+        # change sequence numbers and tombstones alone.
+        f"INSERT INTO {NEW_TABLE} ({columns}) OVERRIDING SYSTEM VALUE "
+        f"SELECT {columns} FROM {TABLE}",
+        f"ALTER TABLE {NEW_TABLE} ADD CONSTRAINT {TABLE}_pkey{TEMPORARY_SUFFIX} "
+        "PRIMARY KEY (id, owner_id)",
+        *(
+            re.sub(
+                r"^CREATE INDEX (\S+) ON (\S+) ",
+                rf"CREATE INDEX \g<1>{TEMPORARY_SUFFIX} ON {NEW_TABLE} ",
+                definition,
+            )
+            for definition in indexes
+        ),
+        *(
+            f"ALTER TABLE {NEW_TABLE} ADD CONSTRAINT {name}{TEMPORARY_SUFFIX} "
+            f"{definition}"
+            for name, definition in constraints
+        ),
+        f"ANALYZE {NEW_TABLE}",
+    ]
+    swap = [
+        f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE",
+        f"SELECT setval(pg_get_serial_sequence('{NEW_TABLE}', 'id'), "
+        f"nextval(pg_get_serial_sequence('{TABLE}', 'id')))",
+        # Runs the foreign key checks deferred by an enclosing transaction,
+        # the table can't be dropped while they are pending.
+        "SET CONSTRAINTS ALL IMMEDIATE",
+        # Views are recreated over the new table, their definitions only
+        # name it.
+        *(f"DROP VIEW {name}" for name, _ in views),
+        f"DROP TABLE {TABLE}",
+        f"ALTER TABLE {NEW_TABLE} RENAME TO {TABLE}",
+        f"ALTER SEQUENCE {NEW_TABLE}_id_seq RENAME TO {TABLE}_id_seq",
+        *(
+            f"ALTER INDEX {name}{TEMPORARY_SUFFIX} RENAME TO {name}"
+            for name in [f"{TABLE}_pkey", *map(index_name, indexes)]
+        ),
+        *(
+            f"ALTER TABLE {TABLE} RENAME CONSTRAINT {name}{TEMPORARY_SUFFIX} TO {name}"
+            for name, _ in constraints
+        ),
+        # The definitions name the table, which is the new one by now.
+        *triggers,
+        *(f"CREATE VIEW {name} AS {query.rstrip(';')}" for name, query in views),
+    ]
+    return build, swap
+
+
+def partition_task_table(
+    partitions: int = DEFAULT_PARTITIONS, log=None, dry_run: bool = False
+) -> list[str]:
+    """
+    Convert the task table into ``partitions`` hash partitions by owner and
+    return the statements run, or only return them with ``dry_run``.
+
+    ``log`` is called with every statement before it runs.
+    """
+    if partitions < 2:
+        raise PartitioningError("At least 2 partitions are needed.")
+    with transaction.atomic(), connection.cursor() as cursor:
+        if is_partitioned():
+            raise PartitioningError(f"{TABLE} is already partitioned.")
+        # Lets reads through while the copy is made.
+        cursor.execute(f"LOCK TABLE {TABLE} IN SHARE MODE")
+        build, swap = build_statements(partitions, *fetch_definitions(cursor))
+        if dry_run:
+            return build + swap
+        for statement in build + swap:
+            if log is not None:
+                log(statement)
+            cursor.execute(statement)
+    return build + swap
@@ -0,0 +1,29 @@
+"""
+Index-backed search of tasks, shared by the API and the admin.
+
+Matches full-text in title and description, substrings of the title and
+trigram matches on the title for typos. Every condition is served by an
+owner-scoped GIN index.
+"""
+
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
+from django.db.models.functions import Upper
+
+from task_tracker.constants import SEARCH_CONFIG
+
+
+def search_query(text: str) -> SearchQuery:
+    return SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+
+
+def search(queryset, text: str):
+    """
+    Filter ``queryset`` to the tasks matching ``text``, unranked. Aliases
+    ``upper_title`` for ranking by similarity.
+    """
+    return queryset.alias(upper_title=Upper("title")).filter(
+        Q(search_vector=search_query(text))
+        | Q(upper_title__contains=text.upper())
+        | Q(upper_title__trigram_word_similar=text)
+    )
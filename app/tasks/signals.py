@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tasks.cache import invalidate_user_tasks
+from tasks.models import Task
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Task, dispatch_uid="task_saved_invalidate_cache")
+def task_saved(sender, instance: Task, **kwargs):
+    invalidate_user_tasks(instance.owner_id)
+    previous_owner_id = getattr(instance, "_loaded_owner_id", None)
+    if previous_owner_id is not None and previous_owner_id != instance.owner_id:
+        invalidate_user_tasks(previous_owner_id)
+    instance._loaded_owner_id = instance.owner_id
+
+
+@receiver(post_delete, sender=Task, dispatch_uid="task_deleted_invalidate_cache")
+def task_deleted(sender, instance: Task, **kwargs):
+    invalidate_user_tasks(instance.owner_id)
+
+
+@receiver(post_save, sender=User, dispatch_uid="owner_saved_invalidate_cache")
+def owner_saved(sender, instance, update_fields=None, **kwargs):
+    # Tasks embed their owner, so profile changes invalidate them too.
+    # Logins only touch last_login, which tasks don't show.
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_user_tasks(instance.pk)
@@ -0,0 +1,122 @@
+"""
+Per-user task statistics from the counters maintained by triggers.
+
+``TaskCounter`` holds an owner's total, completed and archived tasks, and
+``TaskCreationCount`` their tasks created per hour, so statistics are read
+from a fixed number of rows whatever the number of tasks. Recent activity
+is counted to the hour: the last day covers every task created since the
+start of the hour 24 hours ago.
+
+The counters can only drift through writes that bypass the triggers, such
+as restoring a table. ``reconcile_owner`` recounts an owner's tasks and
+fixes their counters.
+"""
+
+import datetime as dt
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from tasks.models import Task, TaskArchive, TaskCounter, TaskCreationCount
+
+STATS_WINDOWS = {
+    "created_last_day": dt.timedelta(days=1),
+    "created_last_week": dt.timedelta(days=7),
+}
+# Matches the window the triggers count creations for.
+TASK_CREATION_RETENTION = dt.timedelta(days=8)
+
+
+def start_of_hour(moment: dt.datetime) -> dt.datetime:
+    return moment.astimezone(dt.UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def window_starts(now: dt.datetime) -> dict[str, dt.datetime]:
+    return {name: start_of_hour(now - delta) for name, delta in STATS_WINDOWS.items()}
+
+
+async def aget_task_stats(owner_id: int) -> dict[str, int]:
+    """Read an owner's task statistics with two single-row lookups."""
+    counter = await (
+        TaskCounter.objects.filter(owner_id=owner_id)
+        .values("total", "completed", "archived")
+        .afirst()
+    )
+    counter = counter or {"total": 0, "completed": 0, "archived": 0}
+    starts = window_starts(timezone.now())
+    created = await TaskCreationCount.objects.filter(
+        owner_id=owner_id, hour__gte=min(starts.values())
+    ).aaggregate(
+        **{
+            name: Sum("count", filter=Q(hour__gte=start), default=0)
+            for name, start in starts.items()
+        }
+    )
+    return {
+        "total": counter["total"],
+        "completed": counter["completed"],
+        "open": counter["total"] - counter["completed"],
+        "archived": counter["archived"],
+        **created,
+    }
+
+
+def reconcile_owner(
+    owner_id: int, dry_run: bool = False
+) -> dict[str | dt.datetime, tuple[int, int]]:
+    """
+    Recount an owner's tasks and fix counters that drifted.
+
+    Returns the drifted values as ``(stored, actual)`` pairs, keyed by
+    counter field or creation hour. The owner's counter row is locked
+    first, which makes the owner's task writes wait, as their triggers
+    update the same row.
+    """
+    with transaction.atomic():
+        TaskCounter.objects.bulk_create(
+            [TaskCounter(owner_id=owner_id)], ignore_conflicts=True
+        )
+        counter = TaskCounter.objects.select_for_update().get(owner_id=owner_id)
+        tasks = Task.objects.filter(owner_id=owner_id).order_by()
+        actual = tasks.aggregate(
+            total=Count("*"), completed=Count("pk", filter=Q(completed=True))
+        )
+        actual["archived"] = TaskArchive.objects.filter(owner_id=owner_id).count()
+        drift = {
+            name: (getattr(counter, name), value)
+            for name, value in actual.items()
+            if getattr(counter, name) != value
+        }
+
+        since = start_of_hour(timezone.now() - max(STATS_WINDOWS.values()))
+        buckets = TaskCreationCount.objects.filter(owner_id=owner_id, hour__gte=since)
+        stored_counts = dict(buckets.values_list("hour", "count"))
+        actual_counts = dict(
+            tasks.filter(created_at__gte=since)
+            .annotate(hour=TruncHour("created_at", tzinfo=dt.UTC))
+            .values("hour")
+            .annotate(count=Count("*"))
+            .values_list("hour", "count")
+        )
+        for hour in sorted(stored_counts.keys() | actual_counts.keys()):
+            stored, value = stored_counts.get(hour, 0), actual_counts.get(hour, 0)
+            if stored != value:
+                drift[hour] = (stored, value)
+
+        if drift and not dry_run:
+            TaskCounter.objects.filter(owner_id=owner_id).update(**actual)
+            buckets.delete()
+            TaskCreationCount.objects.bulk_create(
+                TaskCreationCount(owner_id=owner_id, hour=hour, count=count)
+                for hour, count in actual_counts.items()
+            )
+    return drift
+
+
+def prune_creation_counts() -> int:
+    """Delete creation counts of hours the triggers no longer track."""
+    since = start_of_hour(timezone.now() - TASK_CREATION_RETENTION)
+    deleted, _ = TaskCreationCount.objects.filter(hour__lt=since).delete()
+    return deleted
@@ -1,7 +1,17 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.actions import delete_selected as confirm_delete_selected
+from django.contrib.admin.options import IS_POPUP_VAR
+from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
+from django.contrib.admin.utils import model_ngettext
 from django.contrib.auth.admin import UserAdmin
+from django.http import HttpResponseRedirect
+from django.urls import reverse
+from django.utils.text import capfirst
 from django.utils.translation import gettext_lazy as _
 
+from tasks.models import Task, TaskArchive
+from users.cache import bump_auth_version
+from users.deletion import deletion_counts, request_deletion
 from users.models import CustomUser
 
 
@@ -28,8 +38,12 @@ class CustomUserAdmin(UserAdmin):
                 )
             },
         ),
-        (_("Important dates"), {"fields": ("last_login", "date_joined")}),
+        (
+            _("Important dates"),
+            {"fields": ("last_login", "date_joined", "deletion_requested_at")},
+        ),
     )
+    readonly_fields = ("deletion_requested_at",)
 
     add_fieldsets = (
         (
@@ -46,3 +60,80 @@ class CustomUserAdmin(UserAdmin):
         "groups",
         "user_permissions",
     )
+    actions = ["delete_selected"]
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Group and permission changes don't send post_save for the user.
+        bump_auth_version(form.instance.pk)
+
+    # Deleting only deactivates users and queues them for the
+    # purge_deleted_users command, which deletes their tasks in batches.
+
+    def get_deleted_objects(self, objs, request):
+        """
+        Preview the deletion from the users' task counters, instead of
+        collecting every related row just to list it.
+        """
+        users = list(objs)
+        counts = deletion_counts(user.pk for user in users)
+        to_delete = [f"{capfirst(self.opts.verbose_name)}: {user}" for user in users]
+        model_count = {
+            self.opts.verbose_name_plural: len(users),
+            Task._meta.verbose_name_plural: counts["tasks"],
+            TaskArchive._meta.verbose_name_plural: counts["archived_tasks"],
+        }
+        # Related rows are purged by the system, deleting users is enough.
+        return to_delete, model_count, set(), []
+
+    def delete_model(self, request, obj):
+        request_deletion([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        request_deletion(queryset.values_list("pk", flat=True))
+
+    def response_delete(self, request, obj_display, obj_id):
+        # Django's response tells the user was deleted, they're only queued.
+        if IS_POPUP_VAR in request.POST:
+            return super().response_delete(request, obj_display, obj_id)
+        self.message_user(
+            request,
+            f"The user “{obj_display}” was queued for deletion. They are "
+            "deactivated, their tasks are deleted in the background.",
+            messages.SUCCESS,
+        )
+        if not self.has_change_permission(request, None):
+            return HttpResponseRedirect(
+                reverse("admin:index", current_app=self.admin_site.name)
+            )
+        post_url = reverse(
+            f"admin:{self.opts.app_label}_{self.opts.model_name}_changelist",
+            current_app=self.admin_site.name,
+        )
+        preserved_filters = self.get_preserved_filters(request)
+        return HttpResponseRedirect(
+            add_preserved_filters(
+                {"preserved_filters": preserved_filters, "opts": self.opts}, post_url
+            )
+        )
+
+    @admin.action(
+        permissions=["delete"], description=confirm_delete_selected.short_description
+    )
+    def delete_selected(self, request, queryset):
+        """
+        Django's delete action, which reports the users as queued for
+        deletion instead of deleted.
+        """
+        if not request.POST.get("post"):
+            return confirm_delete_selected(self, request, queryset)
+        count = len(queryset)
+        if count:
+            self.log_deletions(request, queryset)
+            self.delete_queryset(request, queryset)
+            self.message_user(
+                request,
+                f"{count} {model_ngettext(self.opts, count)} queued for deletion. "
+                "They are deactivated, their tasks are deleted in the background.",
+                messages.SUCCESS,
+            )
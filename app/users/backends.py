@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from users.hashing import check_password, make_password
+
+UserModel = get_user_model()
+
+
+class PooledHashingModelBackend(ModelBackend):
+    """
+    Model backend that checks passwords in the hashing pool.
+
+    Database access stays on the request thread, only hashing is offloaded.
+    Outdated hashes are upgraded to the preferred hasher on login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway to reduce the timing difference between an existing
+            # and a nonexistent user, as ModelBackend does.
+            make_password(password)
+            return
+        matches, rehashed = check_password(password, user.password)
+        if not matches:
+            return
+        if rehashed is not None:
+            user.password = rehashed
+            user.save(update_fields=["password"])
+        if self.user_can_authenticate(user):
+            return user
@@ -0,0 +1,127 @@
+"""
+Per-user auth versions and the cache of authenticated users.
+
+Users are cached under their current auth version, in a small in-process
+LRU in front of the shared cache. Bumping the version makes the user's
+shared entry unreachable and drops the local one of the current process.
+Other processes keep serving their local copy for at most
+``AUTH_LOCAL_CACHE_TTL`` seconds.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from task_tracker.cache_stats import CacheStats
+from task_tracker.constants import (
+    AUTH_CACHE_TIMEOUT,
+    AUTH_LOCAL_CACHE_MAX_ENTRIES,
+    AUTH_LOCAL_CACHE_TTL,
+)
+
+auth_cache_stats = CacheStats("auth")
+
+
+class LocalUserCache:
+    """Thread-safe LRU of users whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, user_id: int):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id: int, user):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_user_cache = LocalUserCache(AUTH_LOCAL_CACHE_MAX_ENTRIES, AUTH_LOCAL_CACHE_TTL)
+
+
+def auth_version_key(user_id: int) -> str:
+    return f"users:auth_version:{user_id}"
+
+
+def user_key(user_id: int, version: int) -> str:
+    return f"users:user:{user_id}:{version}"
+
+
+def get_auth_version(user_id: int) -> int:
+    # Same as task generations, a lost counter restarts from the clock.
+    return cache.get_or_set(auth_version_key(user_id), time.time_ns, timeout=None)
+
+
+def _bump(user_id: int) -> None:
+    key = auth_version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+    local_user_cache.delete(user_id)
+
+
+def bump_auth_version(user_id: int) -> None:
+    """
+    Invalidate the cached user, so the next request reloads it.
+
+    Like task generations, bumps once more after commit when called in a
+    transaction.
+    """
+    _bump(user_id)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(user_id))
+
+
+def get_cached_user(user_id: int):
+    """
+    Return the user with the given id, or ``None`` if there is none.
+
+    Missing users are not cached, they can't authenticate anyway.
+    """
+    user = local_user_cache.get(user_id)
+    if user is None:
+        key = user_key(user_id, get_auth_version(user_id))
+        user = cache.get(key)
+        if user is None:
+            auth_cache_stats.record(hit=False)
+            User = get_user_model()
+            user = User.objects.filter(pk=user_id).first()
+            if user is None:
+                return None
+            cache.set(key, user, AUTH_CACHE_TIMEOUT)
+        else:
+            auth_cache_stats.record(hit=True)
+        local_user_cache.set(user_id, user)
+    else:
+        auth_cache_stats.record(hit=True)
+    # Requests get their own copy, so they can't leak changes to each other.
+    return copy.copy(user)
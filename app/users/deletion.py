@@ -0,0 +1,111 @@
+"""
+Deletion of users with any number of tasks.
+
+Deleting a user through the ORM collects and deletes all of their tasks in
+one transaction, which for millions of tasks holds locks for minutes and
+loads every task into memory. Instead, ``request_deletion`` only
+deactivates the users and marks them for deletion. The
+``purge_deleted_users`` command then deletes their live and archived tasks
+a batch at a time, each batch with a single statement in its own
+transaction, and finally deletes the users themselves with the few rows
+left.
+
+Purged tasks don't leave sync tombstones, nobody syncs a deleted user's
+tasks. The users' counters follow the purge through the task triggers.
+"""
+
+import time
+from collections.abc import Callable, Iterable
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from task_tracker.constants import USER_PURGE_BATCH_SIZE
+from tasks.models import Task, TaskArchive, TaskCounter
+from users.cache import bump_auth_version
+
+User = get_user_model()
+
+PURGED_TABLES = (Task._meta.db_table, TaskArchive._meta.db_table)
+# The owner's rows are found through the owner-leading indexes, which also
+# keeps a partitioned task table to the owner's partition.
+PURGE_BATCH_SQL = """
+    DELETE FROM {table}
+    WHERE owner_id = %(owner_id)s AND id IN (
+        SELECT id FROM {table} WHERE owner_id = %(owner_id)s LIMIT %(limit)s
+    )
+"""
+
+
+def request_deletion(user_ids: Iterable[int]) -> int:
+    """
+    Deactivate the users and mark them for deletion by the purge, and
+    return the number of users marked. Users already marked keep their
+    place in the queue.
+    """
+    user_ids = list(user_ids)
+    marked = User.objects.filter(
+        pk__in=user_ids, deletion_requested_at__isnull=True
+    ).update(is_active=False, deletion_requested_at=timezone.now())
+    # Updates skip the user signals, cached users are dropped here.
+    for user_id in user_ids:
+        bump_auth_version(user_id)
+    return marked
+
+
+def deletion_counts(user_ids: Iterable[int]) -> dict[str, int]:
+    """
+    Count the tasks the deletion of the users removes, from their counters,
+    without reading the tasks.
+    """
+    return TaskCounter.objects.filter(owner_id__in=list(user_ids)).aggregate(
+        tasks=Sum("total", default=0), archived_tasks=Sum("archived", default=0)
+    )
+
+
+def purge_batch(table: str, owner_id: int, batch_size: int) -> int:
+    """Delete a batch of the owner's rows from ``table``, return how many."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL tasks.skip_tombstones = on")
+        cursor.execute(
+            PURGE_BATCH_SQL.format(table=table),
+            {"owner_id": owner_id, "limit": batch_size},
+        )
+        return cursor.rowcount
+
+
+def purge_user(
+    user_id: int,
+    batch_size: int | None = None,
+    progress: Callable[[int, float], None] | None = None,
+) -> int:
+    """
+    Delete the user's tasks in batches of ``batch_size``, then the user,
+    and return the number of tasks deleted. ``progress`` is called with the
+    number of tasks deleted so far and the tasks per second after every
+    batch.
+    """
+    batch_size = batch_size or USER_PURGE_BATCH_SIZE
+    started = time.perf_counter()
+    purged = 0
+    for table in PURGED_TABLES:
+        while deleted := purge_batch(table, user_id, batch_size):
+            purged += deleted
+            if progress is not None:
+                progress(purged, purged / (time.perf_counter() - started))
+    # Only the user's counters, imports and anything created meanwhile are
+    # left for the collector.
+    with transaction.atomic():
+        User.objects.filter(pk=user_id).delete()
+    return purged
+
+
+def users_pending_deletion():
+    """Ids of the users marked for deletion, in the order they were."""
+    return (
+        User.objects.filter(deletion_requested_at__isnull=False)
+        .order_by("deletion_requested_at", "pk")
+        .values_list("pk", flat=True)
+    )
@@ -0,0 +1,89 @@
+"""
+Password hashing in a bounded thread pool.
+
+Hashing is deliberately slow and CPU-bound. Running it in a small pool
+caps how many CPU cores sign-ups and logins can take at once, so the rest
+of the traffic keeps being served during a login storm. Callers wait for
+their hash, but only ``PASSWORD_HASHING_MAX_PENDING`` of them at a time,
+the rest are turned away with 503 instead of queueing without bound.
+
+The hashers in ``hashlib`` and ``argon2-cffi`` release the GIL, so the
+threads hash in parallel with each other and with the request threads.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingPoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Too many sign-ins in progress, try again later.")
+    default_code = "hashing_pool_busy"
+    # Sets the Retry-After header, like throttling does.
+    wait = 1
+
+
+class HashingPool:
+    """Thread pool that rejects work once ``max_pending`` calls are in flight."""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max(max_pending, workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Created lazily, so that forked server workers get their own threads.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="password-hashing"
+                )
+            return self._executor
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolBusy()
+        try:
+            return self.executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+
+hashing_pool = HashingPool(
+    settings.PASSWORD_HASHING_WORKERS, settings.PASSWORD_HASHING_MAX_PENDING
+)
+
+
+def make_password(password: str) -> str:
+    """Hash a password with the preferred hasher."""
+    return hashing_pool.run(hashers.make_password, password)
+
+
+def check_password(password: str, encoded: str) -> tuple[bool, str | None]:
+    """
+    Check a password against its hash.
+
+    Returns whether it matches and, if the hash is outdated, the password
+    rehashed with the preferred hasher.
+    """
+
+    def check():
+        if not hashers.check_password(password, encoded):
+            return False, None
+        hasher = hashers.identify_hasher(encoded)
+        if hasher.algorithm != hashers.get_hasher().algorithm or (
+            hasher.must_update(encoded)
+        ):
+            return True, hashers.make_password(password)
+        return True, None
+
+    return hashing_pool.run(check)
@@ -0,0 +1,40 @@
+from functools import partial
+
+from django.core.management.base import BaseCommand
+
+from task_tracker.constants import USER_PURGE_BATCH_SIZE
+from users.deletion import purge_user, users_pending_deletion
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tasks of users deleted in the admin in batches, then the "
+        "users. Safe to interrupt and rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=USER_PURGE_BATCH_SIZE,
+            help=f"Tasks per transaction, {USER_PURGE_BATCH_SIZE} by default.",
+        )
+
+    def report(self, user_id: int, purged: int, tasks_per_second: float):
+        self.stdout.write(
+            f"User {user_id}: {purged:,} tasks deleted "
+            f"({tasks_per_second:,.0f} tasks/s)"
+        )
+
+    def handle(self, *args, **options):
+        user_ids = list(users_pending_deletion())
+        for user_id in user_ids:
+            purged = purge_user(
+                user_id,
+                batch_size=options["batch_size"],
+                progress=(
+                    partial(self.report, user_id) if options["verbosity"] > 0 else None
+                ),
+            )
+            self.stdout.write(f"User {user_id} deleted with {purged:,} tasks.")
+        self.stdout.write(self.style.SUCCESS(f"Deleted {len(user_ids)} users."))
@@ -0,0 +1,32 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="deletion_requested_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="deletion requested",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="customuser",
+            index=models.Index(
+                condition=models.Q(("deletion_requested_at__isnull", False)),
+                fields=["deletion_requested_at"],
+                name="user_deletion_requested_idx",
+            ),
+        ),
+    ]
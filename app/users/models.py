@@ -8,5 +8,21 @@ class CustomUser(AbstractUser):
     """
 
     email = models.EmailField("email address", unique=True)
+    # Set when the user is deleted. The account is deactivated right away,
+    # its tasks are purged in batches by ``purge_deleted_users`` (see
+    # ``users.deletion``), which then deletes the user.
+    deletion_requested_at = models.DateTimeField(
+        "deletion requested", null=True, blank=True, editable=False
+    )
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username", "password"]
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # The purge job only looks for the few users pending deletion.
+            models.Index(
+                fields=["deletion_requested_at"],
+                condition=models.Q(deletion_requested_at__isnull=False),
+                name="user_deletion_requested_idx",
+            ),
+        ]
@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.cache import bump_auth_version
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User, dispatch_uid="user_saved_bump_auth_version")
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    # Covers deactivation, password changes and admin edits. Logins only
+    # touch last_login, which authentication doesn't depend on.
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    bump_auth_version(instance.pk)
+
+
+@receiver(post_delete, sender=User, dispatch_uid="user_deleted_bump_auth_version")
+def user_deleted(sender, instance, **kwargs):
+    bump_auth_version(instance.pk)